@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_BUDGET_MB = 1024
+
+
+def _buffer(values):
+    """The numpy buffer behind a column's values, or None for extension arrays."""
+    if isinstance(values, pd.Categorical):
+        values = values.codes
+    return values if isinstance(values, np.ndarray) else None
+
+
+def _buffer_ranges(df):
+    """Memory ranges of the column buffers of a frame."""
+    ranges = []
+    for _, column in df.items():
+        values = _buffer(column.values)
+        if values is not None and values.nbytes:
+            start = values.__array_interface__['data'][0]
+            ranges.append((start, start + values.nbytes))
+    return ranges
+
+
+def _is_shared(values, ranges):
+    values = _buffer(values)
+    if values is None or not values.nbytes:
+        return False
+    address = values.__array_interface__['data'][0]
+    return any(start <= address < end for start, end in ranges)
+
+
+def estimate_size(obj, shared=None):
+    """
+    Approximate the memory held by an artifact (frames, arrays, fitted models, containers).
+    Objects reachable several times are only counted once.
+
+    Parameters:
+    - obj: Artifact to measure.
+    - shared: Source DataFrame the artifact was derived from; columns and arrays viewing its
+      buffers (e.g. shallow copies kept by analysis objects) are not counted, as the cache does
+      not keep that memory alive.
+    """
+    ranges = _buffer_ranges(shared) if shared is not None else []
+    return _estimate(obj, ranges, set(), 0)
+
+
+def _estimate(obj, ranges, seen, depth):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        usage = obj.memory_usage(deep=True, index=True)
+        return int(usage.iloc[0] + sum(usage.iloc[position + 1] for position, (_, column) in enumerate(obj.items())
+                                       if not _is_shared(column.values, ranges)))
+    if isinstance(obj, pd.Series):
+        return 0 if _is_shared(obj.values, ranges) else int(obj.memory_usage(deep=True))
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return 0 if _is_shared(obj, ranges) else int(obj.nbytes)
+    if depth >= 6:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            _estimate(k, ranges, seen, depth + 1) + _estimate(v, ranges, seen, depth + 1) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(_estimate(item, ranges, seen, depth + 1) for item in obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        # Analysis objects and fitted estimators keep their state in attributes
+        return sys.getsizeof(obj) + _estimate(vars(obj), ranges, seen, depth + 1)
+    return sys.getsizeof(obj)
+
+
+class ArtifactCache:
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB * 1024 ** 2):
+        """
+        In-memory LRU cache for derived dashboard artifacts (aggregates, fitted models, scores).
+
+        Entries are keyed by artifact name, data version and parameters, so they are reused
+        across reruns and sessions until the data changes. When the estimated size of all
+        entries exceeds `max_bytes`, the least recently used entries are evicted. The cache is
+        shared between Streamlit sessions, so every access goes through a lock, and concurrent
+        misses on one key wait for a single computation.
+
+        Parameters:
+        - max_bytes: Memory budget for all cached artifacts.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(name, data_version, **params):
+        """Build a stable key from the artifact name, data version and parameters."""
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return name, str(data_version), hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+    def _lookup(self, key):
+        # Called with self.lock held
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, self.entries[key]['value']
+        return False, None
+
+    def get_or_compute(self, name, data_version, compute, shared=None, **params):
+        """
+        Return the cached artifact, computing and storing it on a miss.
+
+        Parameters:
+        - name: Artifact name (e.g. the dashboard page).
+        - data_version: Version of the source data (e.g. the snapshot key).
+        - compute: Callable producing the artifact.
+        - shared: Source DataFrame, whose buffers are not counted in the artifact size (see estimate_size).
+        - params: Parameters the artifact depends on.
+        """
+        key = self.make_key(name, data_version, **params)
+        with self.lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another session may have computed the artifact while this one waited
+            with self.lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                self.misses += 1
+            try:
+                start = time.time()
+                value = compute()
+                entry = {'value': value, 'size': estimate_size(value, shared), 'seconds': time.time() - start}
+                with self.lock:
+                    self.entries[key] = entry
+                    self.entries.move_to_end(key)
+                    self._evict()
+            finally:
+                with self.lock:
+                    self.key_locks.pop(key, None)
+        return value
+
+    def _evict(self):
+        # The newest entry is kept even if it alone exceeds the budget
+        while len(self.entries) > 1 and self.used_bytes() > self.max_bytes:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def used_bytes(self):
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def invalidate(self, name=None):
+        """Drop every entry, or only the entries of one artifact name."""
+        with self.lock:
+            for key in [key for key in self.entries if name is None or key[0] == name]:
+                del self.entries[key]
+
+    def stats(self):
+        """Return hit/miss counters, memory use and a summary of the entries."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'used_bytes': self.used_bytes(),
+                'max_bytes': self.max_bytes,
+                'entries': pd.DataFrame(
+                    [{'artifact': key[0], 'data_version': key[1], 'params': key[2],
+                      'size_mb': entry['size'] / 1024 ** 2, 'compute_s': entry['seconds']}
+                     for key, entry in reversed(self.entries.items())],
+                    columns=['artifact', 'data_version', 'params', 'size_mb', 'compute_s']
+                )
+            }
+
+
+@st.cache_resource
+def get_artifact_cache():
+    """Process-wide artifact cache, with the budget taken from DASHBOARD_CACHE_MB."""
+    return ArtifactCache(max_bytes=int(os.getenv('DASHBOARD_CACHE_MB', DEFAULT_BUDGET_MB)) * 1024 ** 2)
+
+
+def cached_artifacts(cache, name, data_version, compute, shared=None, **params):
+    """Compute a page's artifacts through the cache, or directly when no cache is given."""
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(name, data_version, compute, shared=shared, **params)
+
+
+def render_cache_panel(cache, data_version=None):
+    """Show cache hit/miss counters and memory use in the sidebar."""
+    stats = cache.stats()
+    st.sidebar.header("Cache")
+    if data_version is not None:
+        st.sidebar.caption(f"Data version: {data_version}")
+    hits, misses = st.sidebar.columns(2)
+    hits.metric("Hits", stats['hits'])
+    misses.metric("Misses", stats['misses'])
+    st.sidebar.progress(
+        min(stats['used_bytes'] / stats['max_bytes'], 1.0),
+        text=f"{stats['used_bytes'] / 1024 ** 2:.1f} / {stats['max_bytes'] / 1024 ** 2:.0f} MB, "
+             f"hit rate {stats['hit_rate']:.0%}, {stats['evictions']} evictions"
+    )
+    with st.sidebar.expander("Cached artifacts"):
+        st.dataframe(stats['entries'], hide_index=True)
@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+
+import streamlit as st
+
+
+class BackgroundLoader:
+    def __init__(self, summary=None, chunks=None, finish=None, total_rows=None):
+        """
+        Load a dataset on an asyncio event loop running in a background thread, so the dashboard
+        can render from a quick summary while the full data streams in.
+
+        The steps run in order, each blocking call offloaded to a worker thread: `summary()`,
+        then `chunks()` is consumed chunk by chunk, then `finish(chunks)` builds the result.
+        Progress is updated after every chunk, and `cancel()` stops the load between chunks. A
+        loader shared by several clients (e.g. dashboard sessions) tracks them with `attach` and
+        `detach`, and is only cancelled once no client waits for it any more. The phase moves through 'pending', 'summary', 'loading', 'cleaning' and ends in 'done',
+        'cancelled' or 'failed'.
+
+        Parameters:
+        - summary: Callable returning a small summary available before the full data.
+        - chunks: Callable returning an iterator of DataFrame chunks (None to skip streaming).
+        - finish: Callable turning the list of chunks into the result (e.g. concatenate and clean). The
+          loader keeps no other reference to the list, so `finish` can clear it to free the chunks.
+        - total_rows: Callable mapping the summary to the expected number of rows, for the progress fraction.
+        """
+        self.summary_fn = summary
+        self.chunks_fn = chunks
+        self.finish_fn = finish
+        self.total_rows_fn = total_rows
+        self.summary = None
+        self.summary_ready = threading.Event()
+        self.lock = threading.Lock()
+        self.state = {'phase': 'pending', 'rows': 0, 'chunks': 0, 'total_rows': None, 'error': None,
+                      'started': None, 'finished': None}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._serve, name='background-loader', daemon=True)
+        self.future = None
+        self.task = None
+        self.cancel_requested = threading.Event()
+        self.clients = set()
+
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.loop.shutdown_default_executor())
+        self.loop.close()
+
+    def _update(self, **changes):
+        with self.lock:
+            self.state.update(changes)
+
+    def start(self):
+        """Start loading; returns self so it can be chained after the constructor."""
+        if self.future is None:
+            self._update(started=time.time())
+            self.thread.start()
+            self.future = asyncio.run_coroutine_threadsafe(self._run(), self.loop)
+            self.future.add_done_callback(lambda _: self.loop.call_soon_threadsafe(self.loop.stop))
+        return self
+
+    async def _run(self):
+        self.task = asyncio.current_task()
+        try:
+            if self.cancel_requested.is_set():
+                raise asyncio.CancelledError()
+            if self.summary_fn is not None:
+                self._update(phase='summary')
+                self.summary = await asyncio.to_thread(self.summary_fn)
+            self.summary_ready.set()
+
+            parts = []
+            if self.chunks_fn is not None:
+                total = self.total_rows_fn(self.summary) if self.total_rows_fn is not None else None
+                self._update(phase='loading', total_rows=total)
+                iterator = await asyncio.to_thread(self.chunks_fn)
+                fetch = None
+                try:
+                    while True:
+                        fetch = asyncio.ensure_future(asyncio.to_thread(next, iterator, None))
+                        # Shielded so a cancellation leaves the in-flight fetch to finish in its thread
+                        chunk = await asyncio.shield(fetch)
+                        if chunk is None:
+                            break
+                        parts.append(chunk)
+                        with self.lock:
+                            self.state['rows'] += len(chunk)
+                            self.state['chunks'] += 1
+                finally:
+                    # Closing a streaming generator releases its cursor and pooled connection; it can
+                    # only be closed once the chunk being fetched has arrived
+                    if fetch is not None:
+                        await asyncio.wait([fetch])
+                    close = getattr(iterator, 'close', None)
+                    if close is not None:
+                        await asyncio.to_thread(close)
+
+            self._update(phase='cleaning')
+            result = await asyncio.to_thread(self.finish_fn, parts) if self.finish_fn is not None else parts
+            self._update(phase='done', finished=time.time())
+            return result
+        except asyncio.CancelledError:
+            self._update(phase='cancelled', finished=time.time())
+            raise
+        except Exception as e:
+            self._update(phase='failed', error=f"{type(e).__name__}: {e}", finished=time.time())
+            raise
+        finally:
+            self.summary_ready.set()
+
+    def progress(self):
+        """
+        Return the current phase, rows loaded so far, expected rows, completed fraction (None when
+        unknown) and elapsed seconds.
+        """
+        with self.lock:
+            progress = dict(self.state)
+        if progress['phase'] in ('cleaning', 'done'):
+            progress['fraction'] = 1.0
+        elif progress['total_rows']:
+            progress['fraction'] = min(progress['rows'] / progress['total_rows'], 1.0)
+        else:
+            progress['fraction'] = None
+        end = progress['finished'] or time.time()
+        progress['elapsed'] = end - progress['started'] if progress['started'] else 0.0
+        return progress
+
+    def get_summary(self, timeout=None):
+        """Wait for the summary (None if it failed or the load was cancelled first)."""
+        self.summary_ready.wait(timeout)
+        return self.summary
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def succeeded(self):
+        return self.done() and self.progress()['phase'] == 'done'
+
+    def result(self, timeout=None):
+        """Wait for and return the loaded data; raises if the load failed or was cancelled."""
+        return self.future.result(timeout)
+
+    def attach(self, client):
+        """Register a client waiting for the result."""
+        with self.lock:
+            self.clients.add(client)
+
+    def detach(self, client):
+        """
+        Stop waiting for the result on behalf of one client; the load is cancelled when it was
+        the last one.
+
+        Returns:
+        - True if the load was cancelled.
+        """
+        with self.lock:
+            self.clients.discard(client)
+            idle = not self.clients
+        if idle:
+            self.cancel()
+        return idle
+
+    def cancel(self):
+        """Stop the load after the chunk being fetched; the partial data is discarded."""
+        self.cancel_requested.set()
+        if self.future is not None and not self.future.done():
+            # Cancel the task on its own loop, so it records the cancellation before the future resolves
+            self.loop.call_soon_threadsafe(self._cancel_task)
+
+    def _cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+
+
+def render_load_progress(loader, container=None):
+    """Show the phase and progress of a background load."""
+    container = container or st
+    progress = loader.progress()
+    phase = progress['phase']
+    if phase == 'summary':
+        text = "Fetching summary..."
+    elif phase == 'loading':
+        total = f" of {progress['total_rows']:,}" if progress['total_rows'] else ''
+        text = f"Loading sessions: {progress['rows']:,}{total} rows ({progress['elapsed']:.0f} s)"
+    elif phase == 'cleaning':
+        text = f"Cleaning {progress['rows']:,} sessions..."
+    else:
+        text = f"Load {phase} after {progress['elapsed']:.0f} s"
+    fraction = progress['fraction'] if progress['fraction'] is not None else 0.0
+    container.progress(fraction, text=text)
+    return progress
@@ -5,38 +5,67 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
 
 from engagement_analysis.user_engagement_analysis import UserEngagementAnalysis
 from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
+from aggregation.customer_aggregation_engine import CustomerAggregationEngine
+from dashboard_analytics.artifact_cache import cached_artifacts
 
 class EngagementAnalytics:
-    def __init__(self, df):
+    def __init__(self, df, cache=None, data_version=None, sql_backend=None):
         self.df = df
+        self.cache = cache
+        self.data_version = data_version
+        self.sql_backend = sql_backend
+
+    def compute(self):
+        # Work on a shallow copy so derived columns never touch the shared frame
+        df = self.df.copy(deep=False)
+
+        # Both analyses aggregate per MSISDN, so compute all their aggregations in one pass
+        engine = CustomerAggregationEngine(df)
+        customer_aggs, application_aggs = TelecomEngagementAnalysis.named_aggregations()
+        engine.request(customer_aggs).request(application_aggs)
+        if self.sql_backend is None:
+            engine.request(UserEngagementAnalysis.AGGREGATIONS)
+        engine.compute()
+
+        user_engagement = UserEngagementAnalysis(df, engine, self.sql_backend)
+        telecom_engagement = TelecomEngagementAnalysis(df, engine)
+        return {
+            'user_engagement': user_engagement,
+            'engagement_metrics': user_engagement.aggregate_user_metrics(),
+            'top_customers': user_engagement.top_customers_by_engagement(metric='total_traffic', top_n=5),
+            'telecom_engagement': telecom_engagement,
+            'agg_data': telecom_engagement.aggregate_metrics_by_customer(),
+            'top_users_youtube': telecom_engagement.top_users_by_application('Youtube DL (Bytes)', top_n=10)
+        }
 
     def display(self):
+        artifacts = cached_artifacts(self.cache, 'engagement', self.data_version, self.compute, shared=self.df,
+                                     pushdown=self.sql_backend is not None)
+
         # User engagement analysis
-        user_engagement = UserEngagementAnalysis(self.df)
-        engagement_metrics = user_engagement.aggregate_user_metrics()
+        user_engagement = artifacts['user_engagement']
 
         st.subheader("Engagement Analytics")
 
+        if self.sql_backend is not None:
+            st.caption("Aggregated in the database from the stored xdr_data table (uncleaned, original units).")
         st.write("### Aggregated User Metrics")
-        st.dataframe(engagement_metrics.head())
+        st.dataframe(artifacts['engagement_metrics'].head())
 
         st.write("### Top 5 Customers by Total Traffic")
-        top_customers = user_engagement.top_customers_by_engagement(metric='total_traffic', top_n=5)
-        st.dataframe(top_customers)
+        st.dataframe(artifacts['top_customers'])
 
         st.write("### Aggregated Metrics Plot")
         st.pyplot(user_engagement.plot_aggregated_metrics())
 
         # Telecom engagement analysis
-        telecom_engagement = TelecomEngagementAnalysis(self.df)
-        agg_data = telecom_engagement.aggregate_metrics_by_customer()
+        telecom_engagement = artifacts['telecom_engagement']
 
         st.write("### Aggregated Metrics by Customer")
-        st.dataframe(agg_data.head())
+        st.dataframe(artifacts['agg_data'].head())
 
         st.write("### Top 10 Users by Application Traffic (YouTube)")
-        top_users_youtube = telecom_engagement.top_users_by_application('Youtube DL (Bytes)', top_n=10)
-        st.dataframe(top_users_youtube)
+        st.dataframe(artifacts['top_users_youtube'])
 
         st.write("### Top 3 Most Used Applications")
         st.pyplot(telecom_engagement.plot_top_applications(top_n=3))
@@ -1,5 +1,7 @@
 import streamlit as st
 import os
+import numpy as np
+import pandas as pd
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
 
@@ -7,27 +9,44 @@ from experience_analytics.aggregate_customer import AggregateCustomer
 from experience_analytics.network_parameter_analyzer import NetworkParameterAnalyzer
 from experience_analytics.distribution_analysis import DistributionAnalysis
 from experience_analytics.experience_clustering import ExperienceClustering
+from dashboard_analytics.artifact_cache import cached_artifacts
+from registry.model_registry import ModelRegistry
 
 class ExperienceAnalytics:
-    def __init__(self, df):
+    def __init__(self, df, cache=None, data_version=None):
         self.df = df
+        self.cache = cache
+        self.data_version = data_version
 
-    def display(self):
+    def compute(self):
+        # Each analysis gets its own shallow copy, as they add or fill columns in place
         # Aggregate data per customer
-        aggregate_customer = AggregateCustomer(self.df)
-        customer_data = aggregate_customer.run_analysis()
+        customer_data = AggregateCustomer(self.df.copy(deep=False)).run_analysis()
 
         # Network parameter analysis
-        analyzer = NetworkParameterAnalyzer(self.df)
-        tcp_stats = analyzer.compute_tcp_stats()
+        tcp_stats = NetworkParameterAnalyzer(self.df.copy(deep=False)).compute_tcp_stats()
 
         # Distribution analysis
-        distribution_analysis = DistributionAnalysis(self.df)
-        distribution_report = distribution_analysis.generate_report()
+        distribution_report = DistributionAnalysis(self.df.copy(deep=False)).generate_report()
 
         # Clustering analysis
-        clustering = ExperienceClustering(self.df)
-        clustering.run()
+        clustering = ExperienceClustering(self.df.copy(deep=False), registry=ModelRegistry())
+        clustering.run(data_version=self.data_version)
+        # Keep only the labels and centroids, not the clustering object holding the session frame
+        centroids = pd.DataFrame(clustering.scaler.inverse_transform(clustering.kmeans.cluster_centers_),
+                                 columns=clustering.features)
+        return {
+            'customer_data': customer_data,
+            'tcp_stats': tcp_stats,
+            'distribution_report': distribution_report,
+            'clustering': {'labels': np.asarray(clustering.labels), 'centroids': centroids}
+        }
+
+    def display(self):
+        artifacts = cached_artifacts(self.cache, 'experience', self.data_version, self.compute, shared=self.df)
+        customer_data = artifacts['customer_data']
+        tcp_stats = artifacts['tcp_stats']
+        distribution_report = artifacts['distribution_report']
 
         st.subheader("Experience Analytics")
 
@@ -42,3 +61,4 @@ class ExperienceAnalytics:
 
         st.write("### Clustering Analysis")
         st.text("Clustering results have been generated.")
+        st.dataframe(artifacts['clustering']['centroids'])
@@ -8,70 +8,93 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
 
 from experience_analytics.experience_clustering import ExperienceClustering
 from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
-from satisfaction_analysis.engagement_experience_scores import EngagementExperienceScores
 from satisfaction_analysis.top_satifactions_analysis import TopSatisfactionAnalysis
 from satisfaction_analysis.satisfaction_score_predictor import SatisfactionScorePredictor
 from satisfaction_analysis.satisfaction_kmeans import SatisfactionKMeans
 from satisfaction_analysis.cluster_score_aggregator import ClusterScoreAggregator
+from dashboard_analytics.artifact_cache import cached_artifacts
+from registry.model_registry import ModelRegistry
 
 class SatisfactionAnalytics:
-    def __init__(self, df):
+    def __init__(self, df, cache=None, data_version=None, engagement_clusters=3, satisfaction_clusters=2):
         self.df = df
+        self.cache = cache
+        self.data_version = data_version
+        self.engagement_clusters = engagement_clusters
+        self.satisfaction_clusters = satisfaction_clusters
+
+    def compute(self):
+        # Work on a shallow copy so derived columns never touch the shared frame
+        df = self.df.copy(deep=False)
+        # Fitted scalers and models are reused from disk until the data drifts
+        registry = ModelRegistry()
 
-    def display(self):
-        st.subheader("Satisfaction Analytics")
-        
         # Run engagement and experience analysis
-        engagement_analysis = TelecomEngagementAnalysis(self.df)
+        engagement_analysis = TelecomEngagementAnalysis(df, registry=registry)
         engagement_data = engagement_analysis.aggregate_metrics_by_customer()
         normalized_data = engagement_analysis.normalize_metrics()
-        engagement_data_with_clusters = engagement_analysis.k_means_clustering(n_clusters=3)
+        engagement_data_with_clusters = engagement_analysis.k_means_clustering(n_clusters=self.engagement_clusters)
 
-        experience_clustering = ExperienceClustering(df=self.df)
-        experience_clustering.run()
+        experience_clustering = ExperienceClustering(df=df, registry=registry)
+        experience_clustering.run(data_version=self.data_version)
         experience_data = experience_clustering.df[['MSISDN/Number', 'Cluster']]
         experience_data.rename(columns={'Cluster': 'experience_cluster'}, inplace=True)
 
         # Merge engagement and experience data
         user_df = pd.merge(engagement_data_with_clusters, experience_data, on='MSISDN/Number', how='inner')
 
-        # Satisfaction Score Analysis
+        # Satisfaction Score Analysis, scoring the users once for every artifact below
         engagement_clusters = engagement_analysis.kmeans
         experience_clusters = experience_clustering.kmeans
-        satisfaction_analysis = EngagementExperienceScores(
+        top_satisfaction_analysis = TopSatisfactionAnalysis(
             user_data=user_df,
             engagement_clusters=engagement_clusters,
-            experience_clusters=experience_clusters
+            experience_clusters=experience_clusters,
+            data_version=self.data_version
         )
-        user_scores_df = satisfaction_analysis.assign_scores_to_users()
-
-        st.write("### Engagement and Experience Scores")
-        st.dataframe(user_scores_df.head())
+        user_scores_df = top_satisfaction_analysis.calculate_satisfaction_score()
 
         # Top satisfaction analysis
-        top_satisfaction_analysis = TopSatisfactionAnalysis(
-            user_data=user_df,
-            engagement_clusters=engagement_clusters,
-            experience_clusters=experience_clusters
-        )
         top_satisfied_customers = top_satisfaction_analysis.top_n_satisfied_customers(n=10)
-        st.write("### Top 10 Satisfied Customers")
-        st.dataframe(top_satisfied_customers)
 
-        st.write("### Satisfaction Score Prediction")
-        satisfaction_predictor = SatisfactionScorePredictor(user_data=user_scores_df)
+        satisfaction_predictor = SatisfactionScorePredictor(user_data=user_scores_df, registry=registry)
         satisfaction_predictor.build_regression_model()
         predicted_satisfaction = satisfaction_predictor.predict_satisfaction(engagement_score=50, experience_score=45)
-        st.write(f"Predicted Satisfaction Score for Engagement=50, Experience=45: {predicted_satisfaction:.2f}")
 
         # K-Means Analysis
-        kmeans_analysis = SatisfactionKMeans(data=user_scores_df)
+        kmeans_analysis = SatisfactionKMeans(data=user_scores_df, registry=registry)
         kmeans_analysis.preprocess_data()
-        clustered_data = kmeans_analysis.run_kmeans(k=2)
+        clustered_data = kmeans_analysis.run_kmeans(k=self.satisfaction_clusters)
+
+        return {
+            'user_scores_df': user_scores_df,
+            'top_satisfied_customers': top_satisfied_customers,
+            'satisfaction_predictor': satisfaction_predictor,
+            'predicted_satisfaction': predicted_satisfaction,
+            'clustered_data': clustered_data
+        }
+
+    def display(self):
+        st.subheader("Satisfaction Analytics")
+
+        artifacts = cached_artifacts(
+            self.cache, 'satisfaction', self.data_version, self.compute, shared=self.df,
+            engagement_clusters=self.engagement_clusters, satisfaction_clusters=self.satisfaction_clusters
+        )
+
+        st.write("### Engagement and Experience Scores")
+        st.dataframe(artifacts['user_scores_df'].head())
+
+        st.write("### Top 10 Satisfied Customers")
+        st.dataframe(artifacts['top_satisfied_customers'])
+
+        st.write("### Satisfaction Score Prediction")
+        st.write(f"Predicted Satisfaction Score for Engagement=50, Experience=45: {artifacts['predicted_satisfaction']:.2f}")
+
         st.write("### Satisfaction K-Means Clustering")
-        st.dataframe(clustered_data.head())
+        st.dataframe(artifacts['clustered_data'].head())
 
         # Cluster Score Aggregation
-        score_aggregator = ClusterScoreAggregator(user_data=clustered_data)
+        score_aggregator = ClusterScoreAggregator(user_data=artifacts['clustered_data'])
         st.write("### Cluster Score Aggregation")
         score_aggregator.plot_cluster_scores()
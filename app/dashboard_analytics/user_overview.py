@@ -2,20 +2,37 @@ import streamlit as st
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
-from over_view_analysis.telecom_data_anlyzer import TelecomDataAnalyzer
+from over_view_analysis.telecom_data_anlyzer import TelecomDataAnalyzer, handset_summary
 from over_view_analysis.user_over_view_analysis import UserOverviewAnalysis
+from dashboard_analytics.artifact_cache import cached_artifacts
 
 class UserOverview:
-    def __init__(self, df):
+    def __init__(self, df, cache=None, data_version=None, sql_backend=None):
         self.df = df
+        self.cache = cache
+        self.data_version = data_version
+        self.sql_backend = sql_backend
+
+    def compute(self):
+        # Work on a shallow copy so derived columns never touch the shared frame
+        df = self.df.copy(deep=False)
+        analyzer = TelecomDataAnalyzer(df, sql_backend=self.sql_backend)
+        return {
+            'analyzer': analyzer,
+            'recommendations': analyzer.generate_recommendations(),
+            'user_overview': UserOverviewAnalysis(df, sql_backend=self.sql_backend).aggregate_user_data()
+        }
 
     def display(self):
-        analyzer = TelecomDataAnalyzer(self.df)
-        recommendations = analyzer.generate_recommendations()
-        user_analysis = UserOverviewAnalysis(self.df)
-        user_overview = user_analysis.aggregate_user_data()
+        artifacts = cached_artifacts(self.cache, 'user_overview', self.data_version, self.compute, shared=self.df,
+                                     pushdown=self.sql_backend is not None)
+        analyzer = artifacts['analyzer']
+        recommendations = artifacts['recommendations']
+        user_overview = artifacts['user_overview']
 
         st.subheader("User Overview Analysis")
+        if self.sql_backend is not None:
+            st.caption("Aggregated in the database from the stored xdr_data table (uncleaned, original units).")
         st.write("### Top 10 Handsets")
         st.dataframe(recommendations['Top 10 Handsets'])
         st.pyplot(analyzer.plot_top_10_handsets())
@@ -30,3 +47,24 @@ class UserOverview:
 
         st.write("### Aggregated User Data")
         st.dataframe(user_overview)
+
+    @staticmethod
+    def display_summary(summary):
+        """Render the overview from the aggregate summary query while the full data is loading."""
+        st.subheader("User Overview Analysis")
+        sessions, users, download, upload = st.columns(4)
+        sessions.metric("Sessions", f"{summary['sessions']:,}")
+        users.metric("Users", f"{summary['users']:,}")
+        download.metric("Total DL", f"{(summary['total_dl_bytes'] or 0) / 1024 ** 4:,.2f} TB")
+        upload.metric("Total UL", f"{(summary['total_ul_bytes'] or 0) / 1024 ** 4:,.2f} TB")
+
+        tables = handset_summary(summary['handset_counts'])
+        st.write("### Top 10 Handsets")
+        st.dataframe(tables['Top 10 Handsets'])
+        st.bar_chart(tables['Top 10 Handsets'])
+
+        st.write("### Top 3 Manufacturers")
+        st.dataframe(tables['Top 3 Manufacturers'])
+
+        st.write("### Top 5 Handsets per Manufacturer")
+        st.dataframe(tables['Top 5 Handsets per Manufacturer'])
@@ -1,62 +1,160 @@
 import os
 import sys
+import threading
+import time
+import uuid
+import pandas as pd
 import streamlit as st
 from dashboard_analytics.satisfaction_analysis import SatisfactionAnalytics
 from dashboard_analytics.user_overview import UserOverview
 from dashboard_analytics.experience_analytics import ExperienceAnalytics
 from dashboard_analytics.engagement_analysis import EngagementAnalytics
+from dashboard_analytics.artifact_cache import get_artifact_cache, render_cache_panel
+from dashboard_analytics.background_loader import BackgroundLoader, render_load_progress
 
 # Ensure the correct paths are set
 sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../databases'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../utils'))
 from load_env import load_environment
-from connections.database_connector import DatabaseConnection
+from connections.database_connector import get_database_connection
 from data_loader.teleco_data_loader import TelecoDataLoader
 from cleaning.data_cleaning import DataCleaner
+from data_loader.snapshot_cache import SnapshotCache
+from aggregation.sql_pushdown import get_sql_backend
+
+# How long the cleaned frame is reused before the source table is checked for new data
+DATA_TTL_SECONDS = int(os.getenv('DASHBOARD_DATA_TTL', 600))
+# Seconds between reruns refreshing the progress while the data loads
+PROGRESS_REFRESH_SECONDS = float(os.getenv('DASHBOARD_PROGRESS_REFRESH', 1.0))
+# Serializes restarts, so sessions restarting the same failed load start only one new load
+_restart_lock = threading.Lock()
+
+@st.cache_resource(ttl=DATA_TTL_SECONDS, show_spinner="Checking xDR data...")
+def start_background_load():
+    """
+    Start loading and cleaning the xDR data in the background, once per TTL for all sessions and reruns.
+
+    Returns:
+    - (data_version, loader): The snapshot key of the source data and the BackgroundLoader.
+    """
+    db_connection = TellCoAnalyticsDashboard.connect_to_database()
+    return TellCoAnalyticsDashboard.start_loading(db_connection)
 
 class TellCoAnalyticsDashboard:
     def __init__(self):
         load_environment()  # Load environment variables
-        self.db_connection = self.connect_to_database()
-        self.df = self.load_and_clean_data()
+        self.data_version, self.loader = start_background_load()
+        # The frame is shared between sessions: pages must not modify it in place
+        self.df = self.loader.result() if self.loader.succeeded() else None
+        self.cache = get_artifact_cache()
+        # With AGGREGATION_PUSHDOWN set, the overview and engagement aggregations run in the database
+        self.sql_backend = get_sql_backend(self.connect_to_database())
 
     @staticmethod
     def connect_to_database():
+        # One pool per process: sessions and reruns borrow connections instead of reconnecting
         if os.getenv('STREAMLIT_ENV') == 'production':
-            db_connection = DatabaseConnection(
+            return get_database_connection(
                 db_name=st.secrets["DB_NAME"],
                 user=st.secrets["DB_USER"],
                 password=st.secrets["DB_PASSWORD"],
                 host=st.secrets["DB_HOST"],
                 port=st.secrets["DB_PORT"]
             )
-            db_connection.connect()
-            return db_connection
         else:
-            db_connection = DatabaseConnection(
+            return get_database_connection(
                 db_name=os.getenv('DB_NAME'),
                 user=os.getenv('DB_USER'),
                 password=os.getenv('DB_PASSWORD'),
                 host=os.getenv('DB_HOST'),
                 port=os.getenv('DB_PORT')
             )
-            db_connection.connect()
-            
-            return db_connection
-
-    def load_and_clean_data(self):
-        data_loader = TelecoDataLoader(db_connection=self.db_connection)
-        df = data_loader.load_data("xdr_data")
-        self.db_connection.close()
 
+    @staticmethod
+    def clean_data(df):
         data_cleaner = DataCleaner(df)
         data_cleaner.clean_data()
         data_cleaner.convert_units_to_mb()
         data_cleaner.handle_missing_and_outliers()
-
         return data_cleaner.df
 
+    @staticmethod
+    def start_loading(db_connection):
+        """
+        Start a BackgroundLoader for the cleaned xDR data: a summary query first, then the table
+        streamed in chunks and cleaned (or the cleaned snapshot read from disk when it is current).
+        """
+        data_loader = TelecoDataLoader(db_connection=db_connection)
+        fingerprint = data_loader.fetch_fingerprint("xdr_data")
+        snapshot_cache = SnapshotCache()
+
+        def summary():
+            return data_loader.fetch_overview_summary("xdr_data")
+
+        if snapshot_cache.exists(fingerprint):
+            loader = BackgroundLoader(summary, finish=lambda _: snapshot_cache.load(fingerprint))
+        else:
+            def finish(chunks):
+                df = pd.concat(chunks, ignore_index=True)
+                # Release the chunks before cleaning, so the table is not held twice while it is cleaned
+                chunks.clear()
+                df = TellCoAnalyticsDashboard.clean_data(df)
+                snapshot_cache.save(fingerprint, df)
+                return df
+
+            loader = BackgroundLoader(
+                summary,
+                chunks=lambda: data_loader.stream_data("xdr_data", compact=False),
+                finish=finish,
+                total_rows=lambda result: result['sessions']
+            )
+        return snapshot_cache.snapshot_key(fingerprint), loader.start()
+
+    def restart_loading(self):
+        """Start a new load in place of the cancelled or failed one, unless another session already did."""
+        with _restart_lock:
+            if start_background_load()[1] is self.loader:
+                start_background_load.clear()
+
+    def show_loading(self, option):
+        """
+        Render what is available while the data loads, and rerun until it is ready.
+
+        The load is shared by every session: "Cancel loading" only stops this session waiting for
+        it, and the load itself is cancelled once no session waits for it any more.
+        """
+        session_id = st.session_state.setdefault('session_id', uuid.uuid4().hex)
+        progress = render_load_progress(self.loader, st.sidebar)
+        if progress['phase'] in ('cancelled', 'failed'):
+            st.error(f"Loading the xDR data {progress['phase']}." +
+                     (f" {progress['error']}" if progress['error'] else ''))
+            if st.sidebar.button("Restart loading"):
+                st.session_state.pop('loading_detached', None)
+                self.restart_loading()
+                st.rerun()
+            return
+
+        if st.session_state.get('loading_detached'):
+            st.info("Loading was cancelled for this session; other sessions may still be loading the data.")
+            if st.sidebar.button("Resume loading"):
+                st.session_state.pop('loading_detached')
+                st.rerun()
+            return
+
+        self.loader.attach(session_id)
+        if st.sidebar.button("Cancel loading"):
+            st.session_state['loading_detached'] = True
+            self.loader.detach(session_id)
+            st.rerun()
+        if option == "User Overview" and self.loader.summary is not None:
+            UserOverview.display_summary(self.loader.summary)
+        else:
+            st.info(f"{option} needs the full dataset; it will show once loading completes.")
+        # Navigating away interrupts this run, so only the page on screen keeps polling
+        time.sleep(PROGRESS_REFRESH_SECONDS)
+        st.rerun()
+
     def run(self):
         st.title("TellCo User Analytics Dashboard")
         st.sidebar.header("Navigation")
@@ -65,15 +163,20 @@ class TellCoAnalyticsDashboard:
             ["User Overview", "Experience Analytics", "Engagement Analytics", "Satisfaction Analytics"]
         )
 
+        if self.df is None:
+            self.show_loading(option)
+            return
 
         if option == "User Overview":
-            UserOverview(self.df).display()
+            UserOverview(self.df, self.cache, self.data_version, self.sql_backend).display()
         elif option == "Experience Analytics":
-            ExperienceAnalytics(self.df).display()
+            ExperienceAnalytics(self.df, self.cache, self.data_version).display()
         elif option == "Engagement Analytics":
-            EngagementAnalytics(self.df).display()
+            EngagementAnalytics(self.df, self.cache, self.data_version, self.sql_backend).display()
         elif option == "Satisfaction Analytics":
-            SatisfactionAnalytics(self.df).display()
+            SatisfactionAnalytics(self.df, self.cache, self.data_version).display()
+
+        render_cache_panel(self.cache, self.data_version)
 
 # Run the dashboard
 if __name__ == '__main__':
@@ -0,0 +1,207 @@
+import csv
+import io
+import time
+
+import pandas as pd
+
+WRITE_MODES = ('upsert', 'swap', 'append')
+
+
+def quote_ident(name):
+    """Quote a PostgreSQL identifier (table or column name), escaping embedded double quotes."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_table(table_name):
+    """Quote a possibly schema-qualified table name ('schema.table')."""
+    return '.'.join(quote_ident(part) for part in str(table_name).split('.'))
+
+
+def postgres_type(dtype):
+    """PostgreSQL column type used when the target table has to be created from a frame."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE PRECISION'
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return 'TIMESTAMPTZ'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+
+def csv_batches(df, batch_size):
+    """
+    Serialize a DataFrame into CSV buffers of at most `batch_size` rows, in the format read by
+    `COPY ... FROM STDIN WITH (FORMAT csv)`: no header, missing values as unquoted empty fields
+    (NULL) and floats written with full precision.
+
+    Yields:
+    - (rows, io.StringIO) per batch.
+    """
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        buffer = io.StringIO()
+        batch.to_csv(buffer, index=False, header=False, na_rep='', float_format='%.17g',
+                     date_format='%Y-%m-%d %H:%M:%S.%f%z', quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+        buffer.seek(0)
+        yield len(batch), buffer
+
+
+class BulkCopyWriter:
+    def __init__(self, connection, batch_size=100_000, mode='upsert', key_columns=None):
+        """
+        Write DataFrames into PostgreSQL by streaming them through `COPY ... FROM STDIN` into a
+        staging table, then merging the staging table into the target in the same transaction.
+
+        Modes:
+        - 'upsert': `INSERT ... SELECT ... ON CONFLICT (key_columns) DO UPDATE`; rows of the target
+          that are not in the frame are kept. Needs a unique constraint on the key columns, which
+          is created together with the table when the target does not exist yet.
+        - 'swap': the staging table is built like the target (columns, defaults, constraints and
+          indexes; or from the frame when its columns differ), then renamed over the target, so
+          readers see either the old or the new table.
+        - 'append': plain `INSERT ... SELECT` from the staging table.
+
+        Parameters:
+        - connection: Open psycopg2 connection (e.g. DatabaseConnection.get_connection()).
+        - batch_size: Rows serialized and sent per COPY.
+        - mode: One of 'upsert', 'swap' or 'append'.
+        - key_columns: Conflict key of the upsert mode.
+        """
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unknown write mode '{mode}', expected one of {WRITE_MODES}.")
+        if mode == 'upsert' and not key_columns:
+            raise ValueError("The 'upsert' mode needs key_columns.")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive.")
+        self.connection = connection
+        self.batch_size = batch_size
+        self.mode = mode
+        self.key_columns = list(key_columns or [])
+
+    def table_columns(self, cursor, table_name):
+        """Column names of a table, or None when it does not exist."""
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (quote_table(table_name),))
+        if not cursor.fetchone()[0]:
+            return None
+        cursor.execute(f"SELECT * FROM {quote_table(table_name)} LIMIT 0")
+        return [description[0] for description in cursor.description]
+
+    def create_table_sql(self, df, quoted_name, temporary=False):
+        """CREATE TABLE statement for the frame's columns, keyed on key_columns in upsert mode."""
+        columns = [f"{quote_ident(column)} {postgres_type(dtype)}" for column, dtype in df.dtypes.items()]
+        if temporary:
+            return f"CREATE TEMP TABLE {quoted_name} ({', '.join(columns)}) ON COMMIT DROP"
+        if self.mode == 'upsert':
+            columns.append(f"PRIMARY KEY ({', '.join(quote_ident(column) for column in self.key_columns)})")
+        return f"CREATE TABLE {quoted_name} ({', '.join(columns)})"
+
+    def merge_sql(self, columns, table_name, staging_name):
+        """Statement moving the staging rows into the target (upsert and append modes)."""
+        column_list = ', '.join(quote_ident(column) for column in columns)
+        if self.mode == 'append':
+            return f"INSERT INTO {quote_table(table_name)} ({column_list}) SELECT {column_list} FROM {staging_name}"
+
+        keys = ', '.join(quote_ident(column) for column in self.key_columns)
+        updates = [f"{quote_ident(column)} = EXCLUDED.{quote_ident(column)}"
+                   for column in columns if column not in self.key_columns]
+        action = f"DO UPDATE SET {', '.join(updates)}" if updates else 'DO NOTHING'
+        # ON CONFLICT cannot touch one target row twice, so keep the last staged row per key
+        return (f"INSERT INTO {quote_table(table_name)} ({column_list}) "
+                f"SELECT DISTINCT ON ({keys}) {column_list} FROM {staging_name} "
+                f"ORDER BY {keys}, _staging_row DESC "
+                f"ON CONFLICT ({keys}) {action}")
+
+    def copy_sql(self, columns, staging_name):
+        column_list = ', '.join(quote_ident(column) for column in columns)
+        return f"COPY {staging_name} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+
+    def write(self, df, table_name):
+        """
+        Write a DataFrame into a table (created from the frame when missing).
+
+        Returns:
+        - Dict with 'rows', 'batches', 'seconds', 'rows_per_second' and 'mode'.
+        """
+        columns = [str(column) for column in df.columns]
+        missing_keys = [column for column in self.key_columns if column not in columns]
+        if missing_keys:
+            raise ValueError(f"Key columns {missing_keys} are not in the DataFrame.")
+        df = df.set_axis(columns, axis=1)
+
+        start = time.perf_counter()
+        rows = batches = 0
+        try:
+            with self.connection.cursor() as cursor:
+                target_columns = self.table_columns(cursor, table_name)
+                staging_name = self._create_staging(cursor, df, table_name, target_columns)
+                copy_sql = self.copy_sql(columns, staging_name)
+                for batch_rows, buffer in csv_batches(df, self.batch_size):
+                    cursor.copy_expert(copy_sql, buffer)
+                    rows += batch_rows
+                    batches += 1
+
+                if self.mode == 'swap':
+                    self._swap(cursor, table_name, staging_name, target_columns is not None)
+                else:
+                    if target_columns is None:
+                        cursor.execute(self.create_table_sql(df, quote_table(table_name)))
+                    cursor.execute(self.merge_sql(columns, table_name, staging_name))
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+        seconds = time.perf_counter() - start
+        stats = {'rows': rows, 'batches': batches, 'seconds': seconds,
+                 'rows_per_second': rows / seconds if seconds > 0 else float('inf'), 'mode': self.mode}
+        print(f"Wrote {rows:,} rows to {table_name} ({self.mode}) in {batches} batches: "
+              f"{seconds:.2f} s, {stats['rows_per_second']:,.0f} rows/s")
+        return stats
+
+    @staticmethod
+    def _sibling(table_name, suffix):
+        """Quoted name of a table next to the target (same schema) with a suffix."""
+        schema, _, name = str(table_name).rpartition('.')
+        sibling = quote_ident(f"{name}__{suffix}")
+        return f"{quote_ident(schema)}.{sibling}" if schema else sibling
+
+    def _create_staging(self, cursor, df, table_name, target_columns):
+        """Create the staging table the batches are copied into and return its quoted name."""
+        # Reuse the target's definition when the frame has the same columns; otherwise the frame
+        # defines the table, as DataFrame.to_sql(if_exists='replace') would
+        like_target = target_columns is not None and set(target_columns) == set(map(str, df.columns))
+
+        if self.mode == 'swap':
+            # A regular table next to the target, since it becomes the target
+            staging_name = self._sibling(table_name, 'staging')
+            cursor.execute(f"DROP TABLE IF EXISTS {staging_name}")
+            if like_target:
+                cursor.execute(f"CREATE TABLE {staging_name} (LIKE {quote_table(table_name)} INCLUDING ALL)")
+            else:
+                cursor.execute(self.create_table_sql(df, staging_name))
+            return staging_name
+
+        # Session-local and dropped on commit; _staging_row records the arrival order
+        staging_name = quote_ident(f"{str(table_name).rpartition('.')[2]}__staging")
+        if target_columns is not None:
+            cursor.execute(f"CREATE TEMP TABLE {staging_name} (LIKE {quote_table(table_name)}) ON COMMIT DROP")
+        else:
+            cursor.execute(self.create_table_sql(df, staging_name, temporary=True))
+        cursor.execute(f"ALTER TABLE {staging_name} ADD COLUMN _staging_row BIGSERIAL")
+        return staging_name
+
+    def _swap(self, cursor, table_name, staging_name, exists):
+        """Replace the target with the staging table; the renames commit atomically."""
+        name = quote_ident(str(table_name).rpartition('.')[2])
+        if exists:
+            old_name = self._sibling(table_name, 'old')
+            cursor.execute(f"DROP TABLE IF EXISTS {old_name}")
+            cursor.execute(f"ALTER TABLE {quote_table(table_name)} RENAME TO {old_name.rpartition('.')[2]}")
+            cursor.execute(f"ALTER TABLE {staging_name} RENAME TO {name}")
+            cursor.execute(f"DROP TABLE {old_name}")
+        else:
+            cursor.execute(f"ALTER TABLE {staging_name} RENAME TO {name}")
@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=1, max_size=10, timeout=30.0, health_check_interval=30.0,
+                 max_retries=5, backoff=0.5, max_backoff=10.0):
+        """
+        Thread-safe pool of DB-API connections shared by the loaders, exporters and dashboard sessions.
+
+        Idle connections are handed out most recently used first. A connection idle for longer than
+        `health_check_interval` is probed with `SELECT 1` before it is handed out, and replaced when
+        the probe fails. New connections are opened with exponential backoff between attempts.
+
+        Parameters:
+        - connect: Callable opening a new connection (e.g. a psycopg2.connect partial).
+        - min_size: Connections opened up front and kept open.
+        - max_size: Maximum number of open connections; further checkouts wait.
+        - timeout: Seconds a checkout waits for a free connection before raising TimeoutError.
+        - health_check_interval: Idle seconds after which a connection is probed before reuse.
+        - max_retries: Connection attempts before giving up with ConnectionError.
+        - backoff: Delay before the first retry, doubled on every further attempt.
+        - max_backoff: Upper bound of the retry delay.
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Expected 0 <= min_size <= max_size and max_size >= 1.")
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.idle = deque()  # (connection, time it was returned)
+        self.condition = threading.Condition()
+        self.open_connections = 0
+        self.closed = False
+        self.counters = {'checkouts': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0, 'timeouts': 0,
+                         'created': 0, 'discarded': 0, 'failed_health_checks': 0, 'connect_retries': 0,
+                         'peak_open': 0}
+
+        for _ in range(min_size):
+            connection = self._open()
+            with self.condition:
+                self._reserve()
+                self.idle.append((connection, time.monotonic()))
+
+    def _reserve(self):
+        """Count one more open connection; called with the condition held."""
+        self.open_connections += 1
+        self.counters['peak_open'] = max(self.counters['peak_open'], self.open_connections)
+
+    def _open(self):
+        """Open a new connection, retrying with backoff (the caller accounts for the slot)."""
+        delay = self.backoff
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                connection = self.connect()
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise ConnectionError(f"Could not connect after {attempt} attempts: {e}") from e
+                print(f"Connection attempt {attempt} failed ({e}); retrying in {delay:.1f} s")
+                with self.condition:
+                    self.counters['connect_retries'] += 1
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+        with self.condition:
+            self.counters['created'] += 1
+        return connection
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.open_connections -= 1
+            self.counters['discarded'] += 1
+            self.condition.notify()
+
+    def _healthy(self, connection):
+        """Probe a connection with a trivial query, leaving no transaction open."""
+        if getattr(connection, 'closed', False):
+            return False
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self, timeout=None):
+        """
+        Check out a connection, waiting up to `timeout` seconds (the pool default when None).
+
+        Returns:
+        - A connection that must be handed back with `putconn`.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.open_connections >= self.max_size and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters['timeouts'] += 1
+                        raise TimeoutError(f"No database connection available within {timeout} s "
+                                           f"({self.open_connections} open, max_size={self.max_size}).")
+                    self.condition.wait(remaining)
+                if self.closed:
+                    raise ConnectionError("The connection pool is closed.")
+                if self.idle:
+                    connection, returned_at = self.idle.pop()
+                else:
+                    connection, returned_at = None, None
+                    # Reserve the slot before connecting outside the lock
+                    self._reserve()
+
+            if connection is None:
+                try:
+                    connection = self._open()
+                except Exception:
+                    with self.condition:
+                        self.open_connections -= 1
+                        self.condition.notify()
+                    raise
+            elif time.monotonic() - returned_at > self.health_check_interval and not self._healthy(connection):
+                with self.condition:
+                    self.counters['failed_health_checks'] += 1
+                self._close(connection)
+                continue
+
+            waited = time.monotonic() - started
+            with self.condition:
+                self.counters['checkouts'] += 1
+                self.counters['wait_seconds'] += waited
+                self.counters['max_wait_seconds'] = max(self.counters['max_wait_seconds'], waited)
+            return connection
+
+    def putconn(self, connection, discard=False):
+        """Return a connection; it is rolled back to a clean state, or closed when that fails."""
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+        with self.condition:
+            keep = not discard and not self.closed and not getattr(connection, 'closed', False)
+            if keep:
+                self.idle.append((connection, time.monotonic()))
+                self.condition.notify()
+                return
+        self._close(connection)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Borrow a connection for the duration of a `with` block."""
+        connection = self.getconn(timeout)
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+
+    def stats(self):
+        """Pool counters plus the current number of open, idle and checked-out connections."""
+        with self.condition:
+            stats = dict(self.counters)
+            stats.update({
+                'open': self.open_connections,
+                'idle': len(self.idle),
+                'in_use': self.open_connections - len(self.idle),
+                'mean_wait_seconds': stats['wait_seconds'] / stats['checkouts'] if stats['checkouts'] else 0.0,
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+        return stats
+
+    def close(self):
+        """Close the idle connections; checked-out ones are closed when they are returned."""
+        with self.condition:
+            self.closed = True
+            idle = [connection for connection, _ in self.idle]
+            self.idle.clear()
+            self.condition.notify_all()
+        for connection in idle:
+            self._close(connection)
@@ -1,33 +1,115 @@
+import functools
+import threading
+from contextlib import contextmanager
+
 import psycopg2
 
+from connections.connection_pool import ConnectionPool
+
 class DatabaseConnection:
-    def __init__(self, db_name, user, password, host, port):
+    def __init__(self, db_name, user, password, host, port, min_size=1, max_size=10, timeout=30.0,
+                 health_check_interval=30.0, max_retries=5, connect_timeout=10):
+        """
+        PostgreSQL connection settings backed by a thread-safe ConnectionPool.
+
+        `connection()` borrows a pooled connection for a `with` block and is safe to use from
+        several threads. `get_connection()` keeps returning one connection reserved for this
+        object, for single-threaded callers.
+
+        Parameters:
+        - db_name, user, password, host, port: Connection settings.
+        - min_size, max_size, timeout, health_check_interval, max_retries: See ConnectionPool.
+        - connect_timeout: Seconds libpq waits when opening a connection.
+        """
         self.db_name = db_name
         self.user = user
         self.password = password
         self.host = host
         self.port = port
-        self.connection = None
-    
+        self.pool_options = {'min_size': min_size, 'max_size': max_size, 'timeout': timeout,
+                             'health_check_interval': health_check_interval, 'max_retries': max_retries}
+        self.connect_timeout = connect_timeout
+        self.pool = None
+        self.reserved = None
+        self.lock = threading.Lock()
+
     def connect(self):
         try:
-            self.connection = psycopg2.connect(
-                dbname=self.db_name,
-                user=self.user,
-                password=self.password,
-                host=self.host,
-                port=self.port
-            )
+            with self.lock:
+                if self.pool is None:
+                    self.pool = ConnectionPool(functools.partial(
+                        psycopg2.connect,
+                        dbname=self.db_name,
+                        user=self.user,
+                        password=self.password,
+                        host=self.host,
+                        port=self.port,
+                        connect_timeout=self.connect_timeout
+                    ), **self.pool_options)
             print("Connection to PostgreSQL DB successful")
         except Exception as e:
             print(f"Error connecting to PostgreSQL DB: {e}")
-    
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Borrow a pooled connection for a `with` block; it is rolled back and returned afterwards."""
+        if self.pool is None:
+            raise Exception("No database connection. Please call connect() first.")
+        with self.pool.connection(timeout) as connection:
+            yield connection
+
     def close(self):
-        if self.connection:
-            self.connection.close()
-            print("Connection closed.")
-    
+        with self.lock:
+            if self.pool is None:
+                return
+            if self.reserved is not None:
+                self.pool.putconn(self.reserved)
+                self.reserved = None
+            self.pool.close()
+            self.pool = None
+        print("Connection closed.")
+
+    disconnect = close
+
     def get_connection(self):
-        if self.connection is None:
+        if self.pool is None:
             raise Exception("No database connection. Please call connect() first.")
-        return self.connection
+        with self.lock:
+            if self.reserved is None or self.reserved.closed:
+                if self.reserved is not None:
+                    self.pool.putconn(self.reserved, discard=True)
+                self.reserved = self.pool.getconn()
+            return self.reserved
+
+    def __getstate__(self):
+        # Pickled copies (e.g. sent to worker processes) keep the settings and connect on their own
+        state = self.__dict__.copy()
+        state.update({'pool': None, 'reserved': None, 'lock': None})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def stats(self):
+        """Pool statistics (checkouts, wait time, open connections...), or None before connect()."""
+        return self.pool.stats() if self.pool is not None else None
+
+
+_shared_connections = {}
+_shared_lock = threading.Lock()
+
+
+def get_database_connection(db_name, user, password, host, port, **pool_options):
+    """
+    Process-wide connected DatabaseConnection per set of settings, so the loader, the exporters and
+    every dashboard session draw from one pool instead of connecting on each use.
+    """
+    key = (db_name, user, host, str(port))
+    with _shared_lock:
+        db_connection = _shared_connections.get(key)
+        if db_connection is None or db_connection.pool is None:
+            db_connection = DatabaseConnection(db_name, user, password, host, port, **pool_options)
+            db_connection.connect()
+            _shared_connections[key] = db_connection
+    return db_connection
@@ -0,0 +1,79 @@
+"""
+Benchmark TelecomEDA's application classification: the original per-row apply against the
+vectorized classify_applications / application_bitmask.
+
+Usage:
+    python scripts/benchmarks/bench_app_classifier.py --rows 10000000
+    python scripts/benchmarks/bench_app_classifier.py --rows 1000000 --apply-rows 50000
+
+The per-row path is timed on a subset (--apply-rows) and extrapolated; its labels are checked
+against the vectorized ones on that subset.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+from over_view_analysis.telecom_eda import application_bitmask, classify_applications
+
+APPS = ['Social Media', 'Google', 'Email', 'Youtube', 'Netflix', 'Gaming', 'Other']
+
+
+def synthetic_sessions(rows, seed=0):
+    """Per-application DL byte columns, each application active in about a quarter of the sessions."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({f'{app} DL (Bytes)': rng.gamma(2.0, 1e6, rows) * (rng.random(rows) < 0.25) for app in APPS})
+
+
+def classify_row_by_row(data):
+    """The original TelecomEDA classification."""
+    return data.apply(
+        lambda row: 'YouTube' if row['Youtube DL (Bytes)'] > 0
+        else 'Netflix' if row['Netflix DL (Bytes)'] > 0
+        else 'Social Media' if row['Social Media DL (Bytes)'] > 0
+        else 'Gaming' if row['Gaming DL (Bytes)'] > 0
+        else 'Google' if row['Google DL (Bytes)'] > 0
+        else 'Email' if row['Email DL (Bytes)'] > 0
+        else 'Other', axis=1
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--apply-rows', type=int, default=100_000, help='Rows classified by the per-row path.')
+    args = parser.parse_args()
+
+    data = synthetic_sessions(args.rows)
+    subset = data.iloc[:args.apply_rows]
+
+    start = time.perf_counter()
+    expected = classify_row_by_row(subset)
+    apply_estimate = (time.perf_counter() - start) * args.rows / len(subset)
+
+    start = time.perf_counter()
+    labels = classify_applications(data)
+    select_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mask = application_bitmask(data)
+    mask_seconds = time.perf_counter() - start
+
+    if not (labels.iloc[:len(subset)].astype(object).to_numpy() == expected.to_numpy()).all():
+        raise AssertionError('Vectorized labels differ from the per-row labels.')
+
+    object_bytes = labels.astype(object).memory_usage(deep=True)
+    print(f"{args.rows:,} sessions")
+    print(f"{'apply per row (est.)':<26}{apply_estimate:>10.2f} s")
+    print(f"{'classify_applications':<26}{select_seconds:>10.3f} s  ({apply_estimate / select_seconds:,.0f}x)")
+    print(f"{'application_bitmask':<26}{mask_seconds:>10.3f} s")
+    print(f"{'labels memory':<26}{labels.memory_usage(deep=True) / 1e6:>10.1f} MB categorical "
+          f"vs {object_bytes / 1e6:.1f} MB object; mask {mask.memory_usage() / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark TelecoDataLoader.load_data (pd.read_sql_query) against load_data_copy (COPY ... TO STDOUT).
+
+Usage:
+    python scripts/benchmarks/bench_copy_loader.py --rows 1000000
+    python scripts/benchmarks/bench_copy_loader.py --rows 1000000 --postgres
+
+Without --postgres the benchmark runs against file-backed stand-ins: an SQLite database for the
+read_sql_query path and a pre-rendered CSV stream for the COPY path, so it measures the client-side
+parsing cost only. With --postgres a synthetic table is created in the database configured by the
+DB_* environment variables. Each path runs in a fresh process so peak RSS is reported separately.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../databases'))
+
+BENCH_TABLE = 'xdr_data_bench'
+
+
+def synthetic_xdr(rows, seed=0):
+    """Build a synthetic xdr_data frame with the columns the analyses rely on."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Bearer Id': rng.integers(1, 10**15, rows).astype('float64'),
+        'Start': pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 30 * 86400, rows), unit='s'),
+        'MSISDN/Number': (3.36e10 + rng.integers(0, rows // 10 + 1, rows)).astype('float64'),
+        'IMSI': (2.08e14 + rng.integers(0, rows // 10 + 1, rows)).astype('float64'),
+        'Handset Manufacturer': rng.choice(['Apple', 'Samsung', 'Huawei'], rows),
+        'Handset Type': rng.choice(['Apple iPhone 6S', 'Samsung Galaxy S8', 'Huawei P20'], rows),
+    })
+    df['End'] = df['Start'] + pd.to_timedelta(rng.integers(1, 86400, rows), unit='s')
+    for col in ['Dur. (ms)', 'Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)',
+                'Avg Bearer TP UL (kbps)', 'Total DL (Bytes)', 'Total UL (Bytes)',
+                'Youtube DL (Bytes)', 'Netflix DL (Bytes)', 'Social Media DL (Bytes)']:
+        df[col] = rng.gamma(2.0, 1e6, rows)
+    return df
+
+
+class _FileCopyCursor:
+    """Cursor stand-in that serves COPY output from a pre-rendered CSV file."""
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, query, params):
+        return b''
+
+    def copy_expert(self, query, file):
+        with open(self.csv_path, 'rb') as source:
+            shutil.copyfileobj(source, file)
+
+
+class _StandInConnection:
+    """DatabaseConnection stand-in returning either an SQLite or a COPY-file connection."""
+
+    def __init__(self, sqlite_path=None, csv_path=None):
+        self.sqlite_path = sqlite_path
+        self.csv_path = csv_path
+
+    def get_connection(self):
+        if self.sqlite_path:
+            return sqlite3.connect(self.sqlite_path)
+        return self
+
+    @contextmanager
+    def connection(self, timeout=None):
+        yield self.get_connection()
+
+    def cursor(self):
+        return _FileCopyCursor(self.csv_path)
+
+
+def _rss_bytes():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _run(path, source, result_queue):
+    from data_loader.teleco_data_loader import TelecoDataLoader
+
+    if source['kind'] == 'postgres':
+        from connections.database_connector import DatabaseConnection
+        db_connection = DatabaseConnection(
+            db_name=os.getenv('DB_NAME'), user=os.getenv('DB_USER'), password=os.getenv('DB_PASSWORD'),
+            host=os.getenv('DB_HOST'), port=os.getenv('DB_PORT')
+        )
+        db_connection.connect()
+    elif path == 'read_sql_query':
+        db_connection = _StandInConnection(sqlite_path=source['sqlite_path'])
+    else:
+        db_connection = _StandInConnection(csv_path=source['csv_path'])
+
+    loader = TelecoDataLoader(db_connection)
+    baseline = _rss_bytes()
+    started = time.perf_counter()
+    if path == 'read_sql_query':
+        df = loader.load_data(f'"{BENCH_TABLE}"')
+    else:
+        df = loader.load_data_copy(BENCH_TABLE)
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is reported in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    result_queue.put((path, len(df), elapsed, peak - baseline))
+
+
+def _prepare_file_source(df, workdir):
+    sqlite_path = os.path.join(workdir, 'xdr.sqlite')
+    with sqlite3.connect(sqlite_path) as connection:
+        df.to_sql(BENCH_TABLE, connection, index=False)
+    csv_path = os.path.join(workdir, 'xdr.csv')
+    df.to_csv(csv_path, index=False)
+    return {'kind': 'file', 'sqlite_path': sqlite_path, 'csv_path': csv_path}
+
+
+def _prepare_postgres_source(df):
+    from sqlalchemy import create_engine
+    engine = create_engine(
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:"
+        f"{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+    df.head(0).to_sql(BENCH_TABLE, engine, if_exists='replace', index=False)
+    raw = engine.raw_connection()
+    with tempfile.TemporaryFile('w+') as buffer:
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f'COPY "{BENCH_TABLE}" FROM STDIN WITH (FORMAT csv)', buffer)
+    raw.commit()
+    raw.close()
+    return {'kind': 'postgres'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--postgres', action='store_true', help='Benchmark against the DB_* Postgres instance.')
+    args = parser.parse_args()
+
+    df = synthetic_xdr(args.rows)
+    with tempfile.TemporaryDirectory() as workdir:
+        source = _prepare_postgres_source(df) if args.postgres else _prepare_file_source(df, workdir)
+        del df
+
+        context = multiprocessing.get_context('spawn')
+        print(f"{'path':<16}{'rows':>12}{'seconds':>10}{'rows/sec':>14}{'peak RSS (MB)':>16}")
+        for path in ['read_sql_query', 'copy']:
+            queue = context.Queue()
+            process = context.Process(target=_run, args=(path, source, queue))
+            process.start()
+            name, rows, elapsed, peak = queue.get()
+            process.join()
+            print(f"{name:<16}{rows:>12,}{elapsed:>10.2f}{rows / elapsed:>14,.0f}{peak / 1e6:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
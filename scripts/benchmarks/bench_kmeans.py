@@ -0,0 +1,79 @@
+"""
+Benchmark the clustering backends: full KMeans against mini-batch and chunk-fed (partial_fit) KMeans.
+
+Usage:
+    python scripts/benchmarks/bench_kmeans.py --rows 10000000
+    python scripts/benchmarks/bench_kmeans.py --rows 1000000 --skip-full
+
+Rows are synthetic standardized experience features drawn around a few centres. Inertia is
+recomputed in float64 on the full matrix for every backend so the numbers are comparable.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+from clustering.kmeans_backend import KMeansBackend
+
+N_FEATURES = 6
+
+
+def synthetic_features(rows, n_centres=3, seed=0):
+    """Standardized-looking feature matrix with `n_centres` overlapping groups."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(0.0, 2.0, (n_centres, N_FEATURES))
+    X = rng.standard_normal((rows, N_FEATURES))
+    X += centres[rng.integers(0, n_centres, rows)]
+    return X
+
+
+def inertia(X, centers, chunk_size=1_000_000):
+    """Sum of squared distances to the nearest centre, in float64."""
+    centers = centers.astype(np.float64)
+    total = 0.0
+    for start in range(0, len(X), chunk_size):
+        block = X[start:start + chunk_size]
+        distances = ((block[:, np.newaxis, :] - centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+        total += distances.min(axis=1).sum()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--clusters', type=int, default=3)
+    parser.add_argument('--chunk-size', type=int, default=500_000)
+    parser.add_argument('--skip-full', action='store_true', help='Skip the full-batch KMeans baseline.')
+    args = parser.parse_args()
+
+    X = synthetic_features(args.rows)
+    X32 = X.astype(np.float32)
+
+    def chunks():
+        return (X32[start:start + args.chunk_size] for start in range(0, len(X32), args.chunk_size))
+
+    runs = []
+    if not args.skip_full:
+        runs.append(('full float64', lambda: KMeansBackend(args.clusters).fit(X)))
+    runs += [
+        ('minibatch float32', lambda: KMeansBackend(args.clusters, mode='minibatch', dtype=np.float32).fit(X32)),
+        ('partial_fit chunks', lambda: KMeansBackend(args.clusters, mode='minibatch').fit_chunks(chunks)),
+    ]
+
+    print(f"{args.rows:,} rows x {N_FEATURES} features, k={args.clusters}")
+    print(f"{'backend':<22}{'fit seconds':>14}{'inertia':>20}{'vs first':>10}")
+    baseline = None
+    for label, fit in runs:
+        start = time.perf_counter()
+        backend = fit()
+        seconds = time.perf_counter() - start
+        score = inertia(X, backend.cluster_centers_)
+        baseline = baseline or score
+        print(f"{label:<22}{seconds:>14.2f}{score:>20,.0f}{score / baseline:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
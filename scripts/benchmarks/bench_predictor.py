@@ -0,0 +1,85 @@
+"""
+Micro-benchmark SatisfactionScorePredictor: per-row predict_satisfaction against predict_batch and predict_one.
+
+Usage:
+    python scripts/benchmarks/bench_predictor.py --customers 10000000
+    python scripts/benchmarks/bench_predictor.py --customers 1000000 --threads 4
+
+The per-row path is timed on a subset (--row-customers) and extrapolated. predict_one latency is
+reported as p50/p99 over single calls, optionally issued from several threads at once.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+from satisfaction_analysis.satisfaction_score_predictor import SatisfactionScorePredictor
+
+
+def trained_predictor(seed=0, rows=10_000):
+    rng = np.random.default_rng(seed)
+    user_data = pd.DataFrame({'engagement_score': rng.random(rows) * 100, 'experience_score': rng.random(rows) * 100})
+    user_data['satisfaction_score'] = (user_data['engagement_score'] + user_data['experience_score']) / 2
+    predictor = SatisfactionScorePredictor(user_data)
+    predictor.build_regression_model()
+    return predictor
+
+
+def one_latencies(predictor, calls, scores):
+    latencies = np.empty(calls)
+    for i in range(calls):
+        engagement, experience = scores[i]
+        start = time.perf_counter_ns()
+        predictor.predict_one(engagement, experience)
+        latencies[i] = time.perf_counter_ns() - start
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--customers', type=int, default=10_000_000)
+    parser.add_argument('--row-customers', type=int, default=2_000, help='Customers scored by the per-row path.')
+    parser.add_argument('--one-calls', type=int, default=100_000)
+    parser.add_argument('--threads', type=int, default=1, help='Threads issuing predict_one calls.')
+    args = parser.parse_args()
+
+    predictor = trained_predictor()
+    rng = np.random.default_rng(1)
+    scores = rng.random((args.customers, 2)) * 100
+
+    start = time.perf_counter()
+    for engagement, experience in scores[:args.row_customers].tolist():
+        predictor.predict_satisfaction(engagement, experience)
+    row_estimate = (time.perf_counter() - start) * args.customers / args.row_customers
+
+    start = time.perf_counter()
+    predictor.predict_batch(scores)
+    batch_seconds = time.perf_counter() - start
+
+    one_scores = scores[:args.one_calls].tolist()
+    results = [None] * args.threads
+
+    def worker(index):
+        results[index] = one_latencies(predictor, args.one_calls, one_scores)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies = np.concatenate(results) / 1000
+
+    print(f"{args.customers:,} customers")
+    print(f"{'predict_satisfaction per row (est.)':<38}{row_estimate:>10.2f} s")
+    print(f"{'predict_batch':<38}{batch_seconds:>10.3f} s  ({row_estimate / batch_seconds:,.0f}x)")
+    print(f"{'predict_one p50 / p99':<38}{np.percentile(latencies, 50):>10.2f} / "
+          f"{np.percentile(latencies, 99):.2f} us ({args.threads} thread(s))")
+
+
+if __name__ == '__main__':
+    main()
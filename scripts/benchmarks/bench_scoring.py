@@ -0,0 +1,67 @@
+"""
+Benchmark EngagementExperienceScores.assign_scores_to_users: row-by-row apply against the vectorized path.
+
+Usage:
+    python scripts/benchmarks/bench_scoring.py --users 1000000
+    python scripts/benchmarks/bench_scoring.py --users 1000000 --row-users 50000
+
+The row-by-row path is timed on a subset (--row-users) and extrapolated, since it takes minutes on
+millions of users. The vectorized path is checked for identical scores on that subset.
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+from satisfaction_analysis.engagement_experience_scores import EngagementExperienceScores
+
+FEATURE_COLUMNS = ['Dur. (ms)', 'Total DL (Bytes)', 'Total UL (Bytes)', 'Avg RTT DL (ms)',
+                   'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)']
+
+
+def synthetic_users(users, seed=0):
+    """Per-user features plus engagement/experience models exposing cluster_centers_."""
+    rng = np.random.default_rng(seed)
+    user_data = pd.DataFrame(rng.gamma(2.0, 1e3, (users, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    engagement_clusters = SimpleNamespace(cluster_centers_=rng.random((3, 7)))
+    experience_clusters = SimpleNamespace(cluster_centers_=rng.random((3, 6)))
+    return user_data, engagement_clusters, experience_clusters
+
+
+def _time(user_data, engagement_clusters, experience_clusters, **kwargs):
+    scorer = EngagementExperienceScores(user_data.copy(), engagement_clusters, experience_clusters)
+    start = time.perf_counter()
+    scores = scorer.assign_scores_to_users(**kwargs)
+    return time.perf_counter() - start, scores[['engagement_score', 'experience_score']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--row-users', type=int, default=20_000, help='Users scored by the row-by-row path.')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    user_data, engagement_clusters, experience_clusters = synthetic_users(args.users)
+    subset = user_data.iloc[:args.row_users]
+
+    row_seconds, row_scores = _time(subset, engagement_clusters, experience_clusters, vectorized=False)
+    _, subset_scores = _time(subset, engagement_clusters, experience_clusters)
+    identical = row_scores.equals(subset_scores)
+    row_estimate = row_seconds * args.users / len(subset)
+
+    print(f"{args.users:,} users (row-by-row timed on {len(subset):,}, identical scores: {identical})")
+    print(f"{'path':<22}{'seconds':>12}{'users/sec':>16}{'speedup':>10}")
+    print(f"{'row-by-row (est.)':<22}{row_estimate:>12.2f}{args.users / row_estimate:>16,.0f}{1:>10.0f}x")
+    for label, dtype in [('vectorized float64', np.float64), ('vectorized float32', np.float32)]:
+        seconds, _ = _time(user_data, engagement_clusters, experience_clusters, dtype=dtype, chunk_size=args.chunk_size)
+        print(f"{label:<22}{seconds:>12.2f}{args.users / seconds:>16,.0f}{row_estimate / seconds:>10.0f}x")
+
+
+if __name__ == '__main__':
+    main()
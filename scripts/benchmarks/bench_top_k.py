@@ -0,0 +1,59 @@
+"""
+Benchmark top-N selection: sort_values().head() against top_k (argpartition) and the chunked heap.
+
+Usage:
+    python scripts/benchmarks/bench_top_k.py --customers 10000000
+    python scripts/benchmarks/bench_top_k.py --customers 1000000 --top-n 100 --chunk-size 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+from aggregation.top_k import top_k, top_k_chunks
+
+
+def customer_table(customers, seed=0):
+    """Per-customer engagement table shaped like UserEngagementAnalysis.aggregate_user_metrics."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'MSISDN/Number': rng.integers(3.3e10, 3.4e10, customers).astype(float),
+        'sessions_frequency': rng.integers(1, 50, customers),
+        'total_session_duration': rng.gamma(2.0, 1e5, customers),
+        'total_traffic': rng.gamma(2.0, 5e8, customers)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--customers', type=int, default=10_000_000)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=500_000)
+    args = parser.parse_args()
+
+    df = customer_table(args.customers)
+    chunks = [df.iloc[start:start + args.chunk_size] for start in range(0, len(df), args.chunk_size)]
+    runs = [
+        ('sort_values().head()', lambda: df.sort_values('total_traffic', ascending=False).head(args.top_n)),
+        ('nlargest()', lambda: df.nlargest(args.top_n, 'total_traffic')),
+        ('top_k()', lambda: top_k(df, 'total_traffic', args.top_n)),
+        ('top_k_chunks()', lambda: top_k_chunks(iter(chunks), 'total_traffic', args.top_n)),
+    ]
+
+    print(f"{args.customers:,} customers, top {args.top_n}")
+    baseline = None
+    for label, run in runs:
+        start = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        top_value = result['total_traffic'].iloc[0]
+        print(f"{label:<24}{seconds:>10.3f} s  ({baseline / seconds:>6.1f}x)  top={top_value:,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import pandas as pd
+
+# Aggregations that can be merged across chunks, mapped to the function used to combine partials
+_MERGEABLE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max', 'first': 'first'}
+
+
+class ChunkAggregator:
+    def __init__(self, by, named_aggs):
+        """
+        Incrementally compute a grouped aggregation from DataFrame chunks.
+
+        Only the per-group partial results are kept in memory. Chunks are pushed with `update`
+        (so the aggregator can be used as a sink) and the final frame is read with `result`.
+
+        Parameters:
+        - by: Column to group by.
+        - named_aggs: Mapping of output name -> (column, function). Supported functions are
+          sum, count, mean, min, max, first and nunique.
+        """
+        self.by = by
+        self.named_aggs = named_aggs
+        self.partial_specs = {}
+        self.distinct_columns = set()
+        for name, (col, func) in named_aggs.items():
+            if func == 'mean':
+                self.partial_specs[f'{col}__sum'] = (col, 'sum')
+                self.partial_specs[f'{col}__count'] = (col, 'count')
+            elif func == 'nunique':
+                self.distinct_columns.add(col)
+            elif func in _MERGEABLE:
+                self.partial_specs[f'{col}__{func}'] = (col, func)
+            else:
+                raise ValueError(f"Aggregation '{func}' cannot be computed over chunks.")
+        self.merge_funcs = {key: _MERGEABLE[key.rsplit('__', 1)[1]] for key in self.partial_specs}
+        self.partials = None
+        self.distinct = {col: None for col in self.distinct_columns}
+
+    def update(self, chunk):
+        """Fold one chunk into the partial results."""
+        if self.partial_specs:
+            chunk_partial = chunk.groupby(self.by).agg(**self.partial_specs)
+            if self.partials is None:
+                self.partials = chunk_partial
+            else:
+                self.partials = pd.concat([self.partials, chunk_partial]).groupby(level=0).agg(self.merge_funcs)
+        for col in self.distinct_columns:
+            pairs = chunk[[self.by, col]].dropna().drop_duplicates()
+            if self.distinct[col] is not None:
+                pairs = pd.concat([self.distinct[col], pairs]).drop_duplicates()
+            self.distinct[col] = pairs
+
+    def result(self):
+        """
+        Return the aggregation of every chunk seen so far.
+
+        Returns:
+        - DataFrame indexed by `by` with one column per output name.
+        """
+        frames = [self.partials] if self.partials is not None else []
+        for col in self.distinct_columns:
+            if self.distinct[col] is not None:
+                frames.append(
+                    self.distinct[col].groupby(self.by)[col].nunique().rename(f'{col}__nunique').to_frame()
+                )
+        if not frames:
+            return pd.DataFrame(columns=list(self.named_aggs)).rename_axis(self.by)
+        combined = pd.concat(frames, axis=1)
+
+        output = pd.DataFrame(index=combined.index.rename(self.by))
+        for name, (col, func) in self.named_aggs.items():
+            if func == 'mean':
+                output[name] = combined[f'{col}__sum'] / combined[f'{col}__count']
+            elif func == 'nunique':
+                output[name] = combined[f'{col}__nunique'].fillna(0).astype('int64')
+            else:
+                output[name] = combined[f'{col}__{func}']
+        return output.sort_index()
+
+
+def aggregate_chunks(chunks, by, named_aggs):
+    """
+    Compute a grouped aggregation over an iterable of DataFrame chunks.
+
+    The result is the same as `pd.concat(chunks).groupby(by).agg(**named_aggs)`, but only the
+    per-group partial results are kept in memory, so it can consume `TelecoDataLoader.stream_data`.
+
+    Parameters:
+    - chunks: Iterable of DataFrames sharing the same columns.
+    - by: Column to group by.
+    - named_aggs: Mapping of output name -> (column, function), see ChunkAggregator.
+
+    Returns:
+    - DataFrame indexed by `by` with one column per output name.
+    """
+    aggregator = ChunkAggregator(by, named_aggs)
+    for chunk in chunks:
+        aggregator.update(chunk)
+    return aggregator.result()
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+SUPPORTED_AGGREGATIONS = ('sum', 'count', 'mean', 'min', 'max', 'first', 'nunique')
+
+
+class CustomerAggregationEngine:
+    def __init__(self, df, key='MSISDN/Number'):
+        """
+        Shared per-customer aggregation engine.
+
+        The customer key is factorized once and every requested aggregation is computed from
+        those integer codes (np.bincount for sums/counts/means, ufunc.reduceat over the key-sorted
+        order for min/max/first), so several analyses are served from one set of results instead
+        of repeating the same groupby. Results are cached per (column, function).
+
+        Parameters:
+        - df: Session-level DataFrame.
+        - key: Customer key column (e.g. 'MSISDN/Number' or 'IMSI').
+        """
+        self.df = df
+        self.key = key
+        codes, self.keys = pd.factorize(df[key], sort=True)
+        self.n_groups = len(self.keys)
+        # Rows with a missing key are dropped, like groupby(dropna=True)
+        self.valid = codes >= 0
+        self.all_valid = bool(self.valid.all())
+        self.codes = codes if self.all_valid else codes[self.valid]
+        self.group_sizes = np.bincount(self.codes, minlength=self.n_groups)
+        self._order = None
+        self.pending = set()
+        self.results = {}
+
+    def request(self, named_aggs):
+        """
+        Register aggregations to be computed together by the next `compute`.
+
+        Parameters:
+        - named_aggs: Mapping of output name -> (column, function).
+        """
+        for col, func in named_aggs.values():
+            if func not in SUPPORTED_AGGREGATIONS:
+                raise ValueError(f"Unsupported aggregation '{func}'.")
+            if func == 'mean':
+                self._request(col, 'sum')
+                self._request(col, 'count')
+            self._request(col, func)
+        return self
+
+    def _request(self, col, func):
+        if (col, func) not in self.results:
+            self.pending.add((col, func))
+
+    def _values(self, col, dtype=None):
+        values = self.df[col].to_numpy(dtype=dtype)
+        return values if self.all_valid else values[self.valid]
+
+    def _sorted_order(self):
+        """Row order grouping customers together, computed once and only when needed."""
+        if self._order is None:
+            self._order = np.argsort(self.codes, kind='stable')
+            starts = np.r_[0, np.cumsum(self.group_sizes)[:-1]]
+            self._starts = starts
+        return self._order
+
+    def compute(self):
+        """Compute every pending aggregation, reading each column once."""
+        pending = self.pending
+        self.pending = set()
+
+        for col in sorted({col for col, func in pending if func in ('sum', 'count')}):
+            values = self._values(col, dtype=np.float64)
+            missing = np.isnan(values)
+            has_missing = missing.any()
+            if (col, 'sum') in pending:
+                weights = np.where(missing, 0.0, values) if has_missing else values
+                result = np.bincount(self.codes, weights=weights, minlength=self.n_groups)
+                if pd.api.types.is_integer_dtype(self.df[col]):
+                    result = result.astype(np.int64)
+                self.results[(col, 'sum')] = result
+            if (col, 'count') in pending:
+                counts = self.group_sizes
+                if has_missing:
+                    counts = counts - np.bincount(self.codes, weights=missing, minlength=self.n_groups).astype(np.int64)
+                self.results[(col, 'count')] = counts.astype(np.int64)
+
+        for col, func in pending:
+            if func in ('min', 'max'):
+                self.results[(col, func)] = self._extreme(col, np.fmin if func == 'min' else np.fmax)
+            elif func == 'first':
+                self.results[(col, func)] = self._first(col)
+            elif func == 'nunique':
+                self.results[(col, func)] = self._nunique(col)
+
+        for col, func in pending:
+            if func == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    self.results[(col, func)] = self.results[(col, 'sum')] / self.results[(col, 'count')]
+        return self
+
+    def _extreme(self, col, ufunc):
+        """Per-group min/max ignoring NaN, with one reduceat over the key-sorted values."""
+        order = self._sorted_order()
+        if self.n_groups == 0:
+            return self._values(col)[:0]
+        return ufunc.reduceat(self._values(col)[order], self._starts)
+
+    def _first(self, col):
+        """First non-null value per group, in original row order."""
+        series = self.df[col]
+        values = self._values(col)
+        present = series.notna().to_numpy()
+        if not self.all_valid:
+            present = present[self.valid]
+        groups, first_positions = np.unique(self.codes[present], return_index=True)
+        numeric = pd.api.types.is_numeric_dtype(series)
+        result = np.full(self.n_groups, np.nan, dtype=np.float64 if numeric else object)
+        result[groups] = values[present][first_positions]
+        if numeric and len(groups) == self.n_groups:
+            result = result.astype(series.dtype)
+        return result
+
+    def _nunique(self, col):
+        """Number of distinct non-null values per group, using hashing rather than sorting."""
+        value_codes, uniques = pd.factorize(self.df[col])
+        if not self.all_valid:
+            value_codes = value_codes[self.valid]
+        present = value_codes >= 0
+        pairs = pd.unique(self.codes[present].astype(np.int64) * max(len(uniques), 1) + value_codes[present])
+        return np.bincount(pairs // max(len(uniques), 1), minlength=self.n_groups).astype(np.int64)
+
+    def aggregate(self, named_aggs):
+        """
+        Return named aggregations per customer, computing whatever is not cached yet.
+
+        Parameters:
+        - named_aggs: Mapping of output name -> (column, function).
+
+        Returns:
+        - DataFrame indexed by the customer key, like `df.groupby(key).agg(**named_aggs)`.
+        """
+        self.request(named_aggs).compute()
+        return pd.DataFrame(
+            {name: self.results[(col, func)] for name, (col, func) in named_aggs.items()},
+            index=pd.Index(self.keys, name=self.key)
+        )
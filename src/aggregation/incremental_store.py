@@ -0,0 +1,244 @@
+import json
+import os
+
+import pandas as pd
+
+from engagement_analysis.user_engagement_analysis import UserEngagementAnalysis
+from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
+
+DEFAULT_STORE_DIR = os.path.join('.cache', 'aggregates')
+STATE_FILE = 'state.json'
+DEFAULT_LOOKBACK = '1D'
+
+
+def default_aggregations():
+    """Per-customer aggregations used by the engagement analyses."""
+    customer_aggs, _ = TelecomEngagementAnalysis.named_aggregations()
+    return {**UserEngagementAnalysis.AGGREGATIONS, **customer_aggs}
+
+
+class IncrementalAggregateStore:
+    def __init__(self, store_dir=None, table='xdr_data', key='MSISDN/Number', named_aggs=None,
+                 timestamp_column='Start', id_column='Bearer Id', lookback=None):
+        """
+        Persisted per-customer aggregates that are updated with new rows only.
+
+        The state holds one row per customer with a sum and/or count per measured column (a mean
+        is kept as sum and count), so new sessions are folded in by adding their partial sums.
+        A watermark on `timestamp_column` records the newest session already ingested. Sessions
+        can be written to the source table late, so every update re-reads the `lookback` window
+        before the watermark and skips the sessions already ingested there, identified by
+        `id_column` and timestamp. A session arriving later than `lookback` after a newer
+        session was ingested is not counted. The state is stored as Parquet next to a JSON
+        sidecar holding the watermark; the sidecar is replaced last, so a crash during a save
+        leaves the previous state in effect.
+
+        The store answers `aggregate(named_aggs)` like CustomerAggregationEngine, so it can be
+        passed as the `engine` of UserEngagementAnalysis or TelecomEngagementAnalysis.
+
+        Parameters:
+        - store_dir: Root directory (defaults to AGGREGATE_STORE_DIR or .cache/aggregates).
+        - table: Source table, also used as the sub-directory of the state.
+        - key: Customer key column.
+        - named_aggs: Aggregations to maintain (output name -> (column, function)) with sum,
+          count or mean. Defaults to those of the engagement analyses.
+        - timestamp_column: Column the watermark is kept on.
+        - id_column: Session identifier used to skip sessions re-read within the lookback window.
+        - lookback: How late a session may arrive and still be counted (Timedelta or string,
+          defaults to AGGREGATE_LOOKBACK or 1 day).
+        """
+        self.store_dir = os.path.join(store_dir or os.getenv('AGGREGATE_STORE_DIR', DEFAULT_STORE_DIR), table)
+        self.table = table
+        self.key = key
+        self.named_aggs = named_aggs or default_aggregations()
+        self.timestamp_column = timestamp_column
+        self.id_column = id_column
+        if lookback is None:
+            lookback = os.getenv('AGGREGATE_LOOKBACK', DEFAULT_LOOKBACK)
+        self.lookback = pd.Timedelta(lookback)
+
+        measures = set()
+        for col, func in self.named_aggs.values():
+            if func == 'mean':
+                measures.update([(col, 'sum'), (col, 'count')])
+            elif func in ('sum', 'count'):
+                measures.add((col, func))
+            else:
+                raise ValueError(f"Aggregation '{func}' cannot be maintained incrementally.")
+        self.partial_specs = {f'{col}__{func}': (col, func) for col, func in sorted(measures)}
+
+        self.state = self._empty_state()
+        self.recent = self._empty_recent()
+        self.watermark = None
+        self.rows_ingested = 0
+        self.version = 0
+        self.load()
+
+    def _empty_state(self):
+        return pd.DataFrame(columns=list(self.partial_specs)).rename_axis(self.key)
+
+    def _empty_recent(self):
+        return pd.DataFrame({self.id_column: pd.Series(dtype='float64'),
+                             self.timestamp_column: pd.Series(dtype='datetime64[ns]')})
+
+    def load(self):
+        """Load the persisted state if it exists and matches the maintained aggregations."""
+        state_path = os.path.join(self.store_dir, STATE_FILE)
+        if not os.path.exists(state_path):
+            return self
+        with open(state_path) as state_file:
+            metadata = json.load(state_file)
+        if metadata['key'] != self.key or metadata['measures'] != list(self.partial_specs):
+            print(f"Aggregate store in {self.store_dir} tracks different measures; starting from scratch.")
+            return self
+        self.state = pd.read_parquet(os.path.join(self.store_dir, metadata['data_file']))
+        if metadata.get('recent_file'):
+            self.recent = pd.read_parquet(os.path.join(self.store_dir, metadata['recent_file']))
+        self.watermark = pd.Timestamp(metadata['watermark']) if metadata['watermark'] else None
+        self.rows_ingested = metadata['rows_ingested']
+        self.version = metadata['version']
+        return self
+
+    def save(self):
+        """Persist the state and its watermark."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        version = self.version + 1
+        data_file = f'state-{version:06d}.parquet'
+        recent_file = f'recent-{version:06d}.parquet'
+        self.state.to_parquet(os.path.join(self.store_dir, data_file))
+        self.recent.to_parquet(os.path.join(self.store_dir, recent_file), index=False)
+
+        metadata = {
+            'table': self.table,
+            'key': self.key,
+            'measures': list(self.partial_specs),
+            'watermark': self.watermark.isoformat() if self.watermark is not None else None,
+            'rows_ingested': int(self.rows_ingested),
+            'customers': len(self.state),
+            'version': version,
+            'data_file': data_file,
+            'recent_file': recent_file
+        }
+        temp_path = os.path.join(self.store_dir, STATE_FILE + '.tmp')
+        with open(temp_path, 'w') as state_file:
+            json.dump(metadata, state_file, indent=2)
+        os.replace(temp_path, os.path.join(self.store_dir, STATE_FILE))
+        self.version = version
+
+        for entry in os.listdir(self.store_dir):
+            if entry.startswith(('state-', 'recent-')) and entry not in (data_file, recent_file):
+                os.remove(os.path.join(self.store_dir, entry))
+        return self
+
+    def ingest(self, chunk):
+        """
+        Fold the sessions of a chunk that are not yet in the state into the state: sessions newer
+        than the watermark, and sessions within the lookback window not ingested before.
+
+        The state is only updated in memory; call `save` (or use `update`) to persist it.
+
+        Parameters:
+        - chunk: DataFrame with the key, session id, timestamp and measured columns.
+
+        Returns:
+        - Number of rows ingested.
+        """
+        timestamps = pd.to_datetime(chunk[self.timestamp_column])
+        if self.watermark is not None:
+            in_window = (timestamps > self.watermark - self.lookback).to_numpy()
+            chunk, timestamps = chunk[in_window], timestamps[in_window]
+            seen = pd.MultiIndex.from_arrays([chunk[self.id_column].to_numpy(), timestamps.to_numpy()]).isin(
+                pd.MultiIndex.from_frame(self.recent[[self.id_column, self.timestamp_column]]))
+            chunk, timestamps = chunk[~seen], timestamps[~seen]
+        if chunk.empty:
+            return 0
+
+        # Sums are accumulated across every update, so compact float32 measures are widened first
+        narrow = {col: 'float64' for col, _ in self.partial_specs.values()
+                  if col in chunk.columns and chunk[col].dtype == 'float32'}
+        if narrow:
+            chunk = chunk.astype(narrow)
+        partial = chunk.groupby(self.key).agg(**self.partial_specs)
+        if self.state.empty:
+            self.state = partial
+        else:
+            self.state = pd.concat([self.state, partial]).groupby(level=0).sum()
+        newest = timestamps.max()
+        if self.watermark is None or newest > self.watermark:
+            self.watermark = newest
+        # Remember the sessions inside the lookback window, to skip them when they are read again
+        ingested = pd.DataFrame({self.id_column: chunk[self.id_column].to_numpy(dtype='float64'),
+                                 self.timestamp_column: timestamps.to_numpy()})
+        recent = ingested if self.recent.empty else pd.concat([self.recent, ingested], ignore_index=True)
+        self.recent = recent[recent[self.timestamp_column] > self.watermark - self.lookback].reset_index(drop=True)
+        self.rows_ingested += len(chunk)
+        return len(chunk)
+
+    def update(self, chunks):
+        """
+        Ingest an iterable of chunks and persist the result once.
+
+        Returns:
+        - Number of rows ingested.
+        """
+        rows = sum(self.ingest(chunk) for chunk in chunks)
+        if rows:
+            self.save()
+        print(f"Ingested {rows} new rows into the aggregate store (watermark: {self.watermark}).")
+        return rows
+
+    def update_from_loader(self, data_loader, prepare=None, chunk_size=100_000):
+        """
+        Stream the sessions from the lookback window before the watermark onwards from the
+        database and ingest those not ingested yet.
+
+        Parameters:
+        - data_loader: TelecoDataLoader.
+        - prepare: Optional callable applied to each chunk before ingesting (e.g. unit conversion).
+        - chunk_size: Rows per streamed chunk.
+
+        Returns:
+        - Number of rows ingested.
+        """
+        columns = [self.key, self.id_column, self.timestamp_column]
+        columns += sorted({col for col, _ in self.partial_specs.values()} - set(columns))
+        # Re-read the lookback window for late sessions; those already ingested are skipped in `ingest`
+        start = self.watermark - self.lookback if self.watermark is not None else None
+        chunks = data_loader.stream_data(self.table, columns=columns, start=start, chunk_size=chunk_size,
+                                         compact=False)
+        if prepare is not None:
+            chunks = (prepare(chunk) for chunk in chunks)
+        return self.update(chunks)
+
+    def aggregate(self, named_aggs=None):
+        """
+        Return per-customer aggregations from the stored state, without rescanning sessions.
+
+        Parameters:
+        - named_aggs: Mapping of output name -> (column, function) among the maintained
+          aggregations (all of them when None).
+
+        Returns:
+        - DataFrame indexed by the customer key.
+        """
+        named_aggs = named_aggs or self.named_aggs
+        output = pd.DataFrame(index=self.state.index.rename(self.key))
+        for name, (col, func) in named_aggs.items():
+            if func == 'mean':
+                output[name] = self.state[f'{col}__sum'] / self.state[f'{col}__count']
+            elif f'{col}__{func}' in self.state.columns:
+                output[name] = self.state[f'{col}__{func}']
+            else:
+                raise ValueError(f"Aggregation ({col!r}, {func!r}) is not maintained by the store.")
+        return output.sort_index()
+
+    def top_n(self, name, n=10):
+        """
+        Return the top `n` customers by one of the maintained aggregations.
+
+        Parameters:
+        - name: Output name in `named_aggs`.
+        - n: Number of customers to return.
+        """
+        metric = self.aggregate({name: self.named_aggs[name]})
+        return metric.nlargest(n, name).reset_index()
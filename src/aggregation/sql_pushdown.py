@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+
+# pandas aggregation -> SQL aggregate. SUM is wrapped in COALESCE because pandas sums an
+# all-missing group to 0 where SQL returns NULL; the other functions already agree on NULLs.
+SQL_AGGREGATES = {
+    'sum': 'COALESCE(SUM({0}), 0)',
+    'count': 'COUNT({0})',
+    'mean': 'AVG({0})',
+    'min': 'MIN({0})',
+    'max': 'MAX({0})',
+    'nunique': 'COUNT(DISTINCT {0})',
+}
+
+
+def quote_ident(name):
+    """Quote an identifier for PostgreSQL (and SQLite), escaping embedded double quotes."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_literal(value):
+    """Quote a string literal, escaping embedded single quotes."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def compile_grouped_aggregation(table_name, by, named_aggs):
+    """
+    Compile a `df.groupby(by).agg(**named_aggs)` into one SQL statement.
+
+    Like pandas, rows with a missing key are dropped and the groups are sorted by key.
+
+    Parameters:
+    - table_name: Source table.
+    - by: Column to group by.
+    - named_aggs: Mapping of output name -> (column, function), with functions from SQL_AGGREGATES.
+
+    Returns:
+    - SQL string.
+    """
+    selects = [quote_ident(by)]
+    for name, (column, func) in named_aggs.items():
+        if func not in SQL_AGGREGATES:
+            raise ValueError(f"Aggregation '{func}' cannot be pushed down to SQL.")
+        selects.append(f"{SQL_AGGREGATES[func].format(quote_ident(column))} AS {quote_ident(name)}")
+    key = quote_ident(by)
+    return (f"SELECT {', '.join(selects)} FROM {quote_ident(table_name)} "
+            f"WHERE {key} IS NOT NULL GROUP BY {key} ORDER BY {key}")
+
+
+def compile_value_counts(table_name, column, limit=None, exclude=()):
+    """
+    Compile `df[column].value_counts().head(limit)` (missing values and `exclude` dropped) into SQL.
+    Ties are ordered by value, so the result is deterministic.
+    """
+    predicates = [f"{quote_ident(column)} IS NOT NULL"]
+    if exclude:
+        predicates.append(f"{quote_ident(column)} NOT IN ({', '.join(quote_literal(value) for value in exclude)})")
+    query = (f"SELECT {quote_ident(column)}, COUNT(*) AS {quote_ident('count')} FROM {quote_ident(table_name)} "
+             f"WHERE {' AND '.join(predicates)} GROUP BY {quote_ident(column)} "
+             f"ORDER BY {quote_ident('count')} DESC, {quote_ident(column)}")
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query
+
+
+def compile_group_counts(table_name, columns):
+    """Compile a row count per combination of `columns`, missing values included."""
+    column_list = ', '.join(quote_ident(column) for column in columns)
+    return (f"SELECT {column_list}, COUNT(*) AS {quote_ident('sessions')} FROM {quote_ident(table_name)} "
+            f"GROUP BY {column_list}")
+
+
+class SqlAggregationBackend:
+    def __init__(self, db_connection, table_name='xdr_data'):
+        """
+        Run the analyses' GROUP BY/COUNT/SUM aggregations inside the database, so only the
+        per-customer or per-handset result is transferred instead of every session.
+
+        The aggregations read the source table as stored: they match the pandas methods run on
+        the frame returned by TelecoDataLoader.load_data, not on the cleaned frame.
+
+        Parameters:
+        - db_connection: DatabaseConnection (borrowing pooled connections) or an open DB-API connection.
+        - table_name: Session table the aggregations read.
+        """
+        self.db_connection = db_connection
+        self.table_name = table_name
+
+    def read(self, query):
+        """Run a query and return the result as a DataFrame."""
+        if hasattr(self.db_connection, 'connection'):
+            with self.db_connection.connection() as connection:
+                return pd.read_sql_query(query, connection)
+        return pd.read_sql_query(query, self.db_connection)
+
+    def aggregate(self, by, named_aggs):
+        """
+        Equivalent of `df.groupby(by).agg(**named_aggs)` computed in the database.
+
+        Returns:
+        - DataFrame indexed by `by` with one column per output name.
+        """
+        result = self.read(compile_grouped_aggregation(self.table_name, by, named_aggs)).set_index(by)
+        for name, (_, func) in named_aggs.items():
+            if func in ('count', 'nunique'):
+                result[name] = result[name].astype('int64')
+            elif result[name].dtype == object:
+                # PostgreSQL returns NUMERIC sums of integer columns as Decimal
+                result[name] = pd.to_numeric(result[name])
+        return result
+
+    def value_counts(self, column, limit=None, exclude=()):
+        """
+        Equivalent of `df[column].value_counts().head(limit)`, ignoring missing values and `exclude`.
+
+        Returns:
+        - Series named 'count' indexed by the column's values.
+        """
+        result = self.read(compile_value_counts(self.table_name, column, limit, exclude))
+        return result.set_index(column)['count'].astype('int64')
+
+    def group_counts(self, columns):
+        """Row count per combination of `columns` (missing values kept), in a 'sessions' column."""
+        result = self.read(compile_group_counts(self.table_name, columns))
+        result['sessions'] = result['sessions'].astype('int64')
+        return result
+
+
+def get_sql_backend(db_connection, table_name='xdr_data'):
+    """
+    Return a SqlAggregationBackend when the AGGREGATION_PUSHDOWN flag is set ('1', 'true' or 'sql'),
+    otherwise None so the analyses aggregate in pandas.
+    """
+    if os.getenv('AGGREGATION_PUSHDOWN', '').strip().lower() in ('1', 'true', 'sql'):
+        return SqlAggregationBackend(db_connection, table_name)
+    return None
@@ -0,0 +1,119 @@
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+
+
+def top_k_indices(values, k, largest=True):
+    """
+    Positions of the k largest (or smallest) values, best first, without sorting the whole array.
+
+    Selection is O(n) with np.partition; only the k selected values are sorted. Ties keep their
+    original order and missing values rank last, so the result equals the first k positions of a
+    stable descending (or ascending) sort.
+
+    Parameters:
+    - values: 1-D array-like.
+    - k: Number of positions to return.
+    - largest: Select the largest values (True) or the smallest (False).
+
+    Returns:
+    - Numpy array of at most k positions.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    k = max(0, min(int(k), n))
+    missing = pd.isna(values)
+    if missing.any():
+        valid = np.flatnonzero(~missing)
+        chosen = valid[top_k_indices(values[valid], k, largest)]
+        return np.concatenate([chosen, np.flatnonzero(missing)[:k - len(chosen)]])
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k < n:
+        kth = np.partition(values, n - k if largest else k - 1)[n - k if largest else k - 1]
+        better = np.flatnonzero(values > kth if largest else values < kth)
+        # Fill the remaining slots with the earliest values equal to the boundary
+        equal = np.flatnonzero(values == kth)[:k - len(better)]
+        chosen = np.concatenate([better, equal])
+    else:
+        chosen = np.arange(n)
+
+    if largest:
+        # Descending by value, ascending by position among ties
+        order = np.lexsort((-chosen, values[chosen]))[::-1]
+    else:
+        order = np.lexsort((chosen, values[chosen]))
+    return chosen[order]
+
+
+def top_k(df, column, k, largest=True):
+    """
+    Return the k rows of a DataFrame with the largest (or smallest) values of a column.
+
+    Equivalent to `df.sort_values(column, ascending=not largest, kind='stable').head(k)` in O(n).
+    """
+    return df.iloc[top_k_indices(df[column].to_numpy(), k, largest)]
+
+
+class StreamingTopK:
+    def __init__(self, k, largest=True):
+        """
+        Bounded heap keeping the top k items of a stream.
+
+        Items are pushed one at a time (`push`) or as whole chunks (`update`); a chunk is first
+        reduced to its own top k with `top_k_indices`, so only O(k) items per chunk reach the
+        heap. Ties keep their arrival order and missing values rank last, like `top_k_indices`.
+
+        Parameters:
+        - k: Number of items to keep.
+        - largest: Keep the largest values (True) or the smallest (False).
+        """
+        self.k = k
+        self.largest = largest
+        self.heap = []  # min-heap of (rank key, item); the root is the worst item kept
+        self.counter = itertools.count()
+
+    def _rank(self, value):
+        """Heap key; a larger key is a better item."""
+        if pd.isna(value):
+            return (0, 0, -next(self.counter))
+        return (1, value if self.largest else -value, -next(self.counter))
+
+    def push(self, value, item):
+        """Offer one item ranked by value."""
+        if self.k <= 0:
+            return
+        entry = (self._rank(value), item)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry[0] > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def update(self, values, items):
+        """Offer a chunk of items ranked by the matching values."""
+        positions = top_k_indices(values, self.k, self.largest)
+        # Offer in arrival order so ties keep their original order
+        for position in np.sort(positions).tolist():
+            self.push(values[position], items[position])
+        return self
+
+    def result(self):
+        """Return the kept (value-ordered, best first) items."""
+        return [item for _, item in sorted(self.heap, key=lambda entry: entry[0], reverse=True)]
+
+
+def top_k_chunks(chunks, column, k, largest=True):
+    """
+    Return the k rows with the largest (or smallest) values of a column over a stream of
+    DataFrame chunks (e.g. TelecoDataLoader.stream_data), holding at most k rows per chunk.
+    """
+    heap = StreamingTopK(k, largest)
+    columns = None
+    for chunk in chunks:
+        columns = chunk.columns
+        candidates = top_k(chunk, column, k, largest)
+        heap.update(candidates[column].to_numpy(), candidates.to_dict('records'))
+    return pd.DataFrame(heap.result(), columns=columns)
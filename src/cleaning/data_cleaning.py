@@ -1,10 +1,20 @@
 import pandas as pd
 import numpy as np
+from cleaning.outlier_capping import OutlierCapper
+
+# Bump whenever the cleaning logic changes so cached cleaned snapshots are rebuilt
+CLEANER_VERSION = '1'
+
+# Identifier and categorical columns handled specially by the compact pipeline
+ID_COLUMNS = ['Bearer Id', 'IMSI', 'MSISDN/Number', 'IMEI']
+CATEGORY_COLUMNS = ['Handset Manufacturer', 'Handset Type', 'Last Location Name']
 
 # Data Cleaner Class
 class DataCleaner:
-    def __init__(self, df):
+    def __init__(self, df, verbose=True):
         self.df = df
+        self.verbose = verbose
+        self.memory_before = None
 
     def clean_data(self):
         """Clean the dataset by handling missing values and duplicates."""
@@ -30,8 +40,9 @@ class DataCleaner:
         # List of column suffixes that need to be converted
         columns_in_bytes = [col for col in self.df.columns if '(Bytes)' in col]
         columns_in_kb = [col for col in self.df.columns if '(kbps)' in col or '(Kbps)' in col]
-        print("columns_in_bytes: ", columns_in_bytes)
-        print("columns_in_kb: ", columns_in_kb)
+        if self.verbose:
+            print("columns_in_bytes: ", columns_in_bytes)
+            print("columns_in_kb: ", columns_in_kb)
 
         # Convert Bytes to MB (1 MB = 1,000,000 Bytes)
         self.df[columns_in_bytes] = self.df[columns_in_bytes].apply(lambda x: x / 1_000_000)
@@ -39,23 +50,111 @@ class DataCleaner:
         # Convert kbps to MB (1 kbps = 1/8 MBps, and assuming duration is in seconds)
         self.df[columns_in_kb] = self.df[columns_in_kb].apply(lambda x: (x / 8) / 1_000)
 
-        print("Unit conversion complete: Bytes and kbps columns converted to MB.")
+        if self.verbose:
+            print("Unit conversion complete: Bytes and kbps columns converted to MB.")
         return self.df
 
-    def handle_missing_and_outliers(self):
+    def handle_missing_and_outliers(self, approximate=False, profile=False):
         """
         Identify and treat missing values & outliers by replacing with mean for numeric columns.
+
+        Missing values are replaced by the column mean, then values greater than the 99th
+        percentile are replaced by the column mean. All columns are treated in one vectorized pass.
+
+        Parameters:
+        - approximate: Estimate the 99th percentiles from a row sample (for very large frames).
+        - profile: Print the time and peak memory of each stage.
         """
-        # Ensure the operation is done only for numeric columns
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        
-        # Handle missing values by replacing with the mean of each column
-        self.df[numeric_cols] = self.df[numeric_cols].fillna(self.df[numeric_cols].mean())
-        
-        # Cap outliers: values greater than the 99th percentile are replaced by the column's mean
-        self.df[numeric_cols] = self.df[numeric_cols].apply(
-            lambda x: np.where(x > x.quantile(0.99), x.mean(), x)
-        )
+        capper = OutlierCapper(quantile=0.99, approximate=approximate, profile=profile)
+        self.df = capper.fit_transform(self.df)
 
+        if profile:
+            print(capper.format_report())
         print("Missing values and outliers treated.")
         return self.df
+
+    def run_compact_pipeline(self, approximate=False):
+        """
+        Run clean_data, convert_units_to_mb and handle_missing_and_outliers as one copy-free pass
+        and downcast the result.
+
+        Rows are filtered with a single mask, units are converted with in-place NumPy ufuncs and
+        the cleaned frame is downcast (float64 -> float32, identifiers -> int64, handset and
+        location fields -> category). Identifier columns are excluded from outlier capping so
+        customer keys are never replaced by a mean.
+
+        Parameters:
+        - approximate: Estimate the 99th percentiles from a row sample (see handle_missing_and_outliers).
+
+        Returns:
+        - The cleaned, downcast DataFrame.
+        """
+        self.memory_before = self.df.memory_usage(deep=True)
+
+        # Single row mask: key identifiers present and Start/End parseable
+        start = pd.to_datetime(self.df['Start'], errors='coerce')
+        end = pd.to_datetime(self.df['End'], errors='coerce')
+        mask = (self.df['MSISDN/Number'].notna() & self.df['Bearer Id'].notna()
+                & start.notna() & end.notna()).to_numpy()
+        # Every column touched below is replaced, so a shallow copy keeps the caller's frame intact
+        self.df = self.df[mask] if not mask.all() else self.df.copy(deep=False)
+        self.df['Start'] = start[mask]
+        self.df['End'] = end[mask]
+
+        # Fill missing numeric values with 0 and convert units column by column, in place
+        numeric_cols = self.df.select_dtypes(include=['float64', 'int64']).columns
+        for col in numeric_cols:
+            values = self.df[col].to_numpy(dtype=np.float64, copy=True)
+            np.copyto(values, 0.0, where=np.isnan(values))
+            if '(Bytes)' in col:
+                np.divide(values, 1_000_000, out=values)
+            elif '(kbps)' in col or '(Kbps)' in col:
+                np.divide(values, 8_000, out=values)
+            self.df[col] = values
+
+        metric_cols = [col for col in self.df.select_dtypes(include=[np.number]).columns if col not in ID_COLUMNS]
+        OutlierCapper(quantile=0.99, approximate=approximate).fit_transform(self.df, columns=metric_cols)
+
+        self._downcast(metric_cols)
+        print("Compact cleaning pipeline complete.")
+        return self.df
+
+    def _downcast(self, metric_cols):
+        """Downcast metrics to float32, identifiers to integers and text fields to categories."""
+        for col in metric_cols:
+            self.df[col] = self.df[col].astype(np.float32)
+
+        for col in ID_COLUMNS:
+            if col not in self.df.columns:
+                continue
+            values = self.df[col].to_numpy()
+            if len(values) == 0 or not np.issubdtype(values.dtype, np.floating) or not np.isfinite(values).all():
+                continue
+            if not np.array_equal(values, np.floor(values)):
+                continue
+            # Values above the int64 range (some Bearer Ids) fit in uint64 when non-negative
+            if values.min() >= np.iinfo(np.int64).min and values.max() <= np.iinfo(np.int64).max:
+                self.df[col] = values.astype(np.int64)
+            elif values.min() >= 0 and values.max() < 2.0 ** 64:
+                self.df[col] = values.astype(np.uint64)
+
+        for col in CATEGORY_COLUMNS:
+            if col in self.df.columns:
+                self.df[col] = self.df[col].astype('category')
+
+    def memory_report(self):
+        """
+        Compare the memory used per column before and after the compact pipeline.
+
+        Returns:
+        - DataFrame with before_bytes, after_bytes and reduction_pct per column, plus a Total row.
+        """
+        if self.memory_before is None:
+            raise Exception("No baseline recorded. Call `run_compact_pipeline` first.")
+        report = pd.DataFrame({
+            'before_bytes': self.memory_before.drop('Index', errors='ignore'),
+            'after_bytes': self.df.memory_usage(deep=True).drop('Index', errors='ignore')
+        })
+        report.loc['Total'] = report.sum()
+        report['reduction_pct'] = 100 * (1 - report['after_bytes'] / report['before_bytes'])
+        return report
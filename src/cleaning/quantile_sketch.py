@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class QuantileSketch:
+    def __init__(self, k=4096, random_state=0):
+        """
+        Mergeable streaming quantile sketch (a compact KLL-style compactor stack).
+
+        Values are buffered in levels where an item at level i stands for 2**i original values.
+        When a level holds more than `k` items it is sorted and every other item is promoted to
+        the next level, so memory stays O(k log(n / k)) and the rank error is roughly O(1 / k).
+        Two sketches built on different chunks can be merged without revisiting the data.
+
+        Parameters:
+        - k: Maximum number of items per level (larger is more accurate).
+        - random_state: Seed for the compaction offsets.
+        """
+        self.k = k
+        self.rng = np.random.default_rng(random_state)
+        self.levels = [np.empty(0)]
+        self.weighted_values = []
+        self.weighted_counts = []
+
+    def update(self, values):
+        """Add an array of values, ignoring NaN."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def update_weighted(self, value, weight):
+        """Add a single value standing for `weight` identical observations."""
+        if weight > 0:
+            self.weighted_values.append(float(value))
+            self.weighted_counts.append(float(weight))
+
+    def merge(self, other):
+        """Merge another sketch into this one."""
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.weighted_values.extend(other.weighted_values)
+        self.weighted_counts.extend(other.weighted_counts)
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.k:
+                items = np.sort(items)
+                # An odd item out stays at this level so the promoted half is unbiased
+                keep = items[-1:] if items.size % 2 else items[:0]
+                pairs = items[:items.size - keep.size]
+                promoted = pairs[self.rng.integers(2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def count(self):
+        """Total weight of the values added to the sketch."""
+        return sum(items.size * 2 ** level for level, items in enumerate(self.levels)) + sum(self.weighted_counts)
+
+    def quantile(self, q):
+        """
+        Estimate the q-th quantile.
+
+        Returns:
+        - The estimated quantile, or NaN for an empty sketch.
+        """
+        values = np.concatenate(self.levels + [np.asarray(self.weighted_values)])
+        weights = np.concatenate(
+            [np.full(items.size, 2.0 ** level) for level, items in enumerate(self.levels)]
+            + [np.asarray(self.weighted_counts)]
+        )
+        if values.size == 0:
+            return np.nan
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+        # Same rank convention as np.quantile: position q * (n - 1) in the sorted data
+        target = q * (cumulative[-1] - 1)
+        return values[np.searchsorted(cumulative, target, side='right')]
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cleaning.data_cleaning import DataCleaner
+from cleaning.outlier_capping import OutlierCapper
+from cleaning.quantile_sketch import QuantileSketch
+
+
+class ParquetSink:
+    def __init__(self, path):
+        """
+        Append cleaned chunks to a single Parquet file.
+
+        Parameters:
+        - path: Destination file path.
+        """
+        self.path = path
+        self.writer = None
+
+    def write(self, chunk):
+        # Categories can differ between chunks, so write them as plain (dictionary-encoded) strings
+        for col in chunk.select_dtypes(include=['category']).columns:
+            chunk[col] = chunk[col].astype(object)
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class StreamingDataCleaner:
+    def __init__(self, chunk_source, quantile=0.99, sketch_size=4096):
+        """
+        Clean data chunk by chunk with the same steps as DataCleaner, without loading it whole.
+
+        handle_missing_and_outliers needs global column means and quantiles, so cleaning takes
+        two passes over the chunks: the first accumulates per-column sums, counts and a mergeable
+        quantile sketch, the second fills and caps each chunk and hands it to a sink.
+
+        Parameters:
+        - chunk_source: Callable returning a fresh iterable of DataFrame chunks on every call,
+          e.g. `lambda: loader.stream_data('xdr_data', chunk_size=100_000)`.
+        - quantile: Values above this column quantile are replaced by the column mean.
+        - sketch_size: Accuracy/memory trade-off of the quantile sketches.
+        """
+        self.chunk_source = chunk_source
+        self.quantile = quantile
+        self.sketch_size = sketch_size
+        self.columns = None
+        self.means = None
+        self.thresholds = None
+
+    def _prepare(self, chunk):
+        """Apply the row-local steps: clean_data and convert_units_to_mb."""
+        # Compact chunks (e.g. stream_data) hold float32 metrics, which clean_data would not fill
+        # with 0; widen them so every chunk is cleaned like the in-memory float64 frame
+        narrow = [col for col in chunk.select_dtypes(include=['floating']).columns if chunk[col].dtype != np.float64]
+        if narrow:
+            chunk = chunk.astype({col: np.float64 for col in narrow})
+        cleaner = DataCleaner(chunk, verbose=False)
+        cleaner.clean_data()
+        cleaner.convert_units_to_mb()
+        return cleaner.df
+
+    def fit(self):
+        """
+        First pass: accumulate per-column means and quantile sketches.
+
+        Returns:
+        - self
+        """
+        sums = counts = missing = sketches = None
+        for chunk in self.chunk_source():
+            chunk = self._prepare(chunk)
+            if self.columns is None:
+                self.columns = list(chunk.select_dtypes(include=[np.number]).columns)
+                sums = np.zeros(len(self.columns))
+                counts = np.zeros(len(self.columns))
+                missing = np.zeros(len(self.columns))
+                sketches = [QuantileSketch(self.sketch_size, random_state=i) for i in range(len(self.columns))]
+
+            block = chunk[self.columns].to_numpy(dtype=np.float64).T
+            present = ~np.isnan(block)
+            sums += np.where(present, block, 0.0).sum(axis=1)
+            counts += present.sum(axis=1)
+            missing += (~present).sum(axis=1)
+            for sketch, values in zip(sketches, block):
+                sketch.update(values)
+
+        if self.columns is None:
+            raise ValueError("The chunk source produced no data.")
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.means = sums / counts
+        # Missing values are filled with the mean before the quantile is taken, as in DataCleaner
+        thresholds = []
+        for sketch, mean, n_missing in zip(sketches, self.means, missing):
+            if not np.isnan(mean):
+                sketch.update_weighted(mean, n_missing)
+            thresholds.append(sketch.quantile(self.quantile))
+        self.thresholds = np.array(thresholds)
+        return self
+
+    def transform(self, sink):
+        """
+        Second pass: fill and cap each chunk and pass it to the sink.
+
+        Parameters:
+        - sink: Object with a `write(chunk)` method (e.g. ParquetSink) or a callable such as
+          `ChunkAggregator.update`.
+
+        Returns:
+        - Number of cleaned rows written.
+        """
+        if self.means is None:
+            raise Exception("The statistics are not computed. Call `fit` first.")
+        write = sink.write if hasattr(sink, 'write') else sink
+        capper = OutlierCapper(quantile=self.quantile)
+        rows = 0
+        for chunk in self.chunk_source():
+            chunk = self._prepare(chunk)
+            chunk = capper.transform(chunk, self.columns, self.means, self.thresholds)
+            write(chunk)
+            rows += len(chunk)
+        return rows
+
+    def run(self, sink):
+        """
+        Run both passes and close the sink if it supports it.
+
+        Returns:
+        - Number of cleaned rows written.
+        """
+        self.fit()
+        rows = self.transform(sink)
+        if hasattr(sink, 'close'):
+            sink.close()
+        print(f"Streaming cleaning complete: {rows} rows written.")
+        return rows
+
+    def statistics(self):
+        """Return the per-column fill/cap statistics computed by `fit`."""
+        return pd.DataFrame({'mean': self.means, 'cap_threshold': self.thresholds}, index=self.columns)
@@ -0,0 +1,192 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+
+# Default number of k fitted at once: larger waves leave fewer fits to warm-start and
+# fewer points at which the sweep can stop early
+DEFAULT_WAVE_SIZE = 3
+
+# Feature matrix shared by the worker processes, sent once per worker instead of once per fit
+_WORKER_X = None
+
+
+def _init_worker(X):
+    global _WORKER_X
+    _WORKER_X = X
+
+
+def _fit_k(k, init, kmeans_params, X=None):
+    """Fit one KMeans and return its inertia and centroids."""
+    X = _WORKER_X if X is None else X
+    start = time.perf_counter()
+    if init is None:
+        model = KMeans(n_clusters=k, **kmeans_params)
+    else:
+        params = {key: value for key, value in kmeans_params.items() if key != 'n_init'}
+        model = KMeans(n_clusters=k, init=init, n_init=1, **params)
+    model.fit(X)
+    return k, model.inertia_, model.cluster_centers_, model.n_iter_, time.perf_counter() - start
+
+
+def stratified_sample(X, sample_size, strata=None, random_state=0):
+    """
+    Draw about `sample_size` rows of X, keeping the share of each stratum.
+
+    Parameters:
+    - X: Feature matrix.
+    - sample_size: Number of rows to draw (X is returned unchanged if it is not larger).
+    - strata: Optional label per row (e.g. handset manufacturer); uniform sampling when None.
+    - random_state: Seed.
+
+    Returns:
+    - Numpy array with the sampled rows.
+    """
+    X = np.asarray(X)
+    if sample_size is None or len(X) <= sample_size:
+        return X
+    rng = np.random.default_rng(random_state)
+    if strata is None:
+        return X[np.sort(rng.choice(len(X), sample_size, replace=False))]
+
+    codes, _ = pd.factorize(np.asarray(strata))
+    fraction = sample_size / len(X)
+    rows = []
+    for code in np.unique(codes):
+        members = np.flatnonzero(codes == code)
+        take = max(1, int(round(len(members) * fraction)))
+        rows.append(rng.choice(members, min(take, len(members)), replace=False))
+    return X[np.sort(np.concatenate(rows))]
+
+
+def _seed_centers(X, centers, k, rng):
+    """Extend previous centroids to k seeds, adding new ones by k-means++ (D^2) sampling."""
+    seeds = list(centers)
+    closest = np.full(len(X), np.inf)
+    for center in seeds:
+        closest = np.minimum(closest, ((X - center) ** 2).sum(axis=1))
+    while len(seeds) < k:
+        total = closest.sum()
+        index = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        seeds.append(X[index])
+        closest = np.minimum(closest, ((X - X[index]) ** 2).sum(axis=1))
+    return np.asarray(seeds)
+
+
+class KSweep:
+    def __init__(self, max_k=10, min_k=1, sample_size=None, warm_start=True, tolerance=0.02, patience=1,
+                 n_jobs=None, kmeans_params=None, random_state=0):
+        """
+        Sweep the number of clusters and pick k at the elbow of the inertia curve.
+
+        Values of k are fitted in waves of `n_jobs` fits on a process pool. With `warm_start`,
+        `min_k` is fitted on its own first and every fit of a later wave is seeded with the
+        centroids of the best-known smaller k plus new k-means++ seeds. The improvement of each k is the inertia it removes as a share of the
+        inertia at `min_k`; after each wave the sweep stops once the improvement has stayed below
+        `tolerance` for `patience` consecutive k. No plotting is done, so the
+        result can be produced in batch jobs and cached.
+
+        Parameters:
+        - max_k, min_k: Range of k to sweep.
+        - sample_size: Fit on a (stratified) sample of this many rows instead of the full matrix.
+        - warm_start: Seed each fit from previously found centroids.
+        - tolerance: Improvement below which the curve is considered flat; None disables early
+          stopping.
+        - patience: Number of consecutive flat steps before stopping.
+        - n_jobs: Worker processes and fits per wave (defaults to the CPU count, capped at
+          DEFAULT_WAVE_SIZE; 1 fits in-process).
+        - kmeans_params: Extra KMeans parameters (default: random_state only).
+        - random_state: Seed for sampling and seeding.
+        """
+        self.max_k = max_k
+        self.min_k = min_k
+        self.sample_size = sample_size
+        self.warm_start = warm_start
+        self.tolerance = tolerance
+        self.patience = patience
+        self.n_jobs = n_jobs or min(os.cpu_count() or 1, DEFAULT_WAVE_SIZE)
+        self.kmeans_params = {'random_state': random_state, **(kmeans_params or {})}
+        self.random_state = random_state
+
+    @staticmethod
+    def _improvements(inertias):
+        """Inertia removed by each k relative to the inertia of the smallest k (NaN for the first)."""
+        inertias = pd.Series(inertias, dtype=float)
+        return -inertias.diff() / inertias.iloc[0] if inertias.iloc[0] else inertias * 0.0
+
+    def _flat_steps(self, inertias):
+        """Number of trailing consecutive k whose improvement is below the tolerance."""
+        flat = 0
+        for improvement in self._improvements([inertias[k] for k in sorted(inertias)]).iloc[1:]:
+            flat = flat + 1 if improvement < self.tolerance else 0
+        return flat
+
+    def run(self, X, strata=None):
+        """
+        Run the sweep.
+
+        Parameters:
+        - X: Feature matrix (e.g. normalized engagement metrics).
+        - strata: Optional label per row used to stratify the sample.
+
+        Returns:
+        - Dict with 'curve' (DataFrame of k, inertia, improvement, n_iter, seconds), 'best_k',
+          'stopped_early', 'centers' (k -> centroids) and 'sample_rows'.
+        """
+        X = np.asarray(X.to_numpy() if hasattr(X, 'to_numpy') else X)
+        X = stratified_sample(X, self.sample_size, strata, self.random_state)
+        rng = np.random.default_rng(self.random_state)
+
+        results = {}
+        ks = list(range(self.min_k, self.max_k + 1))
+        if self.warm_start and self.n_jobs > 1:
+            # Fit min_k alone, so that every later wave can be seeded from it
+            waves = [ks[:1]] + [ks[i:i + self.n_jobs] for i in range(1, len(ks), self.n_jobs)]
+        else:
+            waves = [ks[i:i + self.n_jobs] for i in range(0, len(ks), self.n_jobs)]
+        stopped_early = False
+        executor = ProcessPoolExecutor(self.n_jobs, initializer=_init_worker, initargs=(X,)) if self.n_jobs > 1 else None
+        try:
+            for wave in waves:
+                inits = {}
+                for k in wave:
+                    known = [j for j in results if j < k]
+                    inits[k] = _seed_centers(X, results[max(known)][1], k, rng) if self.warm_start and known else None
+                if executor is None:
+                    fitted = [_fit_k(k, inits[k], self.kmeans_params, X) for k in wave]
+                else:
+                    fitted = list(executor.map(_fit_k, wave, [inits[k] for k in wave], [self.kmeans_params] * len(wave)))
+                for k, inertia, centers, n_iter, seconds in fitted:
+                    results[k] = (inertia, centers, n_iter, seconds)
+
+                if self.tolerance is not None and self._flat_steps({k: r[0] for k, r in results.items()}) >= self.patience:
+                    stopped_early = wave[-1] < self.max_k
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        curve = pd.DataFrame(
+            [(k, r[0], r[2], r[3]) for k, r in sorted(results.items())],
+            columns=['k', 'inertia', 'n_iter', 'seconds']
+        )
+        curve.insert(2, 'improvement', self._improvements(curve['inertia'].tolist()).to_numpy())
+        return {
+            'curve': curve,
+            'best_k': self.choose_k(curve),
+            'stopped_early': stopped_early,
+            'centers': {k: r[1] for k, r in results.items()},
+            'sample_rows': len(X)
+        }
+
+    def choose_k(self, curve):
+        """Pick the last k before the improvement drops below the tolerance."""
+        if self.tolerance is None:
+            return int(curve['k'].iloc[-1])
+        flat = curve.index[curve['improvement'] < self.tolerance]
+        if len(flat) == 0:
+            return int(curve['k'].iloc[-1])
+        return int(curve['k'].loc[flat[0] - 1])
@@ -0,0 +1,101 @@
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+CLUSTERING_MODES = ('full', 'minibatch')
+
+
+class KMeansBackend:
+    def __init__(self, n_clusters=3, mode='full', n_init='auto', tol=1e-4, max_iter=300,
+                 batch_size=4096, dtype=None, random_state=0):
+        """
+        Pluggable KMeans used by the clustering analyses.
+
+        'full' fits sklearn's KMeans on the whole matrix (the analyses' original behaviour).
+        'minibatch' uses MiniBatchKMeans, which fits much larger matrices in a fraction of the
+        time and can also be fed chunk by chunk through `partial_fit` / `fit_chunks`.
+
+        Parameters:
+        - n_clusters: Number of clusters.
+        - mode: 'full' or 'minibatch'.
+        - n_init: Number of initializations ('auto' lets sklearn choose).
+        - tol: Convergence tolerance.
+        - max_iter: Maximum number of iterations (epochs over the data in minibatch mode).
+        - batch_size: Mini-batch size in minibatch mode.
+        - dtype: Cast input to this dtype before fitting (np.float32 halves memory); None keeps it.
+        - random_state: Seed for reproducible clusters.
+        """
+        if mode not in CLUSTERING_MODES:
+            raise ValueError(f"Unknown clustering mode '{mode}', expected one of {CLUSTERING_MODES}.")
+        self.n_clusters = n_clusters
+        self.mode = mode
+        self.dtype = dtype
+        if mode == 'full':
+            self.model = KMeans(n_clusters=n_clusters, n_init=n_init, tol=tol, max_iter=max_iter,
+                                random_state=random_state)
+        else:
+            self.model = MiniBatchKMeans(n_clusters=n_clusters, n_init=n_init, tol=tol, max_iter=max_iter,
+                                         batch_size=batch_size, random_state=random_state)
+
+    def _prepare(self, X):
+        X = X.to_numpy() if hasattr(X, 'to_numpy') else np.asarray(X)
+        return X.astype(self.dtype, copy=False) if self.dtype is not None else X
+
+    def fit(self, X):
+        """Fit on a full feature matrix."""
+        self.model.fit(self._prepare(X))
+        return self
+
+    def fit_predict(self, X):
+        """Fit on a full feature matrix and return the cluster label of every row."""
+        return self.model.fit_predict(self._prepare(X))
+
+    def predict(self, X):
+        """Return the nearest cluster of every row."""
+        return self.model.predict(self._prepare(X))
+
+    def partial_fit(self, X):
+        """Update the clusters with one chunk of rows (minibatch mode only)."""
+        if self.mode != 'minibatch':
+            raise ValueError("partial_fit requires mode='minibatch'.")
+        self.model.partial_fit(self._prepare(X))
+        return self
+
+    def fit_chunks(self, chunk_source, scaler=None, passes=1):
+        """
+        Fit from a stream of feature chunks without materializing the whole matrix.
+
+        Parameters:
+        - chunk_source: Callable returning a fresh iterable of feature chunks on every call.
+        - scaler: Optional scaler with partial_fit/transform (e.g. StandardScaler), fitted on a
+          first pass over the chunks and applied before clustering.
+        - passes: Number of passes over the chunks.
+
+        Returns:
+        - self
+        """
+        if scaler is not None:
+            for chunk in chunk_source():
+                scaler.partial_fit(chunk)
+        self.scaler = scaler
+        for _ in range(passes):
+            for chunk in chunk_source():
+                self.partial_fit(scaler.transform(chunk) if scaler is not None else chunk)
+        return self
+
+    def predict_chunks(self, chunk_source):
+        """Return the cluster labels of every row of a chunk stream, scaled like in `fit_chunks`."""
+        scaler = getattr(self, 'scaler', None)
+        labels = [self.predict(scaler.transform(chunk) if scaler is not None else chunk) for chunk in chunk_source()]
+        return np.concatenate(labels) if labels else np.empty(0, dtype=np.int32)
+
+    @property
+    def cluster_centers_(self):
+        return self.model.cluster_centers_
+
+    @property
+    def inertia_(self):
+        return self.model.inertia_
+
+    @property
+    def labels_(self):
+        return self.model.labels_
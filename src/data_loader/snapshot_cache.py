@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import pyarrow as pa
+from cleaning.data_cleaning import CLEANER_VERSION
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'snapshots')
+
+
+class SnapshotCache:
+    def __init__(self, cache_dir=None, cleaner_version=CLEANER_VERSION, rows_per_partition=1_000_000):
+        """
+        Local columnar cache for the cleaned xDR frame.
+
+        Snapshots are stored as uncompressed Arrow IPC partitions so they can be memory-mapped
+        on load instead of being parsed. Each snapshot is keyed by the source table, its row
+        count and max timestamp, and the cleaner version, so it is invalidated as soon as the
+        source table or the cleaning logic changes.
+
+        Parameters:
+        - cache_dir: Root directory of the cache (defaults to SNAPSHOT_CACHE_DIR or .cache/snapshots).
+        - cleaner_version: Version of the cleaning pipeline the snapshot was produced with.
+        - rows_per_partition: Maximum number of rows written to a single partition file.
+        """
+        self.cache_dir = cache_dir or os.getenv('SNAPSHOT_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.cleaner_version = str(cleaner_version)
+        self.rows_per_partition = rows_per_partition
+
+    def snapshot_key(self, fingerprint):
+        """
+        Derive the snapshot key from a source fingerprint.
+
+        Parameters:
+        - fingerprint: Dict with 'table', 'row_count' and 'max_timestamp' (see TelecoDataLoader.fetch_fingerprint).
+
+        Returns:
+        - Short hexadecimal key.
+        """
+        payload = json.dumps({
+            'table': fingerprint['table'],
+            'row_count': int(fingerprint['row_count']),
+            'max_timestamp': str(fingerprint['max_timestamp']),
+            'cleaner_version': self.cleaner_version
+        }, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def _table_dir(self, table):
+        return os.path.join(self.cache_dir, table)
+
+    def _snapshot_dir(self, fingerprint):
+        return os.path.join(self._table_dir(fingerprint['table']), self.snapshot_key(fingerprint))
+
+    def exists(self, fingerprint):
+        """Return True if a valid snapshot exists for the fingerprint."""
+        return os.path.exists(os.path.join(self._snapshot_dir(fingerprint), 'manifest.json'))
+
+    def load(self, fingerprint):
+        """
+        Load a snapshot by memory-mapping its Arrow partitions.
+
+        Returns:
+        - pd.DataFrame, or None if there is no snapshot for the fingerprint.
+        """
+        snapshot_dir = self._snapshot_dir(fingerprint)
+        manifest_path = os.path.join(snapshot_dir, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        tables = []
+        for partition in manifest['partitions']:
+            source = pa.memory_map(os.path.join(snapshot_dir, partition), 'r')
+            tables.append(pa.ipc.open_file(source).read_all())
+        table = pa.concat_tables(tables)
+        # split_blocks lets pandas reuse the memory-mapped buffers for numeric columns
+        return table.to_pandas(split_blocks=True)
+
+    def save(self, fingerprint, df):
+        """
+        Write a DataFrame as a partitioned snapshot and drop stale snapshots of the same table.
+
+        A snapshot is never overwritten: the same fingerprint means the same content, so when
+        another writer publishes it first, its snapshot is kept and this one is discarded.
+        """
+        table_dir = self._table_dir(fingerprint['table'])
+        os.makedirs(table_dir, exist_ok=True)
+        snapshot_dir = self._snapshot_dir(fingerprint)
+        if self.exists(fingerprint):
+            return
+
+        # Write into a temporary directory first so readers never see a partial snapshot
+        staging_dir = tempfile.mkdtemp(dir=table_dir, prefix='.staging-')
+        table = pa.Table.from_pandas(df)
+        partitions = []
+        for i, offset in enumerate(range(0, max(table.num_rows, 1), self.rows_per_partition)):
+            partition = f'part-{i:05d}.arrow'
+            with pa.OSFile(os.path.join(staging_dir, partition), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table.slice(offset, self.rows_per_partition))
+            partitions.append(partition)
+
+        manifest = {
+            'table': fingerprint['table'],
+            'row_count': int(fingerprint['row_count']),
+            'max_timestamp': str(fingerprint['max_timestamp']),
+            'cleaner_version': self.cleaner_version,
+            'rows': table.num_rows,
+            'partitions': partitions
+        }
+        with open(os.path.join(staging_dir, 'manifest.json'), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+        if os.path.isdir(snapshot_dir) and not self.exists(fingerprint):
+            # Left over without a manifest (e.g. partly pruned), so no reader can be using it
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+        try:
+            os.replace(staging_dir, snapshot_dir)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            if not self.exists(fingerprint):
+                raise
+        self._prune(table_dir, keep=os.path.basename(snapshot_dir))
+
+    def _prune(self, table_dir, keep):
+        """Remove every snapshot of a table except the one being kept."""
+        for entry in os.listdir(table_dir):
+            # Leave other writers' in-progress staging directories alone
+            if entry != keep and not entry.startswith('.staging-'):
+                shutil.rmtree(os.path.join(table_dir, entry), ignore_errors=True)
+
+    def get_or_build(self, fingerprint, build):
+        """
+        Return the cached frame for the fingerprint, building and storing it on a miss.
+
+        Parameters:
+        - fingerprint: Source fingerprint (see `snapshot_key`).
+        - build: Callable returning the cleaned DataFrame when the cache misses.
+
+        Returns:
+        - pd.DataFrame
+        """
+        df = self.load(fingerprint)
+        if df is not None:
+            print(f"Loaded cleaned snapshot of {fingerprint['table']} from {self.cache_dir}.")
+            return df
+        df = build()
+        self.save(fingerprint, df)
+        print(f"Saved cleaned snapshot of {fingerprint['table']} to {self.cache_dir}.")
+        return df
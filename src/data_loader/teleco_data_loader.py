@@ -1,11 +1,349 @@
+import os
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
+from psycopg2 import sql
+
+try:
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; fall back to the pandas C parser
+    pa_csv = None
+
+# Compact dtypes for the xDR columns. Metrics fit comfortably in float32, identifiers
+# stay float64 because the raw MSISDN/IMSI/IMEI/Bearer Id values exceed float32 precision.
+ID_COLUMNS = ['Bearer Id', 'IMSI', 'MSISDN/Number', 'IMEI']
+CATEGORY_COLUMNS = ['Last Location Name', 'Handset Manufacturer', 'Handset Type']
+DATETIME_COLUMNS = ['Start', 'End']
+
+
+def compact_dtype(column):
+    """Return the compact dtype used for an xDR column when streaming."""
+    if column in ID_COLUMNS:
+        return 'float64'
+    if column in CATEGORY_COLUMNS:
+        return 'category'
+    if column in DATETIME_COLUMNS:
+        return 'datetime64[ns]'
+    return 'float32'
+
+
+# Loader of the current worker process, set once by _init_worker
+_worker_loader = None
+
+
+def _init_worker(loader):
+    """
+    Process pool initializer: keep the loader in the worker for the partitions it is given.
+
+    The loader arrives with a DatabaseConnection without a pool (see its __getstate__), so each
+    worker process connects once here; the connection lives until the worker exits.
+    """
+    global _worker_loader
+    _worker_loader = loader
+    if getattr(loader.db_connection, 'pool', False) is None:
+        loader.db_connection.connect()
+
+
+def _load_partition(table_name, options):
+    """Worker entry point: fetch one partition with the worker's loader."""
+    return _worker_loader.load_data_copy(table_name, **options)
+
 
 class TelecoDataLoader:
     def __init__(self, db_connection):
         self.db_connection = db_connection
-    
+
     def load_data(self, table_name):
-        connection = self.db_connection.get_connection()
         query = f"SELECT * FROM {table_name};"
-        df = pd.read_sql_query(query, connection)
+        with self.db_connection.connection() as connection:
+            df = pd.read_sql_query(query, connection)
+        return df
+
+    def fetch_fingerprint(self, table_name, timestamp_column='Start'):
+        """
+        Fetch a cheap fingerprint of a table used to detect when its contents change.
+
+        Returns:
+        - Dict with 'table', 'row_count' and 'max_timestamp'.
+        """
+        query = sql.SQL('SELECT COUNT(*), MAX({}) FROM {}').format(
+            sql.Identifier(timestamp_column), sql.Identifier(table_name)
+        )
+        with self.db_connection.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                row_count, max_timestamp = cursor.fetchone()
+        return {'table': table_name, 'row_count': row_count, 'max_timestamp': max_timestamp}
+
+    def fetch_overview_summary(self, table_name):
+        """
+        Fetch the User Overview headline numbers with aggregate queries, without loading the table.
+
+        Returns:
+        - Dict with 'sessions', 'users', 'total_dl_bytes', 'total_ul_bytes' and 'handset_counts'
+          (sessions per 'Handset Manufacturer' and 'Handset Type').
+        """
+        totals_query = sql.SQL('SELECT COUNT(*), COUNT(DISTINCT {}), SUM({}), SUM({}) FROM {}').format(
+            sql.Identifier('MSISDN/Number'), sql.Identifier('Total DL (Bytes)'), sql.Identifier('Total UL (Bytes)'),
+            sql.Identifier(table_name)
+        )
+        handsets_query = sql.SQL('SELECT {0}, {1}, COUNT(*) FROM {2} GROUP BY {0}, {1}').format(
+            sql.Identifier('Handset Manufacturer'), sql.Identifier('Handset Type'), sql.Identifier(table_name)
+        )
+        with self.db_connection.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(totals_query)
+                sessions, users, total_dl, total_ul = cursor.fetchone()
+                cursor.execute(handsets_query)
+                handset_rows = cursor.fetchall()
+        return {
+            'sessions': sessions,
+            'users': users,
+            'total_dl_bytes': total_dl,
+            'total_ul_bytes': total_ul,
+            'handset_counts': pd.DataFrame(handset_rows,
+                                           columns=['Handset Manufacturer', 'Handset Type', 'sessions'])
+        }
+
+    def fetch_time_range(self, table_name, timestamp_column='Start'):
+        """Return (min, max) of a timestamp column, used to split a table into time partitions."""
+        query = sql.SQL('SELECT MIN({0}), MAX({0}) FROM {1}').format(
+            sql.Identifier(timestamp_column), sql.Identifier(table_name)
+        )
+        with self.db_connection.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                return cursor.fetchone()
+
+    def build_query(self, table_name, columns=None, start=None, end=None, msisdns=None,
+                    partition=None, null_start=False):
+        """
+        Build a column-projected SELECT with optional time-range, MSISDN and partition predicates.
+
+        Parameters:
+        - table_name: Name of the source table.
+        - columns: Columns to select (all columns when None).
+        - start: Inclusive lower bound on the `Start` column.
+        - end: Exclusive upper bound on the `Start` column.
+        - msisdns: Iterable of MSISDN/Number values to keep.
+        - partition: Optional (index, count) keeping the rows whose hashed MSISDN/Number falls
+          in partition `index` of `count`.
+        - null_start: Keep only the rows without a `Start` timestamp.
+
+        Returns:
+        - Tuple of (psycopg2 sql.Composed query, list of parameters).
+        """
+        if columns:
+            projection = sql.SQL(', ').join(sql.Identifier(col) for col in columns)
+        else:
+            projection = sql.SQL('*')
+
+        predicates = []
+        params = []
+        if start is not None:
+            predicates.append(sql.SQL('{} >= %s').format(sql.Identifier('Start')))
+            params.append(start)
+        if end is not None:
+            predicates.append(sql.SQL('{} < %s').format(sql.Identifier('Start')))
+            params.append(end)
+        if msisdns is not None:
+            predicates.append(sql.SQL('{} = ANY(%s)').format(sql.Identifier('MSISDN/Number')))
+            params.append(list(msisdns))
+        if partition is not None:
+            index, count = partition
+            # hashtext is signed; fold it into [0, count). Missing MSISDNs hash like the empty string.
+            # The modulo operator is written %% because the query is formatted with bind parameters
+            predicates.append(sql.SQL("((hashtext(COALESCE({}::text, '')) %% %s) + %s) %% %s = %s").format(
+                sql.Identifier('MSISDN/Number')))
+            params.extend([count, count, count, index])
+        if null_start:
+            predicates.append(sql.SQL('{} IS NULL').format(sql.Identifier('Start')))
+
+        query = sql.SQL('SELECT {} FROM {}').format(projection, sql.Identifier(table_name))
+        if predicates:
+            query = query + sql.SQL(' WHERE ') + sql.SQL(' AND ').join(predicates)
+        return query, params
+
+    def stream_data(self, table_name, columns=None, start=None, end=None, msisdns=None,
+                    chunk_size=100_000, dtypes=None, compact=True):
+        """
+        Stream a table in fixed-size DataFrame chunks through a server-side cursor.
+
+        Only the requested columns and rows are transferred, and at most `chunk_size`
+        rows are held in memory at a time.
+
+        Parameters:
+        - table_name: Name of the source table.
+        - columns: Columns to select (all columns when None).
+        - start, end, msisdns: Predicates pushed into the SQL (see `build_query`).
+        - chunk_size: Number of rows per yielded DataFrame.
+        - dtypes: Optional mapping of column -> dtype overriding the compact defaults.
+        - compact: Cast the chunks to the compact dtypes (False keeps the dtypes of `load_data`).
+
+        Yields:
+        - pd.DataFrame chunks.
+        """
+        query, params = self.build_query(table_name, columns, start, end, msisdns)
+        # The pooled connection is held while the stream is consumed; returning it to the pool rolls
+        # back the transaction the server-side cursor lives in
+        with self.db_connection.connection() as connection:
+            # A named cursor keeps the result set on the server and fetches it lazily; the name is
+            # unique so several streams can be open on one connection
+            with connection.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(query, params)
+                column_names = None
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    if column_names is None:
+                        column_names = [desc[0] for desc in cursor.description]
+                    chunk = pd.DataFrame.from_records(rows, columns=column_names)
+                    yield self.apply_compact_dtypes(chunk, dtypes) if compact else chunk
+
+    def load_data_copy(self, table_name, columns=None, start=None, end=None, msisdns=None,
+                       compact=False, dtypes=None, partition=None, null_start=False):
+        """
+        Load a table through PostgreSQL `COPY ... TO STDOUT` instead of row-by-row fetching.
+
+        The server streams CSV into a temporary file which is parsed in bulk straight into
+        Arrow/NumPy buffers (pyarrow's multi-threaded reader when available, otherwise the
+        pandas C parser), skipping the per-row tuple conversion of `pd.read_sql_query`.
+
+        Parameters:
+        - table_name, columns, start, end, msisdns, partition, null_start: See `build_query`.
+        - compact: Cast the result to the compact streaming dtypes.
+        - dtypes: Optional dtype overrides used when `compact` is True.
+
+        Returns:
+        - pd.DataFrame with the selected rows and columns.
+        """
+        query, params = self.build_query(table_name, columns, start, end, msisdns, partition, null_start)
+        copy_query = sql.SQL('COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true)').format(query)
+
+        with tempfile.TemporaryFile() as buffer:
+            with self.db_connection.connection() as connection, connection.cursor() as cursor:
+                # COPY does not accept bind parameters, so inline them safely with mogrify
+                cursor.copy_expert(cursor.mogrify(copy_query, params).decode(), buffer)
+            buffer.seek(0)
+            df = self._parse_copy_csv(buffer)
+
+        if compact:
+            df = self.apply_compact_dtypes(df, dtypes)
+        return df
+
+    def partition_specs(self, table_name, partitions, by='time', start=None, end=None):
+        """
+        Split a table read into `partitions` disjoint predicates covering every row.
+
+        Parameters:
+        - table_name: Name of the source table.
+        - partitions: Number of partitions.
+        - by: 'time' for equal `Start` ranges, or 'hash' for a hash of `MSISDN/Number`
+          (evenly sized partitions when the time distribution is skewed).
+        - start, end: Optional bounds on `Start` applied to the whole read.
+
+        Returns:
+        - List of keyword dicts for `build_query`/`load_data_copy`, in time order for 'time'.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1.")
+        if by == 'hash':
+            return [{'start': start, 'end': end, 'partition': (index, partitions)} for index in range(partitions)]
+        if by != 'time':
+            raise ValueError(f"Unknown partitioning '{by}', expected 'time' or 'hash'.")
+
+        low, high = start, end
+        if low is None or high is None:
+            first, last = self.fetch_time_range(table_name)
+            low = first if low is None else low
+            high = last if high is None else high
+        specs = []
+        if low is not None and high is not None and pd.Timestamp(low) < pd.Timestamp(high):
+            bounds = list(pd.date_range(pd.Timestamp(low), pd.Timestamp(high), periods=partitions + 1))
+            # The outer partitions stay open-ended so rows on (or beyond) the bounds are not lost
+            bounds[0], bounds[-1] = start, end
+            specs = [{'start': bounds[i], 'end': bounds[i + 1]} for i in range(partitions)]
+        else:
+            specs = [{'start': start, 'end': end}]
+        if start is None and end is None:
+            # Range predicates never match a missing timestamp
+            specs.append({'null_start': True})
+        return specs
+
+    def load_data_parallel(self, table_name, partitions=4, by='time', max_workers=None, executor='process',
+                           columns=None, start=None, end=None, msisdns=None, compact=False, dtypes=None,
+                           concat=True):
+        """
+        Load a table as disjoint partitions fetched concurrently with `COPY ... TO STDOUT`.
+
+        With executor='process' every worker process receives the loader once, opens its own
+        connection and parses its partitions on its own core; only the partition specs are sent
+        per task. With executor='thread' the workers borrow connections from the shared pool
+        (which bounds them too) and parse in threads.
+
+        Parameters:
+        - table_name: Name of the source table.
+        - partitions, by: See `partition_specs`.
+        - max_workers: Maximum number of partitions fetched at once, i.e. concurrent database
+          connections (defaults to min(partitions, CPU count)).
+        - executor: 'process' or 'thread'.
+        - columns, start, end, msisdns: See `build_query`.
+        - compact, dtypes: Cast the result to the compact streaming dtypes (see `load_data_copy`).
+        - concat: Return one DataFrame (True) or the list of partition DataFrames (False).
+
+        Returns:
+        - pd.DataFrame, or a list of DataFrames in partition order.
+        """
+        specs = self.partition_specs(table_name, partitions, by, start, end)
+        max_workers = max_workers or min(len(specs), os.cpu_count() or 1)
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor '{executor}', expected 'process' or 'thread'.")
+
+        # Categories differ between partitions, so compact dtypes are applied after concatenating
+        options = [dict(spec, columns=columns, msisdns=msisdns, compact=compact and not concat, dtypes=dtypes)
+                   for spec in specs]
+        if executor == 'process':
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as pool:
+                frames = list(pool.map(_load_partition, [table_name] * len(options), options))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                frames = list(pool.map(lambda partition: self.load_data_copy(table_name, **partition), options))
+
+        if not concat:
+            return frames
+        non_empty = [frame for frame in frames if len(frame)] or frames[:1]
+        df = pd.concat(non_empty, ignore_index=True) if len(non_empty) > 1 else non_empty[0]
+        if compact:
+            df = self.apply_compact_dtypes(df, dtypes)
+        return df
+
+    @staticmethod
+    def _parse_copy_csv(buffer):
+        """Parse CSV produced by COPY into a DataFrame."""
+        if pa_csv is not None:
+            # COPY writes NULL as an unquoted empty field and an empty string as "", so only the
+            # former is read as missing, as with pd.read_sql_query
+            convert_options = pa_csv.ConvertOptions(strings_can_be_null=True, quoted_strings_can_be_null=False)
+            # Timestamps are read at second resolution; convert them to nanoseconds like load_data
+            return pa_csv.read_csv(buffer, convert_options=convert_options).to_pandas(coerce_temporal_nanoseconds=True)
+        return pd.read_csv(buffer, engine='c')
+
+    @staticmethod
+    def apply_compact_dtypes(df, dtypes=None):
+        """Cast a chunk to compact dtypes, with optional per-column overrides."""
+        dtypes = dtypes or {}
+        for col in df.columns:
+            dtype = dtypes.get(col, compact_dtype(col))
+            if col not in dtypes and dtype == 'float32' and not pd.api.types.is_numeric_dtype(df[col]):
+                # Leave unknown text columns untouched rather than coercing them to NaN
+                continue
+            if dtype == 'datetime64[ns]':
+                df[col] = pd.to_datetime(df[col], errors='coerce')
+            elif dtype == 'category':
+                df[col] = df[col].astype('category')
+            else:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
         return df
@@ -1,28 +1,60 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
 import seaborn as sns
+from aggregation.chunked_aggregation import aggregate_chunks
+from clustering.kmeans_backend import KMeansBackend
+from clustering.k_sweep import KSweep
 
 class TelecomEngagementAnalysis:
-    def __init__(self, data):
-        """Initialize the class with the dataset."""
+    # Per-customer engagement metrics: column -> aggregation
+    CUSTOMER_AGGREGATIONS = {
+        'Dur. (ms)': 'sum',
+        'Avg RTT DL (ms)': 'mean',
+        'Avg RTT UL (ms)': 'mean',
+        'Avg Bearer TP DL (kbps)': 'mean',
+        'Avg Bearer TP UL (kbps)': 'mean',
+        'Total DL (Bytes)': 'sum',
+        'Total UL (Bytes)': 'sum'
+    }
+    APPLICATION_COLUMNS = [
+        'Social Media DL (Bytes)', 'Social Media UL (Bytes)',
+        'Google DL (Bytes)', 'Google UL (Bytes)',
+        'Youtube DL (Bytes)', 'Youtube UL (Bytes)',
+        'Netflix DL (Bytes)', 'Netflix UL (Bytes)'
+    ]
+
+    def __init__(self, data, engine=None, registry=None):
+        """
+        Initialize the class with the dataset.
+        An optional shared CustomerAggregationEngine (keyed on MSISDN/Number) serves the per-customer aggregations,
+        and an optional ModelRegistry reuses the fitted scaler and KMeans until the data drifts.
+        """
         self.data = data
+        self.engine = engine
+        self.registry = registry
         self.kmeans = None  # Initialize kmeans attribute
+
+    @classmethod
+    def named_aggregations(cls):
+        """Named form (output -> (column, function)) of the per-customer and per-application aggregations."""
+        customer = {col: (col, func) for col, func in cls.CUSTOMER_AGGREGATIONS.items()}
+        applications = {col: (col, 'sum') for col in cls.APPLICATION_COLUMNS}
+        return customer, applications
     
-    def aggregate_metrics_by_customer(self):
-        """Aggregate metrics per MSISDN (customer ID) and calculate total engagement metrics."""
-        agg_columns = {
-            'Dur. (ms)': 'sum',
-            'Avg RTT DL (ms)': 'mean',
-            'Avg RTT UL (ms)': 'mean',
-            'Avg Bearer TP DL (kbps)': 'mean',
-            'Avg Bearer TP UL (kbps)': 'mean',
-            'Total DL (Bytes)': 'sum',
-            'Total UL (Bytes)': 'sum'
-        }
-        self.agg_data = self.data.groupby('MSISDN/Number').agg(agg_columns).reset_index()
+    def aggregate_metrics_by_customer(self, chunks=None):
+        """
+        Aggregate metrics per MSISDN (customer ID) and calculate total engagement metrics.
+        Pass `chunks` (e.g. from TelecoDataLoader.stream_data) to aggregate a stream instead of self.data.
+        """
+        named_aggs, _ = self.named_aggregations()
+        if chunks is not None:
+            self.agg_data = aggregate_chunks(chunks, 'MSISDN/Number', named_aggs).reset_index()
+        elif self.engine is not None:
+            self.agg_data = self.engine.aggregate(named_aggs).reset_index()
+        else:
+            self.agg_data = self.data.groupby('MSISDN/Number').agg(self.CUSTOMER_AGGREGATIONS).reset_index()
         return self.agg_data
     
     def top_customers_by_metric(self, metric, top_n=10):
@@ -34,18 +66,40 @@ class TelecomEngagementAnalysis:
     
     def normalize_metrics(self):
         """Normalize engagement metrics for clustering."""
-        scaler = StandardScaler()
-        self.normalized_data = pd.DataFrame(
-            scaler.fit_transform(self.agg_data.drop(columns=['MSISDN/Number'])),
-            columns=self.agg_data.columns[1:]
-        )
+        metrics = self.agg_data.drop(columns=['MSISDN/Number'])
+        if self.registry is not None:
+            self.scaler, _ = self.registry.get_or_train(
+                'engagement_scaler', metrics, list(metrics.columns), lambda: (StandardScaler().fit(metrics), {})
+            )
+            scaled = self.scaler.transform(metrics)
+        else:
+            self.scaler = StandardScaler()
+            scaled = self.scaler.fit_transform(metrics)
+        self.normalized_data = pd.DataFrame(scaled, columns=self.agg_data.columns[1:])
         return self.normalized_data
     
     
-    def k_means_clustering(self, n_clusters=3):
-        """Run K-Means clustering on the normalized data."""
-        self.kmeans = KMeans(n_clusters=n_clusters, random_state=0)
-        self.agg_data['Cluster'] = self.kmeans.fit_predict(self.normalized_data)
+    def k_means_clustering(self, n_clusters=3, backend=None):
+        """
+        Run K-Means clustering on the normalized data.
+        Pass a KMeansBackend (e.g. mode='minibatch', dtype=np.float32) to change how the clusters are fitted.
+        """
+        self.clustering_backend = backend or KMeansBackend(n_clusters=n_clusters, random_state=0)
+        if self.registry is not None:
+            def train():
+                self.clustering_backend.fit(self.normalized_data)
+                return self.clustering_backend.model, {'inertia': float(self.clustering_backend.inertia_)}
+
+            # Drift is measured on the raw metrics, as the normalized ones always have mean 0 and std 1
+            features = list(self.normalized_data.columns)
+            self.clustering_backend.model, _ = self.registry.get_or_train(
+                'engagement_kmeans', self.agg_data, features, train,
+                params={'n_clusters': self.clustering_backend.n_clusters, 'mode': self.clustering_backend.mode}
+            )
+            self.agg_data['Cluster'] = self.clustering_backend.predict(self.normalized_data)
+        else:
+            self.agg_data['Cluster'] = self.clustering_backend.fit_predict(self.normalized_data)
+        self.kmeans = self.clustering_backend.model
         return self.agg_data
     
     def compute_cluster_statistics(self):
@@ -59,30 +113,41 @@ class TelecomEngagementAnalysis:
         )
         return cluster_stats
     
-    def elbow_method(self, max_k=10):
-        """Use the Elbow Method to find the optimized value of k."""
-        distortions = []
-        for k in range(1, max_k+1):
-            kmeans = KMeans(n_clusters=k, random_state=0)
-            kmeans.fit(self.normalized_data)
-            distortions.append(kmeans.inertia_)
+    def elbow_sweep(self, max_k=10, **sweep_params):
+        """
+        Sweep k on the normalized data without plotting (see KSweep for the parameters).
+        Returns the inertia curve and the chosen k as data, e.g. for batch jobs.
+        """
+        return KSweep(max_k=max_k, **sweep_params).run(self.normalized_data)
+
+    def elbow_method(self, max_k=10, sweep=None):
+        """
+        Use the Elbow Method to find the optimized value of k.
+        By default every k is fitted from scratch; pass a KSweep to sample, warm-start or stop early.
+        """
+        sweep = sweep or KSweep(max_k=max_k, warm_start=False, tolerance=None, n_jobs=1)
+        result = sweep.run(self.normalized_data)
         
         plt.figure(figsize=(10,6))
-        plt.plot(range(1, max_k+1), distortions, marker='o')
+        plt.plot(result['curve']['k'], result['curve']['inertia'], marker='o')
         plt.title('Elbow Method for Optimal K')
         plt.xlabel('Number of Clusters')
         plt.ylabel('Distortion')
         plt.show()
+        return result
     
-    def aggregate_traffic_by_application(self):
-        """Aggregate total traffic per application and derive the top 10 most engaged users."""
-        application_columns = [
-            'Social Media DL (Bytes)', 'Social Media UL (Bytes)',
-            'Google DL (Bytes)', 'Google UL (Bytes)',
-            'Youtube DL (Bytes)', 'Youtube UL (Bytes)',
-            'Netflix DL (Bytes)', 'Netflix UL (Bytes)'
-        ]
-        app_traffic = self.data.groupby('MSISDN/Number')[application_columns].sum().reset_index()
+    def aggregate_traffic_by_application(self, chunks=None):
+        """
+        Aggregate total traffic per application and derive the top 10 most engaged users.
+        Pass `chunks` (e.g. from TelecoDataLoader.stream_data) to aggregate a stream instead of self.data.
+        """
+        _, named_aggs = self.named_aggregations()
+        if chunks is not None:
+            app_traffic = aggregate_chunks(chunks, 'MSISDN/Number', named_aggs).reset_index()
+        elif self.engine is not None:
+            app_traffic = self.engine.aggregate(named_aggs).reset_index()
+        else:
+            app_traffic = self.data.groupby('MSISDN/Number')[self.APPLICATION_COLUMNS].sum().reset_index()
         return app_traffic
     
     def top_users_by_application(self, application, top_n=10):
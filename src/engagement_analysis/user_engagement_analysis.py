@@ -1,28 +1,47 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from aggregation.chunked_aggregation import aggregate_chunks
+from aggregation.top_k import top_k
 
 class UserEngagementAnalysis:
-    def __init__(self, data):
+    # Per-user engagement aggregations: output name -> (column, function)
+    AGGREGATIONS = dict(
+        sessions_frequency=('Bearer Id', 'count'), # Count of sessions
+        total_session_duration=('Dur. (ms)', 'sum'), # Sum of session durations
+        total_download=('Total DL (Bytes)', 'sum'), # Sum of download traffic
+        total_upload=('Total UL (Bytes)', 'sum'), # Sum of upload traffic
+    )
+
+    def __init__(self, data, engine=None, sql_backend=None):
         """
         Initialize the analysis with the dataset.
         Args:
             data (pd.DataFrame): The telecommunication dataset containing user sessions.
+            engine (CustomerAggregationEngine, optional): Shared per-MSISDN aggregation engine.
+            sql_backend (SqlAggregationBackend, optional): Computes the per-user aggregation in the database.
         """
         self.data = data
+        self.engine = engine
+        self.sql_backend = sql_backend
 
-    def aggregate_user_metrics(self):
+    def aggregate_user_metrics(self, chunks=None):
         """
         Aggregate the metrics for each user based on session frequency, duration, and traffic.
+        Args:
+            chunks (iterable of pd.DataFrame, optional): Stream of session chunks to aggregate
+                instead of self.data (e.g. TelecoDataLoader.stream_data).
         Returns:
             pd.DataFrame: Aggregated user engagement metrics.
         """
         # Aggregating the required metrics per user (MSISDN/Number)
-        engagement_metrics = self.data.groupby('MSISDN/Number').agg(
-            sessions_frequency=('Bearer Id', 'count'), # Count of sessions
-            total_session_duration=('Dur. (ms)', 'sum'), # Sum of session durations
-            total_download=('Total DL (Bytes)', 'sum'), # Sum of download traffic
-            total_upload=('Total UL (Bytes)', 'sum'), # Sum of upload traffic
-        )
+        if chunks is not None:
+            engagement_metrics = aggregate_chunks(chunks, 'MSISDN/Number', self.AGGREGATIONS)
+        elif self.sql_backend is not None:
+            engagement_metrics = self.sql_backend.aggregate('MSISDN/Number', self.AGGREGATIONS)
+        elif self.engine is not None:
+            engagement_metrics = self.engine.aggregate(self.AGGREGATIONS)
+        else:
+            engagement_metrics = self.data.groupby('MSISDN/Number').agg(**self.AGGREGATIONS)
 
         # Add a total traffic column (DL + UL)
         engagement_metrics['total_traffic'] = engagement_metrics['total_download'] + engagement_metrics['total_upload']
@@ -38,8 +57,8 @@ class UserEngagementAnalysis:
         # Get aggregated user metrics
         metrics_df = self.aggregate_user_metrics()
 
-        # Sort data by session frequency to have a meaningful X-axis
-        metrics_df = metrics_df.sort_values(by='sessions_frequency', ascending=False).head(20)  # limit to top 20 for clarity
+        # Keep the top 20 users by session frequency (in descending order) for clarity
+        metrics_df = top_k(metrics_df, 'sessions_frequency', 20)
 
         # Create a figure and axis
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -63,17 +82,19 @@ class UserEngagementAnalysis:
         plt.tight_layout()
         plt.show()
 
-    def top_customers_by_engagement(self, metric, top_n=10):
+    def top_customers_by_engagement(self, metric, top_n=10, chunks=None):
         """
         Get the top customers based on the specified engagement metric.
         Args:
             metric (str): The engagement metric to rank the customers by.
             top_n (int): Number of top customers to retrieve.
+            chunks (iterable of pd.DataFrame, optional): Stream of session chunks to aggregate
+                instead of self.data.
         Returns:
             pd.DataFrame: Top customers ranked by the specified metric.
         """
-        aggregated_metrics = self.aggregate_user_metrics()
-        return aggregated_metrics.sort_values(by=metric, ascending=False).head(top_n)
+        aggregated_metrics = self.aggregate_user_metrics(chunks)
+        return top_k(aggregated_metrics, metric, top_n)
 
     def normalize_metrics(self, metrics_df):
         """
@@ -1,9 +1,31 @@
 import pandas as pd
 import numpy as np
+from aggregation.chunked_aggregation import aggregate_chunks
 
 class AggregateCustomer:
-    def __init__(self, df):
+    # Per-customer experience aggregations: column -> aggregation
+    AGGREGATIONS = {
+        'Avg RTT DL (ms)': 'mean',
+        'Avg RTT UL (ms)': 'mean',
+        'TCP DL Retrans. Vol (Bytes)': 'mean',
+        'TCP UL Retrans. Vol (Bytes)': 'mean',
+        'Avg Bearer TP DL (kbps)': 'mean',
+        'Avg Bearer TP UL (kbps)': 'mean',
+        'Handset Manufacturer': 'first',
+        'Handset Type': 'first'
+    }
+
+    def __init__(self, df, engine=None):
+        """
+        Parameters:
+        - df: Session-level DataFrame.
+        - engine: Optional CustomerAggregationEngine keyed on IMSI. It must be built on the frame
+          after handle_missing_values, since aggregation results are cached by the engine.
+        """
+        if engine is not None and engine.key != 'IMSI':
+            raise ValueError("AggregateCustomer requires an aggregation engine keyed on 'IMSI'.")
         self.df = df
+        self.engine = engine
     def handle_missing_values(self):
         """
         Handles missing values by replacing them with the mean for numeric columns
@@ -25,19 +47,18 @@ class AggregateCustomer:
             if not self.df[col].isnull().all():
                 self.df[col] = self.df[col].fillna(self.df[col].mode()[0])
 
-    def aggregate_user_experience(self):
-        aggregation = {
-            'Avg RTT DL (ms)': 'mean',
-            'Avg RTT UL (ms)': 'mean',
-            'TCP DL Retrans. Vol (Bytes)': 'mean',
-            'TCP UL Retrans. Vol (Bytes)': 'mean',
-            'Avg Bearer TP DL (kbps)': 'mean',
-            'Avg Bearer TP UL (kbps)': 'mean',
-            'Handset Manufacturer': 'first',
-            'Handset Type': 'first'
-        }
-
-        aggregated_df = self.df.groupby('IMSI').agg(aggregation).reset_index()
+    def aggregate_user_experience(self, chunks=None):
+        """
+        Aggregate experience metrics per customer (IMSI).
+        Pass `chunks` (e.g. from TelecoDataLoader.stream_data) to aggregate a stream instead of self.df.
+        """
+        named_aggs = {col: (col, func) for col, func in self.AGGREGATIONS.items()}
+        if chunks is not None:
+            aggregated_df = aggregate_chunks(chunks, 'IMSI', named_aggs).reset_index()
+        elif self.engine is not None:
+            aggregated_df = self.engine.aggregate(named_aggs).reset_index()
+        else:
+            aggregated_df = self.df.groupby('IMSI').agg(self.AGGREGATIONS).reset_index()
         return aggregated_df
 
     def run_analysis(self):
@@ -1,59 +1,105 @@
+import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 import matplotlib.pyplot as plt
-import seaborn as sns
+from clustering.kmeans_backend import KMeansBackend
+from visualization.plot_backend import get_plot_backend, sample_rows
 
 class ExperienceClustering:
-    def __init__(self, df):
+    def __init__(self, df, per_customer=False, backend=None, registry=None):
         """
         Initialize the class with the dataframe.
+
+        Parameters:
+        - df: Session-level DataFrame.
+        - per_customer: Cluster customers (mean experience metrics per MSISDN/Number) instead of
+          sessions; every session then gets its customer's cluster.
+        - backend: Optional KMeansBackend (e.g. mode='minibatch', dtype=np.float32).
+        - registry: Optional ModelRegistry reusing the fitted scaler and KMeans until the data drifts.
         """
         self.df = df
+        self.per_customer = per_customer
+        self.registry = registry
+        self.model_prefix = 'experience_customer' if per_customer else 'experience'
         self.features = ['Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 
                          'Avg Bearer TP UL (kbps)', 'TCP DL Retrans. Vol (Bytes)', 
                          'TCP UL Retrans. Vol (Bytes)']
         self.scaler = StandardScaler()
-        self.kmeans = KMeans(n_clusters=3, random_state=42)
+        self.backend = backend or KMeansBackend(n_clusters=3, random_state=42)
+        self.kmeans = self.backend.model
 
     def preprocess_data(self):
         """
         Preprocess the data by selecting relevant features and scaling them.
         """
-        self.scaled_features = self.scaler.fit_transform(self.df[self.features])
+        if self.per_customer:
+            self.feature_data = self.df.groupby('MSISDN/Number')[self.features].mean()
+        else:
+            self.feature_data = self.df[self.features]
+        if self.registry is not None:
+            self.scaler, _ = self.registry.get_or_train(
+                f'{self.model_prefix}_scaler', self.feature_data, self.features,
+                lambda: (StandardScaler().fit(self.feature_data), {})
+            )
+            self.scaled_features = self.scaler.transform(self.feature_data)
+        else:
+            self.scaled_features = self.scaler.fit_transform(self.feature_data)
     
     def perform_clustering(self):
         """
         Apply K-Means clustering on the preprocessed data and store the cluster labels.
         """
-        self.df['Cluster'] = self.kmeans.fit_predict(self.scaled_features)
+        if self.registry is not None:
+            def train():
+                self.backend.fit(self.scaled_features)
+                return self.backend.model, {'inertia': float(self.backend.inertia_)}
+
+            self.backend.model, _ = self.registry.get_or_train(
+                f'{self.model_prefix}_kmeans', self.feature_data, self.features, train,
+                params={'n_clusters': self.backend.n_clusters, 'mode': self.backend.mode}
+            )
+            self.kmeans = self.backend.model
+            self.labels = self.backend.predict(self.scaled_features)
+        else:
+            self.labels = self.backend.fit_predict(self.scaled_features)
+        if self.per_customer:
+            self.customer_clusters = pd.Series(self.labels, index=self.feature_data.index, name='Cluster')
+            self.df['Cluster'] = self.df['MSISDN/Number'].map(self.customer_clusters)
+        else:
+            self.df['Cluster'] = self.labels
     
-    def visualize_clusters(self):
+    def visualize_clusters(self, backend=None, data_version=None):
         """
         Visualize the clusters using PCA for dimensionality reduction.
+        The PCA is fitted on every row but only a capped random sample is projected and drawn;
+        pass a data_version to reuse the rendered figure (see PlotBackend.figure).
         """
-        # Reduce dimensions to 2 using PCA
-        pca = PCA(n_components=2)
-        principal_components = pca.fit_transform(self.scaled_features)
+        backend = backend or get_plot_backend()
 
-        # Create a DataFrame with the principal components and the cluster labels
-        pca_df = pd.DataFrame(data=principal_components, columns=['PC1', 'PC2'])
-        pca_df['Cluster'] = self.df['Cluster']
+        def draw(fig):
+            # Reduce dimensions to 2 using PCA
+            pca = PCA(n_components=2).fit(self.scaled_features)
+            rows = sample_rows(len(self.scaled_features), backend.max_points, backend.random_state)
+            principal_components = pca.transform(np.asarray(self.scaled_features)[rows])
 
-        # Plot the clusters
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(x='PC1', y='PC2', hue='Cluster', palette='viridis', data=pca_df, s=100)
+            # Plot the clusters
+            ax = fig.add_subplot()
+            backend.scatter(ax, principal_components[:, 0], principal_components[:, 1],
+                            hue=np.asarray(self.labels)[rows], s=100)
 
-        # Enhance the plot with titles and labels
-        plt.title('K-Means Clustering of User Experience Metrics', fontsize=16)
-        plt.xlabel('Principal Component 1', fontsize=12)
-        plt.ylabel('Principal Component 2', fontsize=12)
-        plt.legend(title='Cluster')
-        plt.grid(True)
+            # Enhance the plot with titles and labels
+            ax.set_title('K-Means Clustering of User Experience Metrics', fontsize=16)
+            ax.set_xlabel('Principal Component 1', fontsize=12)
+            ax.set_ylabel('Principal Component 2', fontsize=12)
+            ax.legend(title='Cluster')
+            ax.grid(True)
+
+        fig = backend.figure(f'{self.model_prefix}_clusters', data_version, draw)
 
         # Show the plot
         plt.show()
+        return fig
     
     def describe_clusters(self):
         """
@@ -64,7 +110,7 @@ class ExperienceClustering:
         centroid_df = pd.DataFrame(centroids, columns=self.features)
 
         # Print the centroid characteristics
-        for i in range(3):
+        for i in range(self.backend.n_clusters):
             print(f"Cluster {i} characteristics:\n{centroid_df.iloc[i]}\n")
     
     def get_clustered_data(self):
@@ -73,11 +119,14 @@ class ExperienceClustering:
         """
         return self.df[['MSISDN/Number', 'Cluster']]
 
-    def run(self):
+    def run(self, data_version=None):
         """
         Run the entire clustering process: preprocessing, clustering, visualization, and description.
+
+        Parameters:
+        - data_version: Optional version of the data, reusing the rendered cluster plot (see visualize_clusters).
         """
         self.preprocess_data()
         self.perform_clustering()
-        self.visualize_clusters()
+        self.visualize_clusters(data_version=data_version)
         self.describe_clusters()
\ No newline at end of file
@@ -1,11 +1,50 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+from aggregation.top_k import top_k
+
+
+def handset_summary(handset_counts):
+    """
+    Top handsets and manufacturers from session counts per (manufacturer, handset), as produced by
+    TelecoDataLoader.fetch_overview_summary; the same tables as TelecomDataAnalyzer computes
+    from the full session frame.
+
+    Returns:
+    - Dict with 'Top 10 Handsets', 'Top 3 Manufacturers' and 'Top 5 Handsets per Manufacturer'.
+    """
+    counts = handset_counts.copy()
+    counts['Handset Type'] = counts['Handset Type'].fillna('Unknown').replace('undefined', 'Unknown')
+
+    def ranked(frame, column, n):
+        totals = frame.groupby(column)['sessions'].sum().sort_values(ascending=False, kind='stable').head(n)
+        return totals.rename('count')
+
+    top_3_manufacturers = ranked(counts, 'Handset Manufacturer', 3)
+    return {
+        'Top 10 Handsets': ranked(counts[counts['Handset Type'] != 'Unknown'], 'Handset Type', 10),
+        'Top 3 Manufacturers': top_3_manufacturers,
+        'Top 5 Handsets per Manufacturer': {
+            manufacturer: ranked(counts[counts['Handset Manufacturer'] == manufacturer], 'Handset Type', 5)
+            for manufacturer in top_3_manufacturers.index
+        }
+    }
+
 
 class TelecomDataAnalyzer:
-    def __init__(self, dataframe):
+    # Handset types counted as 'Unknown' by clean_data
+    UNKNOWN_HANDSETS = ['undefined', 'Unknown']
+
+    def __init__(self, dataframe, sql_backend=None):
+        """
+        Parameters:
+        - dataframe: Session-level DataFrame (may be None when sql_backend is given).
+        - sql_backend: Optional SqlAggregationBackend computing the handset counts in the database.
+        """
         self.df = dataframe
-        self.clean_data()
+        self.sql_backend = sql_backend
+        if self.df is not None:
+            self.clean_data()
 
     def clean_data(self):
         # Handle missing values and 'undefined' in 'Handset Type'
@@ -13,6 +52,8 @@ class TelecomDataAnalyzer:
         self.df['Handset Type'] = self.df['Handset Type'].replace('undefined', 'Unknown')
 
     def get_top_10_handsets(self):
+        if self.sql_backend is not None:
+            return self.sql_backend.value_counts('Handset Type', 10, exclude=self.UNKNOWN_HANDSETS)
         # Exclude 'Unknown' values from the count
         top_10_handsets = self.df[self.df['Handset Type'] != 'Unknown']['Handset Type'].value_counts().head(10)
         return top_10_handsets
@@ -38,6 +79,8 @@ class TelecomDataAnalyzer:
         plt.show()
     
     def get_top_3_manufacturers(self):
+        if self.sql_backend is not None:
+            return self.sql_backend.value_counts('Handset Manufacturer', 3)
         # Counting occurrences of each handset manufacturer
         top_3_manufacturers = self.df['Handset Manufacturer'].value_counts().head(3)
         return top_3_manufacturers
@@ -54,6 +97,9 @@ class TelecomDataAnalyzer:
         plt.show()
 
     def get_top_5_handsets_per_top_3_manufacturers(self):
+        if self.sql_backend is not None:
+            handset_counts = self.sql_backend.group_counts(['Handset Manufacturer', 'Handset Type'])
+            return handset_summary(handset_counts)['Top 5 Handsets per Manufacturer']
         # Getting the top 3 manufacturers
         top_3_manufacturers = self.get_top_3_manufacturers().index
         top_5_handsets = {}
@@ -162,13 +208,14 @@ class TelecomDataAnalyzer:
         self.df['Total Gaming Data (Bytes)'] = self.df['Gaming DL (Bytes)'] + self.df['Gaming UL (Bytes)']
         self.df['Total Other Data (Bytes)'] = self.df['Other DL (Bytes)'] + self.df['Other UL (Bytes)']
 
-    def aggregate_data_by_user(self, user_identifier='IMSI'):
+    def aggregate_data_by_user(self, user_identifier='IMSI', top_n=None):
         """
         Group data by a user identifier (IMSI, MSISDN, etc.) and calculate the
         sum of data usage for each application.
         
         Args:
         user_identifier (str): The column name representing the user (e.g., IMSI, MSISDN)
+        top_n (int, optional): Only return the top N users, selected without sorting every user.
         
         Returns:
         pd.DataFrame: Aggregated DataFrame sorted by YouTube data usage.
@@ -183,13 +230,18 @@ class TelecomDataAnalyzer:
         }).reset_index()
 
         # Sort by YouTube data usage as an example
+        if top_n is not None:
+            return top_k(user_data_usage, 'Total YouTube Data (Bytes)', top_n)
         return user_data_usage.sort_values(by='Total YouTube Data (Bytes)', ascending=False)
 
-    def aggregate_data_by_handset(self):
+    def aggregate_data_by_handset(self, top_n=None):
         """
         Group data by handset manufacturer and type, and calculate the
         sum of data usage for each application.
 
+        Args:
+        top_n (int, optional): Only return the top N handsets, selected without sorting every handset.
+
         Returns:
         pd.DataFrame: Aggregated DataFrame sorted by Netflix data usage.
         """
@@ -200,6 +252,8 @@ class TelecomDataAnalyzer:
         }).reset_index()
 
         # Sort by Netflix data usage
+        if top_n is not None:
+            return top_k(handset_data_usage, 'Total Netflix Data (Bytes)', top_n)
         return handset_data_usage.sort_values(by='Total Netflix Data (Bytes)', ascending=False)
 
     def plot_top_users(self, user_data_usage, app_column='Total YouTube Data (Bytes)', top_n=5):
@@ -4,13 +4,155 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
+from visualization.plot_backend import get_plot_backend, sample_rows
+
+# Application label -> DL byte column, in the default classification priority (first match wins)
+APPLICATION_DL_COLUMNS = {
+    'YouTube': 'Youtube DL (Bytes)',
+    'Netflix': 'Netflix DL (Bytes)',
+    'Social Media': 'Social Media DL (Bytes)',
+    'Gaming': 'Gaming DL (Bytes)',
+    'Google': 'Google DL (Bytes)',
+    'Email': 'Email DL (Bytes)'
+}
+DEFAULT_APPLICATION = 'Other'
+
+
+def _application_activity(data, priority=None):
+    """
+    Return the application labels in priority order and, per label, a boolean array telling
+    which sessions downloaded bytes for it. Applications whose column is absent never match.
+    """
+    priority = list(APPLICATION_DL_COLUMNS) if priority is None else list(priority)
+    unknown = [label for label in priority if label not in APPLICATION_DL_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown applications {unknown}, expected some of {list(APPLICATION_DL_COLUMNS)}.")
+    activity = []
+    for label in priority:
+        column = APPLICATION_DL_COLUMNS[label]
+        if column in data.columns:
+            activity.append(data[column].to_numpy() > 0)
+        else:
+            activity.append(np.zeros(len(data), dtype=bool))
+    return priority, activity
+
+
+def classify_applications(data, priority=None, default=DEFAULT_APPLICATION):
+    """
+    Label every session with its main application: the first application in `priority` with
+    downloaded bytes, or `default` when there is none.
+
+    Parameters:
+    - data: Session DataFrame with the per-application DL byte columns.
+    - priority: Application labels in priority order (defaults to APPLICATION_DL_COLUMNS order).
+    - default: Label of sessions without traffic for any of the applications.
+
+    Returns:
+    - Categorical Series (categories in priority order, then `default`).
+    """
+    labels, activity = _application_activity(data, priority)
+    codes = np.select(activity, np.arange(len(labels)), default=len(labels)) if labels else np.zeros(len(data), dtype=int)
+    categories = labels + [default]
+    return pd.Series(pd.Categorical.from_codes(codes.astype(np.int8), categories=categories), index=data.index)
+
+
+def application_bitmask(data, priority=None):
+    """
+    Multi-label form of `classify_applications`: bit i of a session's mask is set when it
+    downloaded bytes for the i-th application of `priority`.
+
+    Returns:
+    - Series of the smallest unsigned integer dtype holding one bit per application.
+    """
+    labels, activity = _application_activity(data, priority)
+    dtype = np.uint8 if len(labels) <= 8 else np.uint16 if len(labels) <= 16 else np.uint32
+    mask = np.zeros(len(data), dtype=dtype)
+    for bit, active in enumerate(activity):
+        mask |= active.astype(dtype) << dtype(bit)
+    return pd.Series(mask, index=data.index)
+
+
+def decode_application_mask(mask, priority=None):
+    """Return the application labels encoded in one bitmask value (see `application_bitmask`)."""
+    labels = list(APPLICATION_DL_COLUMNS) if priority is None else list(priority)
+    return [label for bit, label in enumerate(labels) if int(mask) >> bit & 1]
+
+
+def _lerp(low, high, t):
+    """Linear interpolation in the form numpy's percentile uses, so quantiles match pandas exactly."""
+    return np.where(t >= 0.5, high - (high - low) * (1 - t), low + (high - low) * t)
+
+
+def describe_numeric(frame, percentiles=(0.25, 0.5, 0.75), column_block=16):
+    """
+    Descriptive statistics of numeric columns in one pass per block of columns.
+
+    Each block is converted to float64 once; mean and std are summed from it and it is then
+    sorted in place once, so count, min, max and every quantile are read from the same buffer
+    instead of one pass per statistic as with DataFrame.describe(). Missing values are ignored.
+
+    Parameters:
+    - frame: DataFrame of numeric columns.
+    - percentiles: Quantiles to report (the median is always included).
+    - column_block: Number of columns sorted at once, bounding temporary memory.
+
+    Returns:
+    - DataFrame laid out like DataFrame.describe() (count, mean, std, min, quantiles, max).
+    """
+    percentiles = sorted(set(percentiles) | {0.5})
+    labels = ['count', 'mean', 'std', 'min'] + [f'{q * 100:g}%' for q in percentiles] + ['max']
+    blocks = []
+    for start in range(0, frame.shape[1], column_block):
+        # One row per column, so the (pairwise) sums and the sort run over contiguous memory
+        values = np.ascontiguousarray(frame.iloc[:, start:start + column_block].to_numpy(dtype=np.float64).T)
+        count = (~np.isnan(values)).sum(axis=1)
+        valid = count > 0
+        last = np.maximum(count - 1, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.nansum(values, axis=1) / count
+            std = np.sqrt(np.nansum((values - mean[:, np.newaxis]) ** 2, axis=1) / (count - 1))
+        std = np.where(count > 1, std, np.nan)
+        # Sorted in place; NaN goes last, so the first `count` values of each column are its valid values
+        values.sort(axis=1)
+
+        def at(positions):
+            return np.take_along_axis(values, positions[:, np.newaxis], axis=1)[:, 0]
+
+        rows = [count.astype(np.float64), np.where(valid, mean, np.nan), std, np.where(valid, values[:, 0], np.nan)]
+        for q in percentiles:
+            position = last * q
+            low = np.floor(position).astype(np.intp)
+            high = np.minimum(low + 1, last)
+            rows.append(np.where(valid, _lerp(at(low), at(high), position - low), np.nan))
+        rows.append(np.where(valid, at(last), np.nan))
+        blocks.append(np.vstack(rows))
+    data = np.hstack(blocks) if blocks else np.empty((len(labels), 0))
+    return pd.DataFrame(data, index=labels, columns=frame.columns)
+
 
 class TelecomEDA:
-    def __init__(self, data):
+    def __init__(self, data, application_priority=None, multi_label=False, data_version=None):
         """
         Initialize with the dataset
+
+        The caller's frame is never modified: the analysis works on a shallow copy, and the
+        derived columns (total_duration, total_DL, total_UL, total_data, decile_class) and the
+        descriptive statistics are computed on first use and cached (see `derived`/`describe`).
+
+        Parameters:
+        - data: Session DataFrame.
+        - application_priority: Application labels in the order used to pick each session's
+          application_type (defaults to APPLICATION_DL_COLUMNS order).
+        - multi_label: Also add an application_mask column with one bit per application.
+        - data_version: Optional version of the data; rendered figures are cached per version.
         """
-        self.data = data
+        self.data = data.copy(deep=False)
+        self.application_priority = application_priority
+        self.data_version = data_version
+        # Numeric variables of the input, described by describe_variables/basic_metrics/univariate_analysis
+        self.numeric_columns = list(self.data.select_dtypes(include=[np.number]).columns)
+        self._derived = {}
+        self._description = None
 
         # Define DL and UL columns
         self.dl_columns = [
@@ -29,22 +171,50 @@ class TelecomEDA:
         # Ensure DL and UL columns exist in the dataset
         self.dl_columns = [col for col in self.dl_columns if col in self.data.columns]
         self.ul_columns = [col for col in self.ul_columns if col in self.data.columns]
-        self.data['application_type'] = self.data.apply(
-                    lambda row: 'YouTube' if row['Youtube DL (Bytes)'] > 0 
-                    else 'Netflix' if row['Netflix DL (Bytes)'] > 0
-                    else 'Social Media' if row['Social Media DL (Bytes)'] > 0
-                    else 'Gaming' if row['Gaming DL (Bytes)'] > 0
-                    else 'Google' if row['Google DL (Bytes)'] > 0
-                    else 'Email' if row['Email DL (Bytes)'] > 0
-                    else 'Other', axis=1
-                )
-                
+        self.data['application_type'] = classify_applications(self.data, application_priority)
+        if multi_label:
+            self.data['application_mask'] = application_bitmask(self.data, application_priority)
+
+    def derived(self, name):
+        """
+        Return a derived column, computing it (and the columns it depends on) on first use.
+        The column is also added to the working frame so plots can refer to it by name.
+        """
+        if name not in self._derived:
+            if name == 'total_duration':
+                column = self.data['Dur. (ms)']
+            elif name == 'total_DL':
+                column = self.data[self.dl_columns].sum(axis=1)
+            elif name == 'total_UL':
+                column = self.data[self.ul_columns].sum(axis=1)
+            elif name == 'total_data':
+                column = self.derived('total_DL') + self.derived('total_UL')
+            elif name == 'decile_class':
+                # Segment users by decile based on session duration
+                column = pd.qcut(self.derived('total_duration'), 5, labels=False)
+            else:
+                raise KeyError(f"Unknown derived column '{name}'.")
+            self._derived[name] = self.data[name] = column.rename(name)
+        return self._derived[name]
+
+    def describe(self):
+        """Descriptive statistics of the numeric variables, computed once (see `describe_numeric`)."""
+        if self._description is None:
+            self._description = describe_numeric(self.data[self.numeric_columns])
+        return self._description
+
+    def invalidate(self):
+        """Drop the cached derived columns and statistics, e.g. after editing self.data."""
+        for name in self._derived:
+            self.data.drop(columns=name, inplace=True)
+        self._derived = {}
+        self._description = None
 
     def describe_variables(self):
         """
         Describe all relevant variables and associated data types
         """
-        description = self.data.describe()
+        description = self.describe()
         print(f"Dataset Description:\n{description}")
         return description
     def segment_users_by_decile(self):
@@ -52,24 +222,15 @@ class TelecomEDA:
         Segment users into decile classes based on total session duration
         and compute the total data (DL+UL) per decile class.
         """
-        # Rename 'Dur. (ms)' to 'total_duration'
-        if 'Dur. (ms)' in self.data.columns:
-            self.data.rename(columns={'Dur. (ms)': 'total_duration'}, inplace=True)
-        else:
+        if 'Dur. (ms)' not in self.data.columns:
             print("Error: 'Dur. (ms)' column not found in the dataset.")
             return None
 
-        # Calculate total download and upload data
-        self.data['total_DL'] = self.data[self.dl_columns].sum(axis=1)
-        self.data['total_UL'] = self.data[self.ul_columns].sum(axis=1)
-        self.data['total_data'] = self.data['total_DL'] + self.data['total_UL']
-
-        # Segment users by decile based on session duration
-        self.data['decile_class'] = pd.qcut(self.data['total_duration'], 5, labels=False)
-        decile_summary = self.data.groupby('decile_class').agg({
-            'total_duration': 'sum',
-            'total_data': 'sum'
+        totals = pd.DataFrame({
+            'total_duration': self.derived('total_duration'),
+            'total_data': self.derived('total_data')
         })
+        decile_summary = totals.groupby(self.derived('decile_class')).sum()
         print(f"Decile Summary:\n{decile_summary}")
         return decile_summary
     
@@ -77,14 +238,13 @@ class TelecomEDA:
         """
         Analyze basic metrics (mean, median, standard deviation) for numeric columns only.
         """
-        # Select only numeric columns
-        numeric_data = self.data.select_dtypes(include=[np.number])
+        description = self.describe()
 
-        # Calculate mean, median, and standard deviation
+        # Mean, median, and standard deviation come from the shared description
         metrics = {
-            'mean': numeric_data.mean(numeric_only=True),
-            'median': numeric_data.median(numeric_only=True),
-            'std_dev': numeric_data.std(numeric_only=True)
+            'mean': description.loc['mean'].rename(None),
+            'median': description.loc['50%'].rename(None),
+            'std_dev': description.loc['std'].rename(None)
         }
 
         print(f"Basic Metrics:\n{metrics}")
@@ -94,40 +254,55 @@ class TelecomEDA:
         """
         Non-graphical univariate analysis: Dispersion parameters for each quantitative variable.
         """
-        dispersion = self.data.describe()
+        dispersion = self.describe()
         print(f"Univariate Analysis:\n{dispersion}")
         return dispersion
 
-    def graphical_univariate_analysis(self):
+    def graphical_univariate_analysis(self, backend=None):
         """
         Graphical univariate analysis: Suitable plotting options for each variable.
         Dynamically adjusts the grid layout based on the number of numerical columns.
+        Histograms are pre-binned and KDEs estimated on a sample by the PlotBackend.
         """
-        num_columns = len(self.data.select_dtypes(include=[np.number]).columns)
+        backend = backend or get_plot_backend()
+        num_columns = len(self.numeric_columns)
         
         # Calculate the number of rows needed for the grid
         ncols = 3  # You can adjust this for a different number of columns per row
         nrows = (num_columns + ncols - 1) // ncols  # Calculate rows needed (ceiling division)
 
-        plt.figure(figsize=(5 * ncols, 5 * nrows))  # Adjusting figure size for better readability
-        for i, column in enumerate(self.data.select_dtypes(include=[np.number]).columns):
-            plt.subplot(nrows, ncols, i + 1)
-            sns.histplot(self.data[column], kde=True)
-            plt.title(f"Distribution of {column}")
-        
-        plt.tight_layout()
+        def draw(fig):
+            for i, column in enumerate(self.numeric_columns):
+                ax = fig.add_subplot(nrows, ncols, i + 1)
+                backend.histogram(ax, self.data[column])
+                ax.set_title(f"Distribution of {column}")
+            fig.tight_layout()
+
+        # Adjusting figure size for better readability
+        fig = backend.figure('eda_univariate', self.data_version, draw, figsize=(5 * ncols, 5 * max(nrows, 1)))
         plt.show()
+        return fig
 
 
-    def bivariate_analysis(self):
+    def bivariate_analysis(self, backend=None):
         """
         Explore relationships between applications & total DL+UL data.
         """
 
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(data=self.data, x='total_data', y='application_type', hue='total_duration')
-        plt.title("Bivariate Analysis: Application vs Data")
+        backend = backend or get_plot_backend()
+        self.derived('total_data')
+        self.derived('total_duration')
+
+        def draw(fig):
+            # Scatter a capped random sample of the sessions
+            rows = sample_rows(len(self.data), backend.max_points, backend.random_state)
+            sns.scatterplot(data=self.data.iloc[rows], x='total_data', y='application_type', hue='total_duration',
+                            ax=fig.add_subplot())
+            plt.title("Bivariate Analysis: Application vs Data")
+
+        fig = backend.figure('eda_bivariate', self.data_version, draw)
         plt.show()
+        return fig
 
     def correlation_analysis(self):
         """
@@ -1,23 +1,46 @@
+from aggregation.chunked_aggregation import aggregate_chunks
+
 # User Overview Analysis Class
 class UserOverviewAnalysis:
-    def __init__(self, df):
+    # Per-user aggregations: output name -> (column, function)
+    AGGREGATIONS = dict(
+        num_sessions=('Bearer Id', 'nunique'),  # Number of xDR sessions
+        total_duration=('Dur. (ms)', 'sum'),    # Total session duration
+        total_dl_data=('Total DL (Bytes)', 'sum'),  # Total download data
+        total_ul_data=('Total UL (Bytes)', 'sum'),  # Total upload data
+        youtube_dl=('Youtube DL (Bytes)', 'sum'),  # Total YouTube download
+        youtube_ul=('Youtube UL (Bytes)', 'sum'),  # Total YouTube upload
+        netflix_dl=('Netflix DL (Bytes)', 'sum'),  # Total Netflix download
+        netflix_ul=('Netflix UL (Bytes)', 'sum'),  # Total Netflix upload
+        gaming_dl=('Gaming DL (Bytes)', 'sum'),    # Total Gaming download
+        gaming_ul=('Gaming UL (Bytes)', 'sum')     # Total Gaming upload
+    )
+
+    def __init__(self, df, engine=None, sql_backend=None):
+        """
+        Parameters:
+        - df: Session-level DataFrame (may be None when sql_backend is given).
+        - engine: Optional shared CustomerAggregationEngine keyed on MSISDN/Number.
+        - sql_backend: Optional SqlAggregationBackend computing the aggregation in the database.
+        """
         self.df = df
+        self.engine = engine
+        self.sql_backend = sql_backend
 
-    def aggregate_user_data(self):
-        """Aggregate data per user (MSISDN/Number) based on the given requirements."""
+    def aggregate_user_data(self, chunks=None):
+        """
+        Aggregate data per user (MSISDN/Number) based on the given requirements.
+        Pass `chunks` (e.g. from TelecoDataLoader.stream_data) to aggregate a stream instead of self.df.
+        """
         # Group by MSISDN/Number (user ID)
-        aggregated_data = self.df.groupby('MSISDN/Number').agg(
-            num_sessions=('Bearer Id', 'nunique'),  # Number of xDR sessions
-            total_duration=('Dur. (ms)', 'sum'),    # Total session duration
-            total_dl_data=('Total DL (Bytes)', 'sum'),  # Total download data
-            total_ul_data=('Total UL (Bytes)', 'sum'),  # Total upload data
-            youtube_dl=('Youtube DL (Bytes)', 'sum'),  # Total YouTube download
-            youtube_ul=('Youtube UL (Bytes)', 'sum'),  # Total YouTube upload
-            netflix_dl=('Netflix DL (Bytes)', 'sum'),  # Total Netflix download
-            netflix_ul=('Netflix UL (Bytes)', 'sum'),  # Total Netflix upload
-            gaming_dl=('Gaming DL (Bytes)', 'sum'),    # Total Gaming download
-            gaming_ul=('Gaming UL (Bytes)', 'sum')     # Total Gaming upload
-        ).reset_index()
+        if chunks is not None:
+            aggregated_data = aggregate_chunks(chunks, 'MSISDN/Number', self.AGGREGATIONS).reset_index()
+        elif self.sql_backend is not None:
+            aggregated_data = self.sql_backend.aggregate('MSISDN/Number', self.AGGREGATIONS).reset_index()
+        elif self.engine is not None:
+            aggregated_data = self.engine.aggregate(self.AGGREGATIONS).reset_index()
+        else:
+            aggregated_data = self.df.groupby('MSISDN/Number').agg(**self.AGGREGATIONS).reset_index()
 
         # Calculate total data volume per user
         aggregated_data['total_data_volume'] = aggregated_data['total_dl_data'] + aggregated_data['total_ul_data']
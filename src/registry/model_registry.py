@@ -0,0 +1,203 @@
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_REGISTRY_DIR = os.path.join('.cache', 'models')
+DEFAULT_DRIFT_THRESHOLD = 0.05
+METADATA_FILE = 'metadata.json'
+MODEL_FILE_PATTERN = re.compile(r'^model-(\d+)\.joblib$')
+
+
+def data_fingerprint(data, features):
+    """
+    Summarize the training data of a model: row count and per-feature mean and standard deviation.
+
+    Parameters:
+    - data: DataFrame (or 2-D array with `features` as column order).
+    - features: Feature columns the model is trained on.
+
+    Returns:
+    - JSON-serializable dict.
+    """
+    values = data[features].to_numpy(dtype=np.float64) if hasattr(data, 'columns') else np.asarray(data, dtype=np.float64)
+    return {
+        'rows': int(len(values)),
+        'mean': dict(zip(features, np.nanmean(values, axis=0).tolist())) if len(values) else {},
+        'std': dict(zip(features, np.nanstd(values, axis=0).tolist())) if len(values) else {}
+    }
+
+
+def fingerprint_drift(old, new):
+    """
+    Distance between two fingerprints: the largest shift of a feature mean in units of its
+    original standard deviation, or the relative change of the row count if that is larger.
+    """
+    if set(old['mean']) != set(new['mean']):
+        return float('inf')
+    drift = abs(new['rows'] - old['rows']) / max(old['rows'], 1)
+    for feature, mean in old['mean'].items():
+        scale = old['std'][feature] or 1.0
+        drift = max(drift, abs(new['mean'][feature] - mean) / scale)
+    return drift
+
+
+class ModelRegistry:
+    def __init__(self, registry_dir=None, drift_threshold=None):
+        """
+        File-backed registry of fitted models (scalers, KMeans, regressions).
+
+        Every model is stored under its name with joblib, next to a JSON metadata file holding its
+        feature list, training parameters, metrics and a fingerprint of the training data. A stored
+        model is reused as long as the parameters match and the data has not drifted beyond
+        `drift_threshold` (see `fingerprint_drift`); otherwise it is retrained and replaced.
+
+        Parameters:
+        - registry_dir: Root directory (defaults to MODEL_REGISTRY_DIR or .cache/models).
+        - drift_threshold: Maximum drift before retraining (defaults to MODEL_DRIFT_THRESHOLD or 0.05).
+        """
+        self.registry_dir = registry_dir or os.getenv('MODEL_REGISTRY_DIR', DEFAULT_REGISTRY_DIR)
+        if drift_threshold is None:
+            drift_threshold = float(os.getenv('MODEL_DRIFT_THRESHOLD', DEFAULT_DRIFT_THRESHOLD))
+        self.drift_threshold = drift_threshold
+
+    def _model_dir(self, name):
+        return os.path.join(self.registry_dir, name)
+
+    @contextmanager
+    def _lock(self, name):
+        """Hold an exclusive lock on a model, shared with every other process writing to the registry."""
+        lock_path = os.path.join(self.registry_dir, f'.{name}.lock')
+        with open(lock_path, 'a+') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @staticmethod
+    def _publish(model_dir, file_name, write):
+        """Write a file under a unique temporary name and move it into place in one step."""
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=model_dir)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                write(temp_file)
+            os.replace(temp_path, os.path.join(model_dir, file_name))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def metadata(self, name):
+        """Return the metadata of a stored model, or None."""
+        path = os.path.join(self._model_dir(name), METADATA_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as metadata_file:
+            return json.load(metadata_file)
+
+    def load(self, name):
+        """
+        Load a stored model.
+
+        Returns:
+        - (model, metadata), or (None, None) if the model is not registered.
+        """
+        for _ in range(3):
+            metadata = self.metadata(name)
+            if metadata is None:
+                return None, None
+            try:
+                return joblib.load(os.path.join(self._model_dir(name), metadata['model_file'])), metadata
+            except FileNotFoundError:
+                # A newer version was published and the file removed between the two reads
+                continue
+        raise FileNotFoundError(f"Model '{name}' keeps changing while being loaded.")
+
+    def save(self, name, model, features, fingerprint, metrics=None, params=None):
+        """
+        Store a fitted model with its features, data fingerprint, metrics and parameters.
+
+        Safe with concurrent writers: versions are allocated under a lock file, the model and the
+        metadata are written to unique temporary files and moved into place, and only versions
+        older than the one published are removed.
+        """
+        model_dir = self._model_dir(name)
+        os.makedirs(model_dir, exist_ok=True)
+        with self._lock(name):
+            previous = self.metadata(name)
+            version = previous['version'] + 1 if previous else 1
+            model_file = f'model-{version:04d}.joblib'
+            metadata = self._metadata(name, version, model_file, model, features, fingerprint, metrics, params)
+            self._publish(model_dir, model_file, lambda temp_file: joblib.dump(model, temp_file))
+            # The metadata is replaced last, so readers never see a half-written model
+            self._publish(model_dir, METADATA_FILE,
+                          lambda temp_file: temp_file.write(json.dumps(metadata, indent=2).encode('utf-8')))
+
+            for entry in os.listdir(model_dir):
+                match = MODEL_FILE_PATTERN.match(entry)
+                if match and int(match.group(1)) < version:
+                    os.remove(os.path.join(model_dir, entry))
+        return metadata
+
+    @staticmethod
+    def _metadata(name, version, model_file, model, features, fingerprint, metrics, params):
+        return {
+            'name': name,
+            'version': version,
+            'model_file': model_file,
+            'model_class': type(model).__name__,
+            'features': list(features),
+            'params': params or {},
+            'metrics': metrics or {},
+            'fingerprint': fingerprint,
+            'trained_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+
+    def get_or_train(self, name, data, features, train, params=None):
+        """
+        Return the stored model if it is still valid for the data, training it otherwise.
+
+        Parameters:
+        - name: Model name.
+        - data: Training data (DataFrame with `features`, or an array in that column order).
+        - features: Feature columns.
+        - train: Callable returning `(model, metrics)`; only called when (re)training.
+        - params: Training parameters; a stored model trained with other parameters is retrained.
+
+        Returns:
+        - (model, metadata)
+        """
+        fingerprint = data_fingerprint(data, features)
+        model, metadata = self.load(name)
+        if model is not None:
+            drift = fingerprint_drift(metadata['fingerprint'], fingerprint)
+            if metadata['params'] == (params or {}) and metadata['features'] == list(features) \
+                    and drift <= self.drift_threshold:
+                print(f"Loaded model '{name}' v{metadata['version']} from the registry (drift {drift:.4f}).")
+                return model, metadata
+            print(f"Retraining model '{name}' (drift {drift:.4f}, threshold {self.drift_threshold}).")
+
+        model, metrics = train()
+        metadata = self.save(name, model, features, fingerprint, metrics, params)
+        print(f"Registered model '{name}' v{metadata['version']}.")
+        return model, metadata
@@ -2,7 +2,11 @@ import numpy as np
 import pandas as pd
 
 class EngagementExperienceScores:
-    def __init__(self, user_data, engagement_clusters, experience_clusters):
+    # Feature columns compared with the first centroid coordinates, in this order
+    ENGAGEMENT_COLUMNS = ['Total DL (Bytes)', 'Total UL (Bytes)', 'Dur. (ms)']
+    EXPERIENCE_COLUMNS = ['Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)']
+
+    def __init__(self, user_data, engagement_clusters, experience_clusters, data_version=None):
         """
         Initialize the EngagementExperienceScores class with user data, engagement, and experience clusters.
         
@@ -10,10 +14,14 @@ class EngagementExperienceScores:
         - user_data: DataFrame containing user data for analysis.
         - engagement_clusters: Clustering model for user engagement.
         - experience_clusters: Clustering model for user experience.
+        - data_version: Optional version of user_data; scores are memoized per frame and version.
         """
         self.user_data = user_data
         self.engagement_clusters = engagement_clusters
         self.experience_clusters = experience_clusters
+        self.data_version = data_version
+        # (data key, scoring parameters, engagement scores, experience scores) of the last computation
+        self._scores = None
         
         # Get cluster centroids (make sure they match the feature dimensions)
         self.least_engaged_centroid = self._find_cluster_centroid(self.engagement_clusters, cluster_label=0)
@@ -65,7 +73,7 @@ class EngagementExperienceScores:
         - Euclidean distance (engagement score).
         """
         # Ensure the features match the centroid's length
-        required_columns = ['Total DL (Bytes)', 'Total UL (Bytes)', 'Dur. (ms)']
+        required_columns = self.ENGAGEMENT_COLUMNS
         valid_features = self._validate_columns(user_features, required_columns)
         
         # Ensure that the number of columns matches the centroid
@@ -83,30 +91,112 @@ class EngagementExperienceScores:
         Returns:
         - Euclidean distance (experience score).
         """
-        required_columns = ['Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)']
+        required_columns = self.EXPERIENCE_COLUMNS
         valid_features = self._validate_columns(user_features, required_columns)
         
         # Ensure that the number of columns matches the centroid
         valid_features = valid_features[required_columns].values  # Convert to numpy array
         return np.linalg.norm(valid_features - self.worst_experience_centroid[:len(valid_features)])
 
-    def assign_scores_to_users(self):
+    def _data_key(self):
+        """Identity of the scored frame: the object, its row count and the caller's data version."""
+        return (id(self.user_data), len(self.user_data), self.data_version)
+
+    def invalidate_scores(self, data_version=None):
+        """
+        Drop the memoized scores so the next call recomputes them, e.g. after user_data was
+        modified in place. Optionally record the new data version.
+        """
+        self._scores = None
+        if data_version is not None:
+            self.data_version = data_version
+
+    def _distances_to_centroid(self, required_columns, centroid, dtype=np.float64, chunk_size=1_000_000):
+        """
+        Euclidean distance of every user to a centroid, computed as one matrix operation per chunk.
+
+        Gives the same values as the per-row methods: features are compared with the first
+        len(required_columns) centroid coordinates and missing columns yield NaN.
+
+        Parameters:
+        - required_columns: Feature columns, in centroid order.
+        - centroid: Cluster centroid.
+        - dtype: Computation dtype (float32 halves memory at the cost of exactness).
+        - chunk_size: Number of users processed at once, bounding temporary memory.
+
+        Returns:
+        - Numpy array of distances, one per user.
+        """
+        missing_columns = [col for col in required_columns if col not in self.user_data.columns]
+        if missing_columns:
+            print(f"Warning: Missing columns - {missing_columns}")
+        present = [col for col in required_columns if col not in missing_columns]
+        positions = [required_columns.index(col) for col in present]
+        centroid = np.asarray(centroid[:len(required_columns)], dtype=dtype)
+
+        n = len(self.user_data)
+        distances = np.full(n, np.nan, dtype=dtype)
+        if missing_columns:
+            # A missing feature makes every distance NaN, as in the per-row computation
+            return distances
+        features = self.user_data[present]
+        for start in range(0, n, chunk_size):
+            block = np.array(features.iloc[start:start + chunk_size], dtype=dtype, order='C')
+            block -= centroid[positions]
+            # A stacked (1 x k) @ (k x 1) product accumulates like np.linalg.norm on each row,
+            # so the scores are bit-identical to the per-row path
+            squared = np.matmul(block[:, np.newaxis, :], block[:, :, np.newaxis])
+            distances[start:start + chunk_size] = np.sqrt(squared.ravel())
+        return distances
+
+    def assign_scores_to_users(self, vectorized=True, dtype=np.float64, chunk_size=1_000_000):
         """
         Assign engagement and experience scores to each user in the dataset.
-        
+
+        Scores are computed once per frame (see `_data_key`) and scoring parameters; later calls
+        only write the memoized columns back. Call `invalidate_scores` after changing user_data
+        in place.
+
+        Parameters:
+        - vectorized: Score all users with matrix operations instead of row by row.
+        - dtype: Computation dtype of the vectorized path.
+        - chunk_size: Number of users scored at once by the vectorized path.
+
         Returns:
         - DataFrame with user engagement and experience scores.
         """
+        params = (vectorized, np.dtype(dtype))
+        memo = self._scores
+        if memo is None or memo[0] != self._data_key() or memo[1] != params:
+            engagement_scores, experience_scores = self._compute_scores(vectorized, dtype, chunk_size)
+            self._scores = memo = (self._data_key(), params, engagement_scores, experience_scores)
+
+        # Copies, so edits of the returned frame cannot alter the memoized scores
+        self.user_data['engagement_score'] = memo[2].copy()
+        self.user_data['experience_score'] = memo[3].copy()
+        return self.user_data
+
+    def _compute_scores(self, vectorized, dtype, chunk_size):
+        """Return the engagement and experience scores of every user as arrays."""
+        if vectorized:
+            engagement_scores = self._distances_to_centroid(
+                self.ENGAGEMENT_COLUMNS, self.least_engaged_centroid, dtype, chunk_size
+            )
+            experience_scores = self._distances_to_centroid(
+                self.EXPERIENCE_COLUMNS, self.worst_experience_centroid, dtype, chunk_size
+            )
+            return engagement_scores, experience_scores
+
         # Select relevant columns for engagement and experience features
         engagement_features = self.user_data[['Dur. (ms)', 'Total DL (Bytes)', 'Total UL (Bytes)']]
-        experience_features = self.user_data[['Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)']]
+        experience_features = self.user_data[self.EXPERIENCE_COLUMNS]
         
         # Calculate scores for each user based on engagement and experience features
-        self.user_data['engagement_score'] = engagement_features.apply(
+        engagement_scores = engagement_features.apply(
             lambda x: self.calculate_engagement_score(x), axis=1
         )
-        self.user_data['experience_score'] = experience_features.apply(
+        experience_scores = experience_features.apply(
             lambda x: self.calculate_experience_score(x), axis=1
         )
         
-        return self.user_data
+        return engagement_scores.to_numpy(), experience_scores.to_numpy()
@@ -2,7 +2,6 @@ import os
 import sys
 import pandas as pd
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
 
 # Add necessary paths for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -11,11 +10,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../databases'))
 # Import modules
 from cleaning.data_cleaning import DataCleaner
 from data_loader.teleco_data_loader import TelecoDataLoader
+from data_loader.snapshot_cache import SnapshotCache
 from connections.database_connector import DatabaseConnection
+from connections.bulk_copy_writer import BulkCopyWriter
 from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
 from engagement_analysis.user_engagement_analysis import UserEngagementAnalysis
+from aggregation.customer_aggregation_engine import CustomerAggregationEngine
+from aggregation.sql_pushdown import get_sql_backend
+from registry.model_registry import ModelRegistry
 from experience_analytics.experience_clustering import ExperienceClustering
-from satisfaction_analysis.engagement_experience_scores import EngagementExperienceScores
 from satisfaction_analysis.top_satifactions_analysis import TopSatisfactionAnalysis
 from satisfaction_analysis.satisfaction_score_predictor import SatisfactionScorePredictor
 from satisfaction_analysis.satisfaction_kmeans import SatisfactionKMeans
@@ -26,13 +29,24 @@ class FinalDataExporter:
     def __init__(self, db_connection):
         self.db_connection = db_connection
 
-    def export_to_mysql(self, df, table_name):
-        df.to_sql(name=table_name, con=self.db_connection.engine, if_exists='replace', index=False)
-        print(f"Data exported to {table_name} in MySQL database.")
+    def export_to_mysql(self, df, table_name, mode='swap', key_columns=None, batch_size=100_000):
+        """
+        Export a DataFrame with COPY through a staging table, then swap it in ('swap', replacing
+        the table) or upsert it into the table on key_columns ('upsert').
+
+        Returns:
+        - Dict with the write statistics (rows, batches, seconds, rows_per_second, mode).
+        """
+        with self.db_connection.connection() as connection:
+            writer = BulkCopyWriter(connection, batch_size=batch_size, mode=mode, key_columns=key_columns)
+            stats = writer.write(df, table_name)
+        print(f"Data exported to {table_name} in PostgreSQL database.")
+        return stats
 
     def verify_export(self, table_name, limit=10):
         query = f"SELECT * FROM {table_name} LIMIT {limit};"
-        result = self.db_connection.execute_query(query)
+        with self.db_connection.connection() as connection:
+            result = pd.read_sql_query(query, connection)
         if not result.empty:
             print(f"Data successfully inserted into {table_name}. Sample records:")
             print(result)
@@ -53,28 +67,37 @@ def main():
     )
     db_connection.connect()
 
-    # Load and clean data
+    # Load and clean data, reusing the cleaned snapshot when the source table is unchanged
     data_loader = TelecoDataLoader(db_connection)
-    raw_df = data_loader.load_data("xdr_data")
 
-    data_cleaner = DataCleaner(raw_df)
-    data_cleaner.clean_data()
-    data_cleaner.convert_units_to_mb()
-    data_cleaner.handle_missing_and_outliers()
-    cleaned_df = data_cleaner.df
+    def build_cleaned_data():
+        data_cleaner = DataCleaner(data_loader.load_data("xdr_data"))
+        data_cleaner.clean_data()
+        data_cleaner.convert_units_to_mb()
+        data_cleaner.handle_missing_and_outliers()
+        return data_cleaner.df
+
+    cleaned_df = SnapshotCache().get_or_build(data_loader.fetch_fingerprint("xdr_data"), build_cleaned_data)
+
+    # Fitted scalers and models are reused from disk until the data drifts
+    registry = ModelRegistry()
 
-    # Engagement Analysis
-    user_engagement = UserEngagementAnalysis(cleaned_df)
+    # Engagement Analysis, sharing one per-MSISDN aggregation pass
+    aggregation_engine = CustomerAggregationEngine(cleaned_df)
+    customer_aggs, _ = TelecomEngagementAnalysis.named_aggregations()
+    aggregation_engine.request(UserEngagementAnalysis.AGGREGATIONS).request(customer_aggs).compute()
+    # With AGGREGATION_PUSHDOWN set, the per-user engagement metrics are aggregated in the database
+    user_engagement = UserEngagementAnalysis(cleaned_df, aggregation_engine, get_sql_backend(db_connection))
     engagement_metrics = user_engagement.aggregate_user_metrics()
     normalized_engagement_metrics = user_engagement.normalize_metrics(engagement_metrics)
 
-    telecom_engagement_analysis = TelecomEngagementAnalysis(cleaned_df)
+    telecom_engagement_analysis = TelecomEngagementAnalysis(cleaned_df, aggregation_engine, registry)
     telecom_engagement_analysis.aggregate_metrics_by_customer()
     telecom_engagement_analysis.normalize_metrics()
     engagement_data_with_clusters = telecom_engagement_analysis.k_means_clustering()
 
     # Experience Analysis
-    experience_clustering = ExperienceClustering(df=cleaned_df)
+    experience_clustering = ExperienceClustering(df=cleaned_df, registry=registry)
     experience_clustering.run()
     experience_data = experience_clustering.df[['MSISDN/Number', 'Cluster']]
 
@@ -86,31 +109,27 @@ def main():
     engagement_clusters = telecom_engagement_analysis.kmeans  # Assuming this is the clustering model
     experience_clusters = experience_clustering.kmeans  # Assuming this is the clustering model
 
-    satisfaction_analysis = EngagementExperienceScores(
+    # The users are scored once; the top-N query and the plots reuse the memoized scores
+    top_satisfaction_analysis = TopSatisfactionAnalysis(
         user_data=user_df,
         engagement_clusters=engagement_clusters,
         experience_clusters=experience_clusters
     )
-    user_scores_df = satisfaction_analysis.assign_scores_to_users()
+    user_scores_df = top_satisfaction_analysis.calculate_satisfaction_score()
 
     # Top Satisfaction Analysis
-    top_satisfaction_analysis = TopSatisfactionAnalysis(
-        user_data=user_df,
-        engagement_clusters=engagement_clusters,
-        experience_clusters=experience_clusters
-    )
     top_satisfied_customers = top_satisfaction_analysis.top_n_satisfied_customers(n=10)
     print(top_satisfied_customers)
-    top_satisfaction_analysis.visualize_top_satisfaction(user_df)
+    top_satisfaction_analysis.visualize_top_satisfaction()
 
     # Satisfaction Score Prediction
-    satisfaction_predictor = SatisfactionScorePredictor(user_data=user_scores_df)
+    satisfaction_predictor = SatisfactionScorePredictor(user_data=user_scores_df, registry=registry)
     satisfaction_predictor.build_regression_model()
     predicted_satisfaction = satisfaction_predictor.predict_satisfaction(engagement_score=50, experience_score=45)
     print(f"Predicted Satisfaction Score: {predicted_satisfaction:.2f}")
 
     # Satisfaction KMeans Clustering
-    kmeans_analysis = SatisfactionKMeans(data=user_scores_df)
+    kmeans_analysis = SatisfactionKMeans(data=user_scores_df, registry=registry)
     kmeans_analysis.preprocess_data()
     clustered_data = kmeans_analysis.run_kmeans(k=2)
     kmeans_analysis.visualize_clusters()
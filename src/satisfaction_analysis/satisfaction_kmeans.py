@@ -2,17 +2,21 @@ import pandas as pd
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import matplotlib.pyplot as plt
-import seaborn as sns
+from visualization.plot_backend import get_plot_backend
 
 class SatisfactionKMeans:
-    def __init__(self, data):
+    FEATURES = ['engagement_score', 'experience_score']
+
+    def __init__(self, data, registry=None):
         """
         Initialize the SatisfactionKMeans class with user data.
         
         Parameters:
         - data: DataFrame containing user data with engagement and experience scores.
+        - registry: Optional ModelRegistry reusing the fitted scaler and KMeans until the data drifts.
         """
         self.data = data
+        self.registry = registry
         self.scaled_data = None
         self.kmeans = None
         self.clustered_data = None
@@ -22,14 +26,20 @@ class SatisfactionKMeans:
         Preprocess the data by scaling the engagement and experience scores.
         """
         # Select engagement and experience scores for clustering
-        features = ['engagement_score', 'experience_score']
+        features = self.FEATURES
         
         # Extract features for scaling
         X = self.data[features].values
         
         # Standardize features
-        scaler = StandardScaler()
-        self.scaled_data = scaler.fit_transform(X)
+        if self.registry is not None:
+            scaler, _ = self.registry.get_or_train(
+                'satisfaction_scaler', self.data, features, lambda: (StandardScaler().fit(X), {})
+            )
+            self.scaled_data = scaler.transform(X)
+        else:
+            scaler = StandardScaler()
+            self.scaled_data = scaler.fit_transform(X)
     
     def run_kmeans(self, k=2):
         """
@@ -41,34 +51,50 @@ class SatisfactionKMeans:
         Returns:
         - DataFrame with assigned cluster labels.
         """
-        # Initialize KMeans
-        self.kmeans = KMeans(n_clusters=k, random_state=42)
-        
-        # Fit KMeans model
-        self.data['cluster'] = self.kmeans.fit_predict(self.scaled_data)
+        if self.registry is not None:
+            def train():
+                kmeans = KMeans(n_clusters=k, random_state=42).fit(self.scaled_data)
+                return kmeans, {'inertia': float(kmeans.inertia_)}
+
+            self.kmeans, _ = self.registry.get_or_train(
+                'satisfaction_kmeans', self.data, self.FEATURES, train, params={'n_clusters': k}
+            )
+            self.data['cluster'] = self.kmeans.predict(self.scaled_data)
+        else:
+            # Initialize KMeans
+            self.kmeans = KMeans(n_clusters=k, random_state=42)
+
+            # Fit KMeans model
+            self.data['cluster'] = self.kmeans.fit_predict(self.scaled_data)
         
         # Return the DataFrame with cluster labels
         self.clustered_data = self.data.copy()
         return self.clustered_data
     
-    def visualize_clusters(self):
+    def visualize_clusters(self, backend=None, data_version=None):
         """
-        Visualize the clusters using a scatter plot.
+        Visualize the clusters using a scatter plot of at most PlotBackend.max_points users.
+        Pass a data_version to reuse the rendered figure (see PlotBackend.figure).
         """
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(
-            data=self.clustered_data,
-            x='engagement_score',
-            y='experience_score',
-            hue='cluster',
-            palette='viridis',
-            marker='o',
-            edgecolor='w',
-            s=100
-        )
-        plt.title('K-Means Clustering of Engagement and Experience Scores')
-        plt.xlabel('Engagement Score')
-        plt.ylabel('Experience Score')
-        plt.legend(title='Cluster')
-        plt.grid(True)
+        backend = backend or get_plot_backend()
+
+        def draw(fig):
+            ax = fig.add_subplot()
+            backend.scatter(
+                ax,
+                self.clustered_data['engagement_score'],
+                self.clustered_data['experience_score'],
+                hue=self.clustered_data['cluster'],
+                marker='o',
+                edgecolor='w',
+                s=100
+            )
+            ax.set_title('K-Means Clustering of Engagement and Experience Scores')
+            ax.set_xlabel('Engagement Score')
+            ax.set_ylabel('Experience Score')
+            ax.legend(title='Cluster')
+            ax.grid(True)
+
+        fig = backend.figure('satisfaction_clusters', data_version, draw)
         plt.show()
+        return fig
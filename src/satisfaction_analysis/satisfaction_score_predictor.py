@@ -1,3 +1,5 @@
+import threading
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
@@ -6,15 +8,22 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 class SatisfactionScorePredictor:
-    def __init__(self, user_data):
+    FEATURES = ['engagement_score', 'experience_score']
+
+    def __init__(self, user_data, registry=None):
         """
         Initialize the SatisfactionScorePredictor class.
         
         Parameters:
         - user_data: DataFrame containing user data with engagement, experience, and satisfaction scores.
+        - registry: Optional ModelRegistry reusing the trained regression until the data drifts.
         """
         self.user_data = user_data
+        self.registry = registry
         self.model = None
+        # (model, coefficients, intercept) snapshot used by the fast prediction paths
+        self._linear_terms = None
+        self._linear_terms_lock = threading.Lock()
 
     def prepare_data(self):
         """
@@ -39,22 +48,35 @@ class SatisfactionScorePredictor:
         Returns:
         - The trained model.
         """
+        if self.registry is not None:
+            features = ['engagement_score', 'experience_score', 'satisfaction_score']
+            self.model, metadata = self.registry.get_or_train(
+                'satisfaction_regression', self.user_data, features, self._train
+            )
+            metrics = metadata['metrics']
+            print(f"Model Evaluation:\nMean Squared Error: {metrics['mse']:.4f}\nR-squared: {metrics['r2']:.4f}")
+            return self.model
+
+        self.model, metrics = self._train()
+        print(f"Model Evaluation:\nMean Squared Error: {metrics['mse']:.4f}\nR-squared: {metrics['r2']:.4f}")
+        return self.model
+
+    def _train(self):
+        """Train the regression on a train split and evaluate it on the test split."""
         # Prepare the data
         X_train, X_test, y_train, y_test = self.prepare_data()
         
         # Instantiate and train the linear regression model
-        self.model = LinearRegression()
-        self.model.fit(X_train, y_train)
+        model = LinearRegression()
+        model.fit(X_train, y_train)
         
         # Make predictions on the test set
-        y_pred = self.model.predict(X_test)
+        y_pred = model.predict(X_test)
         
         # Evaluate the model
         mse = mean_squared_error(y_test, y_pred)
         r2 = r2_score(y_test, y_pred)
-        
-        print(f"Model Evaluation:\nMean Squared Error: {mse:.4f}\nR-squared: {r2:.4f}")
-        return self.model
+        return model, {'mse': float(mse), 'r2': float(r2)}
 
     def predict_satisfaction(self, engagement_score, experience_score):
         """
@@ -77,6 +99,63 @@ class SatisfactionScorePredictor:
         # Predict the satisfaction score
         predicted_score = self.model.predict(input_data)
         return predicted_score[0]
+
+    def _linear_model(self):
+        """
+        Return the coefficients (as an array), the intercept and the coefficients as plain floats,
+        refreshed when the fitted model changes.
+
+        The snapshot is an immutable tuple swapped in under a lock, so concurrent readers always
+        see coefficients and intercept from the same model.
+        """
+        terms = self._linear_terms
+        if terms is None or terms[0] is not self.model:
+            if self.model is None:
+                raise Exception("The model is not trained. Call `build_regression_model` first.")
+            with self._linear_terms_lock:
+                model = self.model
+                coefficients = np.asarray(model.coef_, dtype=np.float64).ravel()
+                terms = (model, coefficients, float(model.intercept_), tuple(coefficients.tolist()))
+                self._linear_terms = terms
+        return terms[1], terms[2], terms[3]
+
+    def predict_batch(self, engagement_scores, experience_scores=None, chunk_size=None):
+        """
+        Predict satisfaction scores for many customers with one dot product.
+
+        Parameters:
+        - engagement_scores: DataFrame with engagement_score/experience_score columns, an (n, 2)
+          array, or a 1-D array of engagement scores (with `experience_scores`).
+        - experience_scores: 1-D array of experience scores when the first argument is 1-D.
+        - chunk_size: Optional number of rows per product, bounding temporary memory.
+
+        Returns:
+        - Numpy array of predicted satisfaction scores.
+        """
+        coefficients, intercept, _ = self._linear_model()
+        if isinstance(engagement_scores, pd.DataFrame):
+            X = engagement_scores[self.FEATURES].to_numpy(dtype=np.float64)
+        elif experience_scores is not None:
+            X = np.column_stack([np.asarray(engagement_scores, dtype=np.float64),
+                                 np.asarray(experience_scores, dtype=np.float64)])
+        else:
+            X = np.asarray(engagement_scores, dtype=np.float64)
+
+        if chunk_size is None:
+            return X @ coefficients + intercept
+        predictions = np.empty(len(X))
+        for start in range(0, len(X), chunk_size):
+            predictions[start:start + chunk_size] = X[start:start + chunk_size] @ coefficients + intercept
+        return predictions
+
+    def predict_one(self, engagement_score, experience_score):
+        """
+        Predict the satisfaction score of a single customer with plain float arithmetic.
+        Safe to call from several threads; the latency is in the microsecond range.
+        """
+        _, intercept, (engagement_weight, experience_weight) = self._linear_model()
+        return engagement_score * engagement_weight + experience_score * experience_weight + intercept
+
     def visualize_results(self, X_test, y_test):
         """
         Visualizes the results of the regression model, comparing actual vs predicted satisfaction scores
@@ -1,11 +1,12 @@
 
 
 from satisfaction_analysis.engagement_experience_scores import EngagementExperienceScores
+from aggregation.top_k import top_k
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 class TopSatisfactionAnalysis(EngagementExperienceScores):
-    def __init__(self, user_data, engagement_clusters, experience_clusters):
+    def __init__(self, user_data, engagement_clusters, experience_clusters, data_version=None):
         """
         Initialize the SatisfactionAnalysis class by extending EngagementExperienceScores.
         
@@ -13,12 +14,16 @@ class TopSatisfactionAnalysis(EngagementExperienceScores):
         - user_data: DataFrame containing user data for analysis.
         - engagement_clusters: Clustering model for user engagement.
         - experience_clusters: Clustering model for user experience.
+        - data_version: Optional version of user_data; scores are memoized per frame and version.
         """
-        super().__init__(user_data, engagement_clusters, experience_clusters)
+        super().__init__(user_data, engagement_clusters, experience_clusters, data_version)
+        # (engagement/experience memo it was derived from, satisfaction scores)
+        self._satisfaction = None
 
     def calculate_satisfaction_score(self):
         """
         Calculate the satisfaction score as the average of engagement and experience scores for each user.
+        Memoized together with the engagement and experience scores (see `invalidate_scores`).
         
         Returns:
         - DataFrame with an additional column 'satisfaction_score'.
@@ -27,7 +32,10 @@ class TopSatisfactionAnalysis(EngagementExperienceScores):
         self.user_data = self.assign_scores_to_users()
         
         # Calculate satisfaction score as the mean of engagement and experience scores
-        self.user_data['satisfaction_score'] = self.user_data[['engagement_score', 'experience_score']].mean(axis=1)
+        if self._satisfaction is None or self._satisfaction[0] is not self._scores:
+            satisfaction = self.user_data[['engagement_score', 'experience_score']].mean(axis=1).to_numpy()
+            self._satisfaction = (self._scores, satisfaction)
+        self.user_data['satisfaction_score'] = self._satisfaction[1].copy()
         
         return self.user_data
 
@@ -44,8 +52,8 @@ class TopSatisfactionAnalysis(EngagementExperienceScores):
         # Calculate satisfaction scores
         satisfied_customers = self.calculate_satisfaction_score()
         
-        # Sort users by satisfaction score in descending order
-        top_customers = satisfied_customers.sort_values(by='satisfaction_score', ascending=False).head(n)
+        # Select the n most satisfied users, in descending order of satisfaction score
+        top_customers = top_k(satisfied_customers, 'satisfaction_score', n)
         
         return top_customers[['MSISDN/Number', 'satisfaction_score']]
     def satisfied_customers(self):
@@ -64,15 +72,19 @@ class TopSatisfactionAnalysis(EngagementExperienceScores):
    
         return satisfied_customers[['MSISDN/Number', 'satisfaction_score']]
 
-    def visualize_top_satisfaction(self, user_scores_df):
+    def visualize_top_satisfaction(self, user_scores_df=None):
         """
         Visualize the satisfaction scores and top satisfied customers.
 
         Parameters:
-        - user_scores_df: DataFrame containing user engagement, experience, and satisfaction scores.
+        - user_scores_df: DataFrame containing user engagement, experience, and satisfaction scores
+          (defaults to the analysed user data, reusing its memoized scores).
         """
         # Calculate the satisfaction score
-        user_scores_df['satisfaction_score'] = (user_scores_df['engagement_score'] + user_scores_df['experience_score']) / 2
+        if user_scores_df is None or user_scores_df is self.user_data:
+            user_scores_df = self.calculate_satisfaction_score()
+        else:
+            user_scores_df['satisfaction_score'] = (user_scores_df['engagement_score'] + user_scores_df['experience_score']) / 2
         
         # 1. Distribution of satisfaction scores
         plt.figure(figsize=(10, 6))
@@ -0,0 +1,392 @@
+"""
+Customer satisfaction scoring service.
+
+Loads the registered engagement/experience KMeans models and the satisfaction regression once,
+scores every customer of a session snapshot up front and serves the scores over a small
+asyncio HTTP/1.1 endpoint:
+
+    GET  /score/<msisdn>   scores of one customer
+    POST /score            {"msisdns": [...]} and/or {"features": [{column: value, ...}, ...]}
+    GET  /stats            request count, p50/p99 latency and throughput
+    GET  /health           model versions and number of customers
+
+Usage:
+    python src/serving/scoring_service.py --snapshot sessions.parquet --port 8080
+    python src/serving/scoring_service.py --port 8080    # cleaned xdr_data from the database
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+
+# Add necessary paths for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../databases'))
+
+from aggregation.customer_aggregation_engine import CustomerAggregationEngine
+from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
+from registry.model_registry import ModelRegistry
+from satisfaction_analysis.engagement_experience_scores import EngagementExperienceScores
+from satisfaction_analysis.satisfaction_score_predictor import SatisfactionScorePredictor
+
+SCORE_COLUMNS = ['engagement_score', 'experience_score', 'satisfaction_score', 'predicted_satisfaction']
+SCORING_MODELS = ('engagement_kmeans', 'experience_kmeans', 'satisfaction_regression')
+MAX_BODY_BYTES = 64 * 1024 * 1024
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def customer_features_from_sessions(df):
+    """Per-MSISDN engagement metrics of a cleaned session frame, as used by the satisfaction pipeline."""
+    engine = CustomerAggregationEngine(df)
+    return TelecomEngagementAnalysis(df, engine).aggregate_metrics_by_customer()
+
+
+def load_session_snapshot(path):
+    """Read a cleaned session snapshot from a parquet, Arrow/feather or CSV file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    if extension in ('.arrow', '.feather'):
+        return pd.read_feather(path)
+    if extension == '.csv':
+        return pd.read_csv(path)
+    raise ValueError(f"Unsupported snapshot format '{extension}', expected .parquet, .arrow, .feather or .csv.")
+
+
+def load_cleaned_sessions(data_loader, table='xdr_data', snapshot_cache=None):
+    """
+    Load the cleaned session frame through a data loader (or any stand-in exposing `load_data`
+    and `fetch_fingerprint`), reusing the cleaned snapshot when a SnapshotCache is given.
+    """
+    from cleaning.data_cleaning import DataCleaner
+
+    def build_cleaned_data():
+        data_cleaner = DataCleaner(data_loader.load_data(table))
+        data_cleaner.clean_data()
+        data_cleaner.convert_units_to_mb()
+        data_cleaner.handle_missing_and_outliers()
+        return data_cleaner.df
+
+    if snapshot_cache is None:
+        return build_cleaned_data()
+    return snapshot_cache.get_or_build(data_loader.fetch_fingerprint(table), build_cleaned_data)
+
+
+def _json_value(value):
+    """Plain float for JSON, with NaN mapped to null."""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class SatisfactionScorer:
+    def __init__(self, customer_features, engagement_clusters, experience_clusters, regression, model_versions=None):
+        """
+        Score customers with the models of the satisfaction pipeline.
+
+        The scores of every customer in `customer_features` are computed once, with the vectorized
+        EngagementExperienceScores path, so a lookup by MSISDN is an index probe. Feature rows of
+        customers outside the snapshot are scored on demand with `score_features`.
+
+        Parameters:
+        - customer_features: Per-MSISDN engagement metrics (see `customer_features_from_sessions`).
+        - engagement_clusters, experience_clusters: Fitted KMeans models (least engaged / worst
+          experience centroid is cluster 0).
+        - regression: Fitted satisfaction regression (SatisfactionScorePredictor model).
+        - model_versions: Optional name -> registry version, reported by the service.
+        """
+        self.engagement_clusters = engagement_clusters
+        self.experience_clusters = experience_clusters
+        self.predictor = SatisfactionScorePredictor(None)
+        self.predictor.model = regression
+        self.model_versions = model_versions or {}
+
+        scores = self.score_features(customer_features)
+        self.msisdns = pd.Index(customer_features['MSISDN/Number'].to_numpy(dtype=np.float64))
+        self.scores = scores[SCORE_COLUMNS].to_numpy(dtype=np.float64)
+
+    @classmethod
+    def from_registry(cls, customer_features, registry=None):
+        """
+        Build a scorer from the models stored in a ModelRegistry.
+
+        Raises:
+        - ValueError if one of the models has not been registered yet.
+        """
+        registry = registry or ModelRegistry()
+        models, versions = {}, {}
+        for name in SCORING_MODELS:
+            model, metadata = registry.load(name)
+            if model is None:
+                raise ValueError(f"Model '{name}' is not registered in {registry.registry_dir}; "
+                                 f"run the satisfaction pipeline (final_data_exporter) first.")
+            models[name] = model
+            versions[name] = metadata['version']
+        return cls(customer_features, models['engagement_kmeans'], models['experience_kmeans'],
+                   models['satisfaction_regression'], versions)
+
+    def score_features(self, features):
+        """
+        Score rows of raw customer metrics.
+
+        Parameters:
+        - features: DataFrame with the engagement and experience metric columns.
+
+        Returns:
+        - DataFrame with the engagement, experience, satisfaction and predicted satisfaction scores.
+        """
+        scores = EngagementExperienceScores(
+            features.copy(), self.engagement_clusters, self.experience_clusters
+        ).assign_scores_to_users()
+        scores['satisfaction_score'] = scores[['engagement_score', 'experience_score']].mean(axis=1)
+        scores['predicted_satisfaction'] = self.predictor.predict_batch(scores)
+        return scores
+
+    def lookup(self, msisdns):
+        """
+        Return the score rows of the given MSISDNs (n x 4 array) and a mask of the known ones.
+        """
+        positions = self.msisdns.get_indexer(np.asarray(msisdns, dtype=np.float64))
+        found = positions >= 0
+        if not found.any():
+            return np.full((len(positions), len(SCORE_COLUMNS)), np.nan), found
+        return self.scores[np.where(found, positions, 0)], found
+
+    def score_msisdns(self, msisdns):
+        """
+        Score customers by MSISDN (numbers or numeric strings, echoed as given in the records).
+
+        Returns:
+        - (list of score records of the known customers, list of unknown MSISDNs)
+        """
+        rows, found = self.lookup([float(msisdn) for msisdn in msisdns])
+        results, missing = [], []
+        for msisdn, row, known in zip(msisdns, rows.tolist(), found.tolist()):
+            if known:
+                results.append(self._record(msisdn, row))
+            else:
+                missing.append(msisdn)
+        return results, missing
+
+    def score_one(self, msisdn):
+        """Score record of one customer, or None if the MSISDN is unknown."""
+        results, _ = self.score_msisdns([msisdn])
+        return results[0] if results else None
+
+    @staticmethod
+    def _record(msisdn, row):
+        record = {'msisdn': msisdn}
+        for column, value in zip(SCORE_COLUMNS, row):
+            record[column] = _json_value(value)
+        return record
+
+
+class SatisfactionScoringService:
+    def __init__(self, scorer, host='127.0.0.1', port=8080, latency_window=10_000, offload_rows=10_000):
+        """
+        Asyncio HTTP/1.1 front end of a SatisfactionScorer (keep-alive connections, JSON bodies).
+
+        Parameters:
+        - scorer: SatisfactionScorer.
+        - host, port: Address to listen on (port 0 picks a free port, see `self.port` after `start`).
+        - latency_window: Number of recent requests kept for the latency percentiles.
+        - offload_rows: Batches of at least this many rows are scored in a worker thread, so
+          they do not stall other connections.
+        """
+        self.scorer = scorer
+        self.host = host
+        self.port = port
+        self.offload_rows = offload_rows
+        self.latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.errors = 0
+        self.records_scored = 0
+        self.started_at = None
+        self.server = None
+
+    async def start(self):
+        """Start listening; returns the asyncio server."""
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started_at = time.perf_counter()
+        print(f"Scoring service listening on http://{self.host}:{self.port}")
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def stats(self):
+        """Request counts, latency percentiles over the recent window and throughput since start."""
+        uptime = time.perf_counter() - self.started_at if self.started_at else 0.0
+        latencies = np.asarray(self.latencies, dtype=np.float64)
+        percentile = (lambda q: float(np.percentile(latencies, q))) if len(latencies) else (lambda q: None)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'records_scored': self.records_scored,
+            'uptime_seconds': uptime,
+            'requests_per_second': self.requests / uptime if uptime else 0.0,
+            'records_per_second': self.records_scored / uptime if uptime else 0.0,
+            'latency_ms': {'p50': percentile(50), 'p99': percentile(99), 'max': percentile(100),
+                           'window': len(latencies)}
+        }
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                keep_alive = True
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    headers = await self._read_headers(reader)
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY_BYTES:
+                        status, payload, keep_alive = 413, {'error': 'Request body too large.'}, False
+                    else:
+                        body = await reader.readexactly(length) if length else b''
+                        status, payload = await self._dispatch(method, target, body)
+                        keep_alive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+                except (ValueError, asyncio.IncompleteReadError) as error:
+                    status, payload, keep_alive = 400, {'error': f'Malformed request: {error}'}, False
+
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                self.requests += 1
+                self.errors += status >= 400
+                self.latencies.append((time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_headers(reader):
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + body
+
+    async def _dispatch(self, method, target, body):
+        path = target.split('?', 1)[0].rstrip('/')
+        try:
+            if path.startswith('/score/'):
+                if method != 'GET':
+                    return 405, {'error': f'{method} not allowed on {path}.'}
+                msisdn = unquote(path[len('/score/'):])
+                record = self.scorer.score_one(msisdn)
+                if record is None:
+                    return 404, {'error': f'Unknown MSISDN {msisdn}.'}
+                self.records_scored += 1
+                return 200, record
+            if path == '/score':
+                if method != 'POST':
+                    return 405, {'error': f'{method} not allowed on {path}, use POST.'}
+                return await self._score_batch(json.loads(body or b'{}'))
+            if path == '/stats' and method == 'GET':
+                return 200, self.stats()
+            if path == '/health' and method == 'GET':
+                return 200, {'status': 'ok', 'customers': len(self.scorer.msisdns),
+                             'models': self.scorer.model_versions}
+            return 404, {'error': f'No route for {method} {path}.'}
+        except (ValueError, TypeError, KeyError) as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': str(error)}
+
+    async def _score_batch(self, request):
+        """Score {"msisdns": [...]} by lookup and {"features": [...]} rows on demand."""
+        if not isinstance(request, dict):
+            raise ValueError('Expected a JSON object with "msisdns" and/or "features".')
+        msisdns = request.get('msisdns', [])
+        features = request.get('features', [])
+
+        def score():
+            results, missing = self.scorer.score_msisdns(msisdns)
+            payload = {'results': results, 'missing': missing}
+            if features:
+                scores = self.scorer.score_features(pd.DataFrame(features))
+                payload['feature_results'] = [
+                    {column: _json_value(value) for column, value in zip(SCORE_COLUMNS, row)}
+                    for row in scores[SCORE_COLUMNS].to_numpy(dtype=np.float64).tolist()
+                ]
+            return payload
+
+        if len(msisdns) + len(features) >= self.offload_rows:
+            payload = await asyncio.get_running_loop().run_in_executor(None, score)
+        else:
+            payload = score()
+        self.records_scored += len(payload['results']) + len(payload.get('feature_results', []))
+        return 200, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--snapshot', help='Cleaned session snapshot (.parquet, .arrow, .feather or .csv); '
+                                           'defaults to the cleaned xdr_data table.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+
+    if args.snapshot:
+        sessions = load_session_snapshot(args.snapshot)
+    else:
+        from dotenv import load_dotenv
+        from connections.database_connector import DatabaseConnection
+        from data_loader.snapshot_cache import SnapshotCache
+        from data_loader.teleco_data_loader import TelecoDataLoader
+
+        load_dotenv()
+        db_connection = DatabaseConnection(
+            db_name=os.getenv('DB_NAME'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD'),
+            host=os.getenv('DB_HOST'),
+            port=os.getenv('DB_PORT')
+        )
+        db_connection.connect()
+        sessions = load_cleaned_sessions(TelecoDataLoader(db_connection), snapshot_cache=SnapshotCache())
+        db_connection.disconnect()
+
+    scorer = SatisfactionScorer.from_registry(customer_features_from_sessions(sessions))
+    del sessions
+    service = SatisfactionScoringService(scorer, args.host, args.port)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("Scoring service stopped.")
+
+
+if __name__ == "__main__":
+    main()
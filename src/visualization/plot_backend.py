@@ -0,0 +1,211 @@
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from scipy.stats import gaussian_kde
+
+SCATTER_MODES = ('auto', 'sample', 'bin')
+
+
+class ReservoirSampler:
+    def __init__(self, size, random_state=0):
+        """
+        Uniform sample of fixed size over a stream of arrays (Algorithm R, vectorized per chunk).
+
+        Parameters:
+        - size: Number of values kept.
+        - random_state: Seed.
+        """
+        self.size = size
+        self.rng = np.random.default_rng(random_state)
+        self.reservoir = None
+        self.seen = 0
+
+    def update(self, values):
+        """Offer one chunk of values (1-D) or rows (2-D)."""
+        values = np.asarray(values)
+        if self.reservoir is None:
+            self.reservoir = np.empty((0,) + values.shape[1:], dtype=values.dtype)
+        free = max(0, self.size - len(self.reservoir))
+        if free:
+            self.reservoir = np.concatenate([self.reservoir, values[:free]])
+        rest = values[free:]
+        if len(rest):
+            # Value number t (1-based) replaces a random slot with probability size / t; applying the
+            # replacements in order keeps the last write per slot, as the sequential algorithm would
+            slots = self.rng.integers(0, self.seen + free + np.arange(1, len(rest) + 1))
+            keep = slots < self.size
+            self.reservoir[slots[keep]] = rest[keep]
+        self.seen += len(values)
+        return self
+
+    def sample(self):
+        return self.reservoir if self.reservoir is not None else np.empty(0)
+
+
+def reservoir_sample(values, size, random_state=0, chunk_size=1_000_000):
+    """Uniform sample of at most `size` values of an array, read chunk by chunk."""
+    values = np.asarray(values)
+    if len(values) <= size:
+        return values
+    sampler = ReservoirSampler(size, random_state)
+    for start in range(0, len(values), chunk_size):
+        sampler.update(values[start:start + chunk_size])
+    return sampler.sample()
+
+
+def binned_histogram(values, bins=50):
+    """Histogram counts and bin edges of the finite values, computed with NumPy in one pass."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.zeros(0), np.zeros(1)
+    return np.histogram(values, bins=bins)
+
+
+def sample_rows(n, max_points, random_state=0):
+    """Sorted positions of a uniform sample of at most `max_points` of n rows (all rows if n is small)."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(random_state).choice(n, max_points, replace=False))
+
+
+class PlotBackend:
+    def __init__(self, bins=50, kde_sample=10_000, max_points=50_000, scatter_mode='auto',
+                 grid_size=200, max_figures=32, random_state=0):
+        """
+        Plotting helpers that keep render time flat in the number of rows.
+
+        Histograms are pre-binned with NumPy and drawn as bars; KDE curves are estimated on a
+        reservoir sample. Scatters either draw a capped random sample of the points or, for
+        point clouds without a hue, a 2-D binned density image. Rendered figures can be cached
+        by name and data version with `figure`.
+
+        Parameters:
+        - bins: Number of histogram bins.
+        - kde_sample: Number of values the KDE is estimated from.
+        - max_points: Maximum number of points drawn by a scatter.
+        - scatter_mode: 'sample', 'bin', or 'auto' (bin large hue-less scatters, sample the rest).
+        - grid_size: Bins per axis of a binned scatter, and points of a KDE curve.
+        - max_figures: Number of rendered figures kept (least recently used are closed).
+        - random_state: Seed for the samples.
+        """
+        if scatter_mode not in SCATTER_MODES:
+            raise ValueError(f"Unknown scatter mode '{scatter_mode}', expected one of {SCATTER_MODES}.")
+        self.bins = bins
+        self.kde_sample = kde_sample
+        self.max_points = max_points
+        self.scatter_mode = scatter_mode
+        self.grid_size = grid_size
+        self.max_figures = max_figures
+        self.random_state = random_state
+        self.figures = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def figure(self, name, data_version, draw, figsize=(10, 6)):
+        """
+        Return the figure rendered by `draw(fig)` for a name and data version, reusing the cached
+        one when the data has not changed. With data_version None the figure is always redrawn.
+        """
+        key = (name, data_version)
+        if data_version is not None:
+            with self.lock:
+                if key in self.figures:
+                    self.figures.move_to_end(key)
+                    self.hits += 1
+                    return self.figures[key]
+
+        fig = plt.figure(figsize=figsize)
+        draw(fig)
+        if data_version is None:
+            return fig
+        with self.lock:
+            self.misses += 1
+            self.figures[key] = fig
+            while len(self.figures) > self.max_figures:
+                _, evicted = self.figures.popitem(last=False)
+                plt.close(evicted)
+        return fig
+
+    def histogram(self, ax, values, kde=True, color='tab:blue', label=None):
+        """Draw a pre-binned histogram of the values, with a KDE curve estimated on a sample."""
+        values = np.asarray(values, dtype=np.float64)
+        counts, edges = binned_histogram(values, self.bins)
+        if len(counts) == 0:
+            return ax
+        ax.stairs(counts, edges, fill=True, alpha=0.6, color=color, label=label)
+
+        if kde:
+            finite = values[np.isfinite(values)]
+            sample = reservoir_sample(finite, self.kde_sample, self.random_state)
+            if len(sample) > 1 and np.ptp(sample) > 0:
+                grid = np.linspace(edges[0], edges[-1], self.grid_size)
+                # Scale the density to the histogram: counts = density * values * bin width
+                density = gaussian_kde(sample)(grid) * len(finite) * (edges[1] - edges[0])
+                ax.plot(grid, density, color=color)
+        ax.set_ylabel('Count')
+        return ax
+
+    def scatter(self, ax, x, y, hue=None, palette='viridis', s=20, **kwargs):
+        """
+        Draw a scatter of x against y: every point if there are few, otherwise a capped random
+        sample (or a binned density image in 'bin' mode / 'auto' mode without hue).
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+        mode = self.scatter_mode
+        if mode == 'auto':
+            mode = 'bin' if hue is None and len(x) > self.max_points else 'sample'
+
+        if mode == 'bin':
+            finite = np.isfinite(x) & np.isfinite(y)
+            counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=self.grid_size)
+            # Empty cells stay transparent; the colour scale is logarithmic so sparse cells remain visible
+            image = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap=palette,
+                                  norm='log' if counts.max() > 1 else None)
+            plt.colorbar(image, ax=ax, label='Points')
+            return ax
+
+        rows = sample_rows(len(x), self.max_points, self.random_state)
+        if hue is None:
+            ax.scatter(x[rows], y[rows], s=s, **kwargs)
+            return ax
+        hue = np.asarray(hue)[rows]
+        if isinstance(hue.dtype, pd.CategoricalDtype) or hue.dtype.kind in 'iuOUSb':
+            # Discrete hue: one series per value, so the legend lists them
+            cmap = plt.get_cmap(palette)
+            levels = pd.unique(hue)
+            for i, level in enumerate(sorted(levels, key=str)):
+                members = hue == level
+                ax.scatter(x[rows][members], y[rows][members], s=s, label=str(level),
+                           color=cmap(i / max(len(levels) - 1, 1)), **kwargs)
+        else:
+            points = ax.scatter(x[rows], y[rows], c=hue, cmap=palette, s=s, **kwargs)
+            plt.colorbar(points, ax=ax)
+        return ax
+
+    def stats(self):
+        with self.lock:
+            return {'figures': len(self.figures), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        """Close and drop every cached figure."""
+        with self.lock:
+            for fig in self.figures.values():
+                plt.close(fig)
+            self.figures.clear()
+
+
+_default_backend = None
+
+
+def get_plot_backend():
+    """Process-wide PlotBackend, so cached figures are shared by every analysis."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = PlotBackend()
+    return _default_backend
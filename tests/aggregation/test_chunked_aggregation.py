@@ -0,0 +1,47 @@
+import unittest
+import os
+import sys
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from aggregation.chunked_aggregation import aggregate_chunks
+from pandas.testing import assert_frame_equal
+
+class TestAggregateChunks(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a small session table split into chunks.
+        """
+        self.df = pd.DataFrame({
+            'MSISDN/Number': [1, 2, 1, 3, 2, 1],
+            'Bearer Id': [10, 11, 10, 12, 13, 14],
+            'Dur. (ms)': [100.0, 200.0, 300.0, None, 500.0, 600.0],
+            'Handset Type': ['A', 'B', 'A', 'C', 'B', 'A']
+        })
+        self.chunks = [self.df.iloc[0:2], self.df.iloc[2:4], self.df.iloc[4:6]]
+        self.aggregations = dict(
+            sessions=('Bearer Id', 'count'),
+            unique_sessions=('Bearer Id', 'nunique'),
+            total_duration=('Dur. (ms)', 'sum'),
+            mean_duration=('Dur. (ms)', 'mean'),
+            max_duration=('Dur. (ms)', 'max'),
+            handset=('Handset Type', 'first')
+        )
+
+    def test_matches_pandas_groupby(self):
+        """
+        Aggregating chunk by chunk should give the same result as a single groupby.
+        """
+        expected = self.df.groupby('MSISDN/Number').agg(**self.aggregations)
+        result = aggregate_chunks(iter(self.chunks), 'MSISDN/Number', self.aggregations)
+        assert_frame_equal(result, expected)
+
+    def test_unsupported_aggregation(self):
+        """
+        Aggregations that cannot be merged across chunks should be rejected.
+        """
+        with self.assertRaises(ValueError):
+            aggregate_chunks(iter(self.chunks), 'MSISDN/Number', {'m': ('Dur. (ms)', 'median')})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from aggregation.customer_aggregation_engine import CustomerAggregationEngine
+from engagement_analysis.user_engagement_analysis import UserEngagementAnalysis
+from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
+from pandas.testing import assert_frame_equal
+
+class TestCustomerAggregationEngine(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a small session table with a missing key and missing values.
+        """
+        self.df = pd.DataFrame({
+            'MSISDN/Number': [3.0, 1.0, 3.0, np.nan, 2.0, 1.0, 3.0],
+            'Bearer Id': [10, 11, 10, 12, 13, 14, 15],
+            'Dur. (ms)': [100.0, 200.0, 300.0, 400.0, np.nan, 600.0, 700.0],
+            'Handset Type': [None, 'B', 'A', 'C', 'B', 'A', 'A']
+        })
+        self.aggregations = dict(
+            sessions=('Bearer Id', 'count'),
+            unique_sessions=('Bearer Id', 'nunique'),
+            total_bearer=('Bearer Id', 'sum'),
+            total_duration=('Dur. (ms)', 'sum'),
+            mean_duration=('Dur. (ms)', 'mean'),
+            min_duration=('Dur. (ms)', 'min'),
+            max_duration=('Dur. (ms)', 'max'),
+            handset=('Handset Type', 'first')
+        )
+
+    def test_matches_pandas_groupby(self):
+        """
+        Every supported aggregation should match a pandas groupby.
+        """
+        expected = self.df.groupby('MSISDN/Number').agg(**self.aggregations)
+        result = CustomerAggregationEngine(self.df).aggregate(self.aggregations)
+        assert_frame_equal(result, expected)
+
+    def test_shared_between_analyses(self):
+        """
+        Analyses sharing one engine should give the same results as their own groupby.
+        """
+        data = self.df.fillna({'Dur. (ms)': 0}).assign(**{col: 1.0 for col in [
+            'Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)',
+            'Total DL (Bytes)', 'Total UL (Bytes)'
+        ]})
+        engine = CustomerAggregationEngine(data)
+        assert_frame_equal(
+            UserEngagementAnalysis(data, engine).aggregate_user_metrics(),
+            UserEngagementAnalysis(data).aggregate_user_metrics()
+        )
+        assert_frame_equal(
+            TelecomEngagementAnalysis(data, engine).aggregate_metrics_by_customer(),
+            TelecomEngagementAnalysis(data).aggregate_metrics_by_customer()
+        )
+        # The duration sum is computed once and served to both analyses from the cache
+        self.assertIn(('Dur. (ms)', 'sum'), engine.results)
+        self.assertFalse(engine.pending)
+
+    def test_unsupported_aggregation(self):
+        """
+        Aggregations the engine cannot compute should be rejected.
+        """
+        with self.assertRaises(ValueError):
+            CustomerAggregationEngine(self.df).aggregate(dict(spread=('Dur. (ms)', 'std')))
+
+if __name__ == '__main__':
+    unittest.main()
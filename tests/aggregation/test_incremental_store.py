@@ -0,0 +1,148 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from aggregation.incremental_store import IncrementalAggregateStore
+from data_loader.teleco_data_loader import TelecoDataLoader
+from engagement_analysis.user_engagement_analysis import UserEngagementAnalysis
+from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
+from pandas.testing import assert_frame_equal
+
+class FrameLoader(TelecoDataLoader):
+    """TelecoDataLoader streaming an in-memory table, with the same signature and defaults as stream_data."""
+
+    def __init__(self, df):
+        super().__init__(None)
+        self.df = df
+        self.calls = []
+
+    def stream_data(self, table_name, columns=None, start=None, end=None, msisdns=None,
+                    chunk_size=100_000, dtypes=None, compact=True):
+        self.calls.append({'start': start, 'compact': compact})
+        df = self.df if start is None else self.df[self.df['Start'] >= start]
+        df = df[columns] if columns else df
+        for offset in range(0, len(df), chunk_size):
+            chunk = df.iloc[offset:offset + chunk_size].copy()
+            yield self.apply_compact_dtypes(chunk, dtypes) if compact else chunk
+
+
+class TestIncrementalAggregateStore(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up hourly sessions for a few customers and a temporary store directory.
+        """
+        rng = np.random.default_rng(0)
+        n = 200
+        self.df = pd.DataFrame({
+            'MSISDN/Number': rng.integers(1, 20, n).astype(float),
+            'Start': pd.date_range('2024-01-01', periods=n, freq='h'),
+            'Bearer Id': rng.integers(1, 10**6, n).astype(float),
+            'Dur. (ms)': rng.random(n) * 1000,
+            'Avg RTT DL (ms)': rng.random(n) * 100,
+            'Avg RTT UL (ms)': rng.random(n) * 100,
+            'Avg Bearer TP DL (kbps)': rng.random(n) * 10,
+            'Avg Bearer TP UL (kbps)': rng.random(n) * 10,
+            'Total DL (Bytes)': rng.random(n) * 500,
+            'Total UL (Bytes)': rng.random(n) * 50
+        })
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_incremental_updates_match_full_recompute(self):
+        """
+        Ingesting in batches across store instances should match aggregating everything at once.
+        """
+        IncrementalAggregateStore(self.store_dir).update([self.df.iloc[:120]])
+        store = IncrementalAggregateStore(self.store_dir)
+        self.assertEqual(store.watermark, self.df['Start'].iloc[119])
+
+        # Overlapping rows up to the watermark are skipped
+        self.assertEqual(store.update([self.df.iloc[100:]]), 80)
+        self.assertEqual(IncrementalAggregateStore(self.store_dir).rows_ingested, len(self.df))
+
+        assert_frame_equal(
+            UserEngagementAnalysis(None, store).aggregate_user_metrics(),
+            UserEngagementAnalysis(self.df).aggregate_user_metrics(),
+            check_dtype=False
+        )
+        assert_frame_equal(
+            TelecomEngagementAnalysis(None, store).aggregate_metrics_by_customer(),
+            TelecomEngagementAnalysis(self.df).aggregate_metrics_by_customer(),
+            check_dtype=False
+        )
+
+    def test_late_arriving_sessions(self):
+        """
+        Sessions written after newer ones were ingested should be counted once if within the lookback window.
+        """
+        store = IncrementalAggregateStore(self.store_dir, lookback='6h')
+        store.update([self.df.iloc[:120]])
+        late = self.df.iloc[[110, 60]].assign(**{'Bearer Id': [-1.0, -2.0]})
+        late['Start'] = [store.watermark - pd.Timedelta('30min'), store.watermark - pd.Timedelta('2D')]
+
+        # Re-reading the window from a new instance skips the sessions ingested before
+        store = IncrementalAggregateStore(self.store_dir, lookback='6h')
+        window = self.df.iloc[:120][self.df['Start'].iloc[:120] > store.watermark - store.lookback]
+        self.assertEqual(store.update([pd.concat([window, late])]), 1)
+        self.assertEqual(store.watermark, self.df['Start'].iloc[119])
+
+        expected = pd.concat([self.df.iloc[:120], late.iloc[:1]])
+        assert_frame_equal(
+            UserEngagementAnalysis(None, store).aggregate_user_metrics(),
+            UserEngagementAnalysis(expected).aggregate_user_metrics(),
+            check_dtype=False
+        )
+
+        loader = FrameLoader(self.df.iloc[:0])
+        store.update_from_loader(loader)
+        self.assertEqual(loader.calls[0]['start'], store.watermark - pd.Timedelta('6h'))
+
+    def test_update_from_loader_keeps_float64_sums(self):
+        """
+        Sums streamed from the loader should be accumulated in float64 across updates.
+        """
+        self.df['Total DL (Bytes)'] = self.df['Total DL (Bytes)'] * 1e9 + 123_456_789.123
+        loader = FrameLoader(self.df.iloc[:120])
+        store = IncrementalAggregateStore(self.store_dir)
+        self.assertEqual(store.update_from_loader(loader, chunk_size=50), 120)
+        loader.df = self.df
+        store = IncrementalAggregateStore(self.store_dir)
+        self.assertEqual(store.update_from_loader(loader, chunk_size=50), 80)
+        self.assertEqual([call['compact'] for call in loader.calls], [False, False])
+
+        state = IncrementalAggregateStore(self.store_dir).state
+        self.assertEqual(state['Total DL (Bytes)__sum'].dtype, np.float64)
+        expected = self.df.groupby('MSISDN/Number')['Total DL (Bytes)'].sum()
+        np.testing.assert_allclose(state['Total DL (Bytes)__sum'].sort_index(), expected, rtol=1e-12)
+
+        # Compact chunks passed in directly are widened before they are summed
+        store = IncrementalAggregateStore(os.path.join(self.store_dir, 'compact'))
+        store.update(loader.stream_data('xdr_data', chunk_size=50))
+        self.assertEqual(store.state['Total DL (Bytes)__sum'].dtype, np.float64)
+
+    def test_top_n(self):
+        """
+        Top-N queries should rank customers from the stored state.
+        """
+        store = IncrementalAggregateStore(self.store_dir)
+        store.update([self.df])
+        expected = self.df.groupby('MSISDN/Number')['Total DL (Bytes)'].sum().nlargest(3)
+        top = store.top_n('total_download', n=3)
+        self.assertEqual(top['MSISDN/Number'].tolist(), expected.index.tolist())
+
+    def test_unsupported_aggregation(self):
+        """
+        Aggregations that cannot be maintained incrementally should be rejected.
+        """
+        with self.assertRaises(ValueError):
+            IncrementalAggregateStore(self.store_dir, named_aggs=dict(longest=('Dur. (ms)', 'max')))
+
+if __name__ == '__main__':
+    unittest.main()
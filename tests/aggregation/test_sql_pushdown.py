@@ -0,0 +1,142 @@
+import unittest
+import os
+import sqlite3
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../databases')))
+from aggregation.sql_pushdown import SqlAggregationBackend, compile_grouped_aggregation, get_sql_backend
+from engagement_analysis.user_engagement_analysis import UserEngagementAnalysis
+from over_view_analysis.telecom_data_anlyzer import TelecomDataAnalyzer
+from over_view_analysis.user_over_view_analysis import UserOverviewAnalysis
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+HANDSETS = {
+    'Apple': (['iPhone 6', 'iPhone 7', 'iPhone X', 'undefined', None], [0.4, 0.25, 0.15, 0.12, 0.08]),
+    'Samsung': (['Galaxy S8', 'Galaxy A5', 'Galaxy J3', 'undefined'], [0.45, 0.3, 0.17, 0.08]),
+    'Huawei': (['P20', 'Mate 10', 'B528S-23A', 'Y6'], [0.5, 0.28, 0.14, 0.08]),
+    'Nokia': (['Nokia 3', 'Nokia 6'], [0.7, 0.3]),
+}
+
+
+def synthetic_sessions(n=4000, seed=0):
+    """Raw xdr_data-like sessions with missing keys, missing metrics and undefined handsets."""
+    rng = np.random.default_rng(seed)
+    manufacturers = rng.choice(list(HANDSETS), n, p=[0.42, 0.33, 0.2, 0.05])
+    handset_types = [rng.choice(HANDSETS[m][0], p=HANDSETS[m][1]) for m in manufacturers]
+    df = pd.DataFrame({
+        'Bearer Id': rng.integers(0, n // 2, n).astype(float),
+        'MSISDN/Number': 3.36e10 + rng.integers(0, 600, n).astype(float),
+        'Dur. (ms)': rng.gamma(2.0, 5e4, n),
+        'Handset Manufacturer': manufacturers,
+        'Handset Type': handset_types,
+    })
+    for column in ['Total DL (Bytes)', 'Total UL (Bytes)', 'Youtube DL (Bytes)', 'Youtube UL (Bytes)',
+                   'Netflix DL (Bytes)', 'Netflix UL (Bytes)', 'Gaming DL (Bytes)', 'Gaming UL (Bytes)']:
+        df[column] = rng.gamma(2.0, 1e7, n)
+    df.loc[rng.choice(n, 40, replace=False), 'MSISDN/Number'] = np.nan
+    df.loc[rng.choice(n, 60, replace=False), 'Dur. (ms)'] = np.nan
+    df.loc[rng.choice(n, 30, replace=False), 'Handset Manufacturer'] = None
+    # One customer whose only session has no traffic recorded
+    df.loc[0, ['MSISDN/Number', 'Total DL (Bytes)']] = [1.0, np.nan]
+    return df
+
+
+class TestSqlPushdown(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Load the synthetic sessions into an in-memory SQLite table.
+        """
+        self.df = synthetic_sessions()
+        self.connection = sqlite3.connect(':memory:')
+        self.df.to_sql('xdr_data', self.connection, index=False)
+        self.backend = SqlAggregationBackend(self.connection)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_user_overview_parity(self):
+        """
+        The pushed-down per-user overview should equal the pandas aggregation.
+        """
+        expected = UserOverviewAnalysis(self.df.copy()).aggregate_user_data()
+        result = UserOverviewAnalysis(None, sql_backend=self.backend).aggregate_user_data()
+        assert_frame_equal(result, expected, rtol=1e-12)
+
+    def test_user_engagement_parity(self):
+        """
+        The pushed-down engagement metrics should equal the pandas aggregation, including all-missing sums.
+        """
+        expected = UserEngagementAnalysis(self.df.copy()).aggregate_user_metrics()
+        result = UserEngagementAnalysis(None, sql_backend=self.backend).aggregate_user_metrics()
+        assert_frame_equal(result, expected, rtol=1e-12)
+        self.assertEqual(result.loc[result['MSISDN/Number'] == 1.0, 'total_download'].item(), 0.0)
+
+    def test_handset_parity(self):
+        """
+        Top handsets and manufacturers counted in SQL should equal the pandas value counts.
+        """
+        expected = TelecomDataAnalyzer(self.df.copy())
+        pushed = TelecomDataAnalyzer(None, sql_backend=self.backend)
+        assert_series_equal(pushed.get_top_10_handsets(), expected.get_top_10_handsets())
+        assert_series_equal(pushed.get_top_3_manufacturers(), expected.get_top_3_manufacturers())
+
+        expected_top_5 = expected.get_top_5_handsets_per_top_3_manufacturers()
+        pushed_top_5 = pushed.get_top_5_handsets_per_top_3_manufacturers()
+        self.assertEqual(list(pushed_top_5), list(expected_top_5))
+        for manufacturer, handsets in expected_top_5.items():
+            assert_series_equal(pushed_top_5[manufacturer], handsets)
+
+    def test_compile_and_flag(self):
+        """
+        Identifiers should be quoted, unsupported aggregations rejected, and the backend selected by the flag.
+        """
+        query = compile_grouped_aggregation('xdr_data', 'MSISDN/Number', {'n': ('Bearer Id', 'nunique')})
+        self.assertEqual(query, 'SELECT "MSISDN/Number", COUNT(DISTINCT "Bearer Id") AS "n" FROM "xdr_data" '
+                                'WHERE "MSISDN/Number" IS NOT NULL GROUP BY "MSISDN/Number" ORDER BY "MSISDN/Number"')
+        with self.assertRaises(ValueError):
+            compile_grouped_aggregation('xdr_data', 'MSISDN/Number', {'m': ('Dur. (ms)', 'median')})
+
+        previous = os.environ.pop('AGGREGATION_PUSHDOWN', None)
+        try:
+            self.assertIsNone(get_sql_backend(self.connection))
+            os.environ['AGGREGATION_PUSHDOWN'] = 'sql'
+            self.assertIsInstance(get_sql_backend(self.connection), SqlAggregationBackend)
+        finally:
+            os.environ.pop('AGGREGATION_PUSHDOWN', None)
+            if previous is not None:
+                os.environ['AGGREGATION_PUSHDOWN'] = previous
+
+
+@unittest.skipUnless(os.getenv('TEST_POSTGRES_DSN'), 'Set TEST_POSTGRES_DSN to run against a local PostgreSQL.')
+class TestSqlPushdownPostgres(unittest.TestCase):
+
+    def test_parity(self):
+        """
+        The pushed-down aggregations should match pandas on PostgreSQL too.
+        """
+        import psycopg2
+        from connections.bulk_copy_writer import BulkCopyWriter
+
+        df = synthetic_sessions()
+        connection = psycopg2.connect(os.getenv('TEST_POSTGRES_DSN'))
+        try:
+            BulkCopyWriter(connection, mode='swap').write(df, 'sql_pushdown_test')
+            backend = SqlAggregationBackend(connection, 'sql_pushdown_test')
+            assert_frame_equal(UserEngagementAnalysis(None, sql_backend=backend).aggregate_user_metrics(),
+                               UserEngagementAnalysis(df.copy()).aggregate_user_metrics(), rtol=1e-9)
+            assert_frame_equal(UserOverviewAnalysis(None, sql_backend=backend).aggregate_user_data(),
+                               UserOverviewAnalysis(df.copy()).aggregate_user_data(), rtol=1e-9)
+            assert_series_equal(TelecomDataAnalyzer(None, sql_backend=backend).get_top_10_handsets(),
+                                TelecomDataAnalyzer(df.copy()).get_top_10_handsets())
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('DROP TABLE IF EXISTS "sql_pushdown_test"')
+            connection.commit()
+            connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
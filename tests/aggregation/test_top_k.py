@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from aggregation.top_k import StreamingTopK, top_k, top_k_chunks, top_k_indices
+from pandas.testing import assert_frame_equal
+
+class TestTopK(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a per-customer table with many ties and a few missing values.
+        """
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'MSISDN/Number': np.arange(1000, dtype=float),
+            'total_traffic': rng.integers(0, 50, 1000).astype(float)
+        })
+        self.df.loc[rng.choice(1000, 20, replace=False), 'total_traffic'] = np.nan
+
+    def expected(self, k, largest=True):
+        return self.df.sort_values('total_traffic', ascending=not largest, kind='stable').head(k)
+
+    def test_matches_stable_sort(self):
+        """
+        top_k should return the same rows, in the same order, as a stable sort followed by head.
+        """
+        for k in [0, 1, 7, 100, 979, 990, 1000, 2000]:
+            for largest in [True, False]:
+                assert_frame_equal(top_k(self.df, 'total_traffic', k, largest), self.expected(k, largest))
+
+    def test_integer_and_string_values(self):
+        """
+        Selection should not depend on negating values, so unsigned integers and strings work.
+        """
+        values = np.array([3, 9, 1, 9, 0], dtype=np.uint8)
+        self.assertEqual(top_k_indices(values, 3).tolist(), [1, 3, 0])
+        self.assertEqual(top_k_indices(np.array(['b', 'c', 'a']), 2, largest=False).tolist(), [2, 0])
+
+    def test_streaming_matches_dense(self):
+        """
+        The bounded heap over chunks should select the same rows as the dense selection.
+        """
+        chunks = [self.df.iloc[start:start + 128] for start in range(0, len(self.df), 128)]
+        for k in [5, 50, 995]:
+            for largest in [True, False]:
+                streamed = top_k_chunks(iter(chunks), 'total_traffic', k, largest)
+                assert_frame_equal(streamed, self.expected(k, largest).reset_index(drop=True))
+
+    def test_streaming_push(self):
+        """
+        Items pushed one by one should keep only the best k, ties in arrival order.
+        """
+        heap = StreamingTopK(3)
+        for value, item in [(5, 'a'), (7, 'b'), (5, 'c'), (9, 'd'), (7, 'e')]:
+            heap.push(value, item)
+        self.assertEqual(heap.result(), ['d', 'b', 'e'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import os
+import sys
+import pandas as pd
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from cleaning.data_cleaning import DataCleaner
+from cleaning.outlier_capping import OutlierCapper
+from pandas.testing import assert_frame_equal
+
+class TestHandleMissingAndOutliers(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a numeric frame with missing values and outliers.
+        """
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'MSISDN/Number': rng.integers(0, 50, 500),
+            'Dur. (ms)': rng.gamma(2.0, 1000.0, 500),
+            'Total DL (Bytes)': rng.gamma(2.0, 1e6, 500),
+            'Handset Type': rng.choice(['A', 'B'], 500)
+        })
+        self.df.loc[::17, 'Dur. (ms)'] = np.nan
+        self.df['All Missing'] = np.nan
+
+    def expected(self, df):
+        """
+        The original per-column pandas implementation.
+        """
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].mean())
+        df[numeric_cols] = df[numeric_cols].apply(
+            lambda x: np.where(x > x.quantile(0.99), x.mean(), x)
+        )
+        return df
+
+    def test_matches_per_column_implementation(self):
+        """
+        The vectorized engine should match the per-column implementation.
+        """
+        expected = self.expected(self.df.copy())
+        result = DataCleaner(self.df.copy()).handle_missing_and_outliers()
+        assert_frame_equal(result, expected)
+
+    def test_approximate_mode_caps_values(self):
+        """
+        The sampled quantile mode should still fill every missing value and cap the largest values.
+        """
+        capper = OutlierCapper(approximate=True, sample_size=100, profile=True)
+        result = capper.fit_transform(self.df.copy())
+        self.assertFalse(result['Dur. (ms)'].isnull().any())
+        self.assertLess(result['Total DL (Bytes)'].max(), self.df['Total DL (Bytes)'].max())
+        self.assertEqual([stage['stage'] for stage in capper.stage_report],
+                         ['extract', 'fill_missing', 'quantiles', 'cap', 'write_back'])
+
+class TestCompactPipeline(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a raw xDR-like frame with string timestamps, missing keys and handset strings.
+        """
+        rng = np.random.default_rng(1)
+        n = 1000
+        start = pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 86400, n), unit='s')
+        self.df = pd.DataFrame({
+            'Bearer Id': rng.integers(1, 10**12, n).astype('float64'),
+            'Start': start.strftime('%Y-%m-%d %H:%M:%S'),
+            'End': (start + pd.Timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S'),
+            'MSISDN/Number': (3.36e10 + rng.integers(0, 100, n)).astype('float64'),
+            'Avg RTT DL (ms)': rng.gamma(2.0, 50.0, n),
+            'Avg Bearer TP DL (kbps)': rng.gamma(2.0, 5000.0, n),
+            'Total DL (Bytes)': rng.gamma(2.0, 1e8, n),
+            'Handset Type': rng.choice(['Apple iPhone 6S (A1688)', 'Samsung Galaxy S8 (Sm-G950F)'], n)
+        })
+        self.df.loc[::50, 'MSISDN/Number'] = np.nan
+        self.df.loc[::70, 'Start'] = 'not a date'
+        self.df.loc[::9, 'Avg RTT DL (ms)'] = np.nan
+
+    def test_matches_legacy_pipeline(self):
+        """
+        The compact pipeline should keep the same rows and metric values as the legacy steps.
+        """
+        legacy = DataCleaner(self.df.copy())
+        legacy.clean_data()
+        legacy.convert_units_to_mb()
+        legacy.handle_missing_and_outliers()
+
+        compact = DataCleaner(self.df.copy()).run_compact_pipeline()
+
+        self.assertEqual(len(compact), len(legacy.df))
+        for col in ['Avg RTT DL (ms)', 'Avg Bearer TP DL (kbps)', 'Total DL (Bytes)']:
+            np.testing.assert_allclose(compact[col].to_numpy(np.float64), legacy.df[col].to_numpy(np.float64), rtol=1e-6)
+        self.assertEqual(compact['MSISDN/Number'].dtype, np.int64)
+        self.assertEqual(compact['Handset Type'].dtype, 'category')
+
+    def test_memory_report(self):
+        """
+        The compact frame should use at least 50% less memory than the raw frame.
+        """
+        cleaner = DataCleaner(self.df.copy())
+        cleaner.run_compact_pipeline()
+        report = cleaner.memory_report()
+        self.assertGreaterEqual(report.loc['Total', 'reduction_pct'], 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import os
+import sys
+import pandas as pd
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from cleaning.data_cleaning import DataCleaner
+from cleaning.quantile_sketch import QuantileSketch
+from cleaning.streaming_cleaner import StreamingDataCleaner
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_merged_sketch_is_close_to_exact_quantile(self):
+        """
+        Sketches built on separate chunks and merged should estimate the 99th percentile closely.
+        """
+        values = np.random.default_rng(0).gamma(2.0, 1000.0, 200_000)
+        left, right = QuantileSketch(k=1024), QuantileSketch(k=1024, random_state=1)
+        for chunk in np.array_split(values[:100_000], 5):
+            left.update(chunk)
+        right.update(values[100_000:])
+        left.merge(right)
+
+        self.assertEqual(left.count(), len(values))
+        estimate = left.quantile(0.99)
+        self.assertAlmostEqual((values <= estimate).mean(), 0.99, delta=0.002)
+
+class TestStreamingDataCleaner(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a session table that is served in chunks.
+        """
+        rng = np.random.default_rng(2)
+        n = 5000
+        self.df = pd.DataFrame({
+            'Bearer Id': rng.integers(1, 10**6, n).astype('float64'),
+            'Start': pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 86400, n), unit='s'),
+            'End': pd.Timestamp('2019-04-02'),
+            'MSISDN/Number': (3.36e10 + rng.integers(0, 100, n)).astype('float64'),
+            'Avg RTT DL (ms)': rng.gamma(2.0, 50.0, n),
+            'Total DL (Bytes)': rng.gamma(2.0, 1e8, n)
+        })
+        self.df.loc[::40, 'MSISDN/Number'] = np.nan
+        self.chunk_source = lambda: (self.df.iloc[i:i + 700].copy() for i in range(0, len(self.df), 700))
+
+    def test_matches_in_memory_cleaning(self):
+        """
+        Streaming cleaning should reproduce DataCleaner up to the sketch's rank error.
+        """
+        cleaner = DataCleaner(self.df.copy(), verbose=False)
+        cleaner.clean_data()
+        cleaner.convert_units_to_mb()
+        expected = cleaner.handle_missing_and_outliers()
+
+        chunks = []
+        rows = StreamingDataCleaner(self.chunk_source).run(chunks.append)
+        result = pd.concat(chunks)
+
+        self.assertEqual(rows, len(expected))
+        for col in ['Avg RTT DL (ms)', 'Total DL (Bytes)']:
+            mismatched = ~np.isclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9)
+            self.assertLess(mismatched.mean(), 0.005)
+
+    def test_compact_float32_chunks(self):
+        """
+        Missing metrics in compact float32 chunks should be filled with 0, as in memory, not with the mean.
+        """
+        self.df.loc[1::50, 'Avg RTT DL (ms)'] = np.nan
+        compact = self.df.astype({'Avg RTT DL (ms)': 'float32', 'Total DL (Bytes)': 'float32'})
+        chunk_source = lambda: (compact.iloc[i:i + 700].copy() for i in range(0, len(compact), 700))
+
+        cleaner = DataCleaner(self.df.copy(), verbose=False)
+        cleaner.clean_data()
+        cleaner.convert_units_to_mb()
+        expected = cleaner.handle_missing_and_outliers()
+
+        chunks = []
+        StreamingDataCleaner(chunk_source).run(chunks.append)
+        result = pd.concat(chunks)
+
+        filled = self.df.loc[expected.index, 'Avg RTT DL (ms)'].isna().to_numpy()
+        self.assertTrue(filled.any())
+        np.testing.assert_array_equal(result['Avg RTT DL (ms)'].to_numpy()[filled], 0.0)
+        self.assertEqual(result['Avg RTT DL (ms)'].dtype, np.float64)
+        mismatched = ~np.isclose(result['Avg RTT DL (ms)'].to_numpy(), expected['Avg RTT DL (ms)'].to_numpy(),
+                                 rtol=1e-6)
+        self.assertLess(mismatched.mean(), 0.005)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import os
+import sys
+import numpy as np
+from sklearn.cluster import KMeans
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from clustering.k_sweep import DEFAULT_WAVE_SIZE, KSweep, stratified_sample
+
+class TestKSweep(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up four well separated groups of points.
+        """
+        rng = np.random.default_rng(0)
+        centres = np.array([[0.0, 0.0], [20.0, 0.0], [0.0, 20.0], [20.0, 20.0]])
+        self.groups = rng.integers(0, 4, 4000)
+        self.X = centres[self.groups] + rng.standard_normal((4000, 2))
+
+    def test_cold_sweep_matches_serial_kmeans(self):
+        """
+        Without warm starts or early stopping the curve should match fitting every k from scratch.
+        """
+        result = KSweep(max_k=5, warm_start=False, tolerance=None, n_jobs=1).run(self.X)
+        expected = [KMeans(n_clusters=k, random_state=0).fit(self.X).inertia_ for k in range(1, 6)]
+        np.testing.assert_allclose(result['curve']['inertia'], expected)
+
+    def test_parallel_warm_sweep_finds_elbow(self):
+        """
+        A parallel warm-started sweep should pick k=4 and stop before max_k.
+        """
+        result = KSweep(max_k=10, n_jobs=2, patience=2).run(self.X)
+        self.assertEqual(result['best_k'], 4)
+        self.assertTrue(result['stopped_early'])
+        self.assertLess(result['curve']['k'].max(), 10)
+
+    def test_default_waves_stop_early(self):
+        """
+        The default wave size should be capped, so a sweep on many cores still warm-starts and stops early.
+        """
+        sweep = KSweep(max_k=10, patience=2)
+        self.assertLessEqual(sweep.n_jobs, DEFAULT_WAVE_SIZE)
+        result = sweep.run(self.X)
+        self.assertEqual(result['best_k'], 4)
+        self.assertTrue(result['stopped_early'])
+
+    def test_stratified_sample_keeps_shares(self):
+        """
+        A stratified sample should keep the share of every stratum.
+        """
+        strata = np.where(np.arange(4000) < 400, 'rare', 'common')
+        sample = stratified_sample(np.arange(4000)[:, np.newaxis], 1000, strata)
+        self.assertEqual(len(sample), 1000)
+        self.assertEqual((sample[:, 0] < 400).sum(), 100)
+
+if __name__ == '__main__':
+    unittest.main()
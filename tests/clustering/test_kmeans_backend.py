@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from clustering.kmeans_backend import KMeansBackend
+from experience_analytics.experience_clustering import ExperienceClustering
+
+class TestKMeansBackend(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up three well separated groups of points.
+        """
+        rng = np.random.default_rng(0)
+        centres = np.array([[0.0, 0.0], [10.0, 10.0], [-10.0, 10.0]])
+        self.groups = rng.integers(0, 3, 3000)
+        self.X = centres[self.groups] + rng.standard_normal((3000, 2))
+
+    def test_full_mode_matches_kmeans(self):
+        """
+        The default backend should fit exactly like sklearn's KMeans.
+        """
+        expected = KMeans(n_clusters=3, random_state=0).fit_predict(self.X)
+        np.testing.assert_array_equal(KMeansBackend(n_clusters=3).fit_predict(self.X), expected)
+
+    def test_fit_chunks_recovers_groups(self):
+        """
+        Feeding chunks to the mini-batch backend should find the same groups as a full fit.
+        """
+        backend = KMeansBackend(n_clusters=3, mode='minibatch', dtype=np.float32)
+        backend.fit_chunks(lambda: np.array_split(self.X, 10), passes=2)
+        labels = backend.predict(self.X)
+        # Every true group maps to a single cluster
+        self.assertTrue(all(len(set(labels[self.groups == g])) == 1 for g in range(3)))
+
+    def test_partial_fit_requires_minibatch(self):
+        with self.assertRaises(ValueError):
+            KMeansBackend(n_clusters=3).partial_fit(self.X)
+
+    def test_experience_clustering_per_customer(self):
+        """
+        Per-customer clustering should give every session of a customer the same cluster.
+        """
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(rng.random((600, 6)) * 100, columns=[
+            'Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)',
+            'Avg Bearer TP UL (kbps)', 'TCP DL Retrans. Vol (Bytes)', 'TCP UL Retrans. Vol (Bytes)'
+        ])
+        df['MSISDN/Number'] = rng.integers(0, 50, 600).astype(float)
+        clustering = ExperienceClustering(df, per_customer=True, backend=KMeansBackend(3, mode='minibatch'))
+        clustering.preprocess_data()
+        clustering.perform_clustering()
+        self.assertEqual(len(clustering.customer_clusters), df['MSISDN/Number'].nunique())
+        self.assertTrue((df.groupby('MSISDN/Number')['Cluster'].nunique() == 1).all())
+
+if __name__ == '__main__':
+    unittest.main()
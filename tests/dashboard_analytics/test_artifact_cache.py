@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../app')))
+from dashboard_analytics.artifact_cache import ArtifactCache, estimate_size
+
+
+class Analysis:
+    """Analysis object keeping a shallow copy of the session frame, as the dashboard pages do."""
+
+    def __init__(self, df):
+        self.df = df.copy(deep=False)
+        self.result = df.groupby('MSISDN/Number')['Total DL (Bytes)'].sum()
+
+
+class TestArtifactCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a session frame with numeric, text and categorical columns.
+        """
+        rng = np.random.default_rng(0)
+        n = 20000
+        self.df = pd.DataFrame({
+            'MSISDN/Number': 3.36e10 + rng.integers(0, 500, n),
+            'Total DL (Bytes)': rng.gamma(2.0, 1e8, n),
+            'Handset Type': rng.choice(['iPhone 7', 'Galaxy S8', 'P20'], n),
+            'Handset Manufacturer': pd.Categorical(rng.choice(['Apple', 'Samsung', 'Huawei'], n))
+        })
+
+    def test_shared_buffers_not_counted(self):
+        """
+        Shallow copies of the source frame should not count towards the artifact size, real copies should.
+        """
+        analysis = Analysis(self.df)
+        frame_bytes = self.df.memory_usage(deep=True, index=False).sum()
+        self.assertGreater(estimate_size(analysis), frame_bytes)
+        self.assertLess(estimate_size(analysis, shared=self.df), frame_bytes / 10)
+        self.assertGreater(estimate_size(self.df.copy(), shared=self.df), frame_bytes)
+        self.assertEqual(estimate_size(self.df['Total DL (Bytes)'].to_numpy(), shared=self.df), 0)
+
+    def test_concurrent_misses_compute_once(self):
+        """
+        Sessions missing the same key at once should wait for one computation.
+        """
+        cache = ArtifactCache()
+        calls = []
+        lock = threading.Lock()
+
+        def compute():
+            with lock:
+                calls.append(1)
+            time.sleep(0.1)
+            return Analysis(self.df)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            values = list(pool.map(lambda _: cache.get_or_compute('page', 'v1', compute, shared=self.df), range(8)))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(value is values[0] for value in values))
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 7))
+        self.assertEqual(cache.key_locks, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import concurrent.futures
+import gc
+import os
+import sys
+import threading
+import time
+import weakref
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from dashboard_analytics.background_loader import BackgroundLoader
+from over_view_analysis.telecom_data_anlyzer import TelecomDataAnalyzer, handset_summary
+
+
+class TestBackgroundLoader(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a session table served in chunks, with a gate to hold the stream mid-way.
+        """
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'MSISDN/Number': rng.integers(0, 300, 1000).astype(float),
+            'Handset Manufacturer': rng.choice(['Apple', 'Samsung', 'Huawei', 'Nokia'], 1000, p=[0.45, 0.3, 0.2, 0.05]),
+            'Handset Type': rng.choice(['A1', 'A2', 'S1', 'S2', 'H1', 'undefined', None], 1000,
+                                       p=[0.3, 0.22, 0.16, 0.12, 0.09, 0.07, 0.04])
+        })
+        self.gate = threading.Event()
+        self.closed = threading.Event()
+
+    def chunks(self, hold_after=None):
+        try:
+            for number, start in enumerate(range(0, len(self.df), 100)):
+                if number == hold_after:
+                    self.gate.wait(5)
+                yield self.df.iloc[start:start + 100]
+        finally:
+            self.closed.set()
+
+    def test_summary_then_full_data(self):
+        """
+        The summary should be available before the stream completes, and the result should hold every chunk.
+        """
+        loader = BackgroundLoader(
+            summary=lambda: {'sessions': len(self.df)},
+            chunks=lambda: self.chunks(hold_after=5),
+            finish=lambda parts: pd.concat(parts),
+            total_rows=lambda summary: summary['sessions']
+        ).start()
+
+        self.assertEqual(loader.get_summary(timeout=5), {'sessions': 1000})
+        self.assertFalse(loader.done())
+        self.gate.set()
+        pd.testing.assert_frame_equal(loader.result(timeout=5), self.df)
+
+        progress = loader.progress()
+        self.assertEqual((progress['phase'], progress['rows'], progress['chunks']), ('done', 1000, 10))
+        self.assertEqual(progress['fraction'], 1.0)
+        self.assertTrue(loader.succeeded())
+        self.assertTrue(self.closed.is_set())
+
+    def test_cancel_stops_the_stream(self):
+        """
+        Cancelling should stop the stream between chunks, close it and report the partial progress.
+        """
+        loader = BackgroundLoader(chunks=lambda: self.chunks(hold_after=3), finish=pd.concat).start()
+        while loader.progress()['chunks'] < 3:
+            time.sleep(0.001)
+        loader.cancel()
+        self.gate.set()
+        with self.assertRaises(concurrent.futures.CancelledError):
+            loader.result(timeout=5)
+        loader.thread.join(5)
+
+        progress = loader.progress()
+        self.assertEqual(progress['phase'], 'cancelled')
+        self.assertLess(progress['rows'], len(self.df))
+        self.assertTrue(self.closed.is_set())
+        self.assertFalse(loader.succeeded())
+
+    def test_detach_cancels_after_last_client(self):
+        """
+        A shared load should keep running while any client waits, and be cancelled when the last one detaches.
+        """
+        loader = BackgroundLoader(chunks=lambda: self.chunks(hold_after=3), finish=pd.concat)
+        loader.attach('first')
+        loader.attach('second')
+        loader.start()
+        self.assertFalse(loader.detach('first'))
+        self.assertFalse(loader.cancel_requested.is_set())
+        self.assertTrue(loader.detach('second'))
+        self.gate.set()
+        with self.assertRaises(concurrent.futures.CancelledError):
+            loader.result(timeout=5)
+        self.assertEqual(loader.progress()['phase'], 'cancelled')
+
+    def test_finish_can_release_chunks(self):
+        """
+        The loader should keep no reference to the chunks besides the list handed to finish.
+        """
+        refs = []
+
+        def chunks():
+            for start in range(0, len(self.df), 100):
+                chunk = self.df.iloc[start:start + 100].copy()
+                refs.append(weakref.ref(chunk))
+                yield chunk
+
+        def finish(parts):
+            df = pd.concat(parts)
+            parts.clear()
+            gc.collect()
+            return df, sum(ref() is not None for ref in refs)
+
+        df, alive = BackgroundLoader(chunks=chunks, finish=finish).start().result(timeout=5)
+        self.assertEqual(len(refs), 10)
+        self.assertEqual(alive, 0)
+        pd.testing.assert_frame_equal(df, self.df)
+
+    def test_failure_is_reported(self):
+        """
+        An error in a step should fail the load and be reported in the progress.
+        """
+        def broken():
+            raise OSError('server closed the connection')
+
+        loader = BackgroundLoader(summary=broken, chunks=self.chunks).start()
+        with self.assertRaises(OSError):
+            loader.result(timeout=5)
+        self.assertIsNone(loader.get_summary(timeout=5))
+        self.assertEqual(loader.progress()['phase'], 'failed')
+        self.assertIn('server closed the connection', loader.progress()['error'])
+
+    def test_handset_summary_matches_analyzer(self):
+        """
+        The summary tables built from per-handset counts should equal the analyzer's tables on the full frame.
+        """
+        counts = (self.df.groupby(['Handset Manufacturer', 'Handset Type'], dropna=False).size()
+                  .rename('sessions').reset_index())
+        tables = handset_summary(counts)
+        analyzer = TelecomDataAnalyzer(self.df.copy())
+
+        pd.testing.assert_series_equal(tables['Top 10 Handsets'], analyzer.get_top_10_handsets())
+        pd.testing.assert_series_equal(tables['Top 3 Manufacturers'], analyzer.get_top_3_manufacturers())
+        expected = analyzer.get_top_5_handsets_per_top_3_manufacturers()
+        self.assertEqual(list(tables['Top 5 Handsets per Manufacturer']), list(expected))
+        for manufacturer, handsets in expected.items():
+            pd.testing.assert_series_equal(tables['Top 5 Handsets per Manufacturer'][manufacturer], handsets)
+
+
+if __name__ == '__main__':
+    unittest.main()
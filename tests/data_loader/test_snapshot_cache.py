@@ -0,0 +1,123 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from data_loader.snapshot_cache import SnapshotCache
+
+
+class TestSnapshotCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a cleaned session frame, its source fingerprint and a temporary cache directory.
+        """
+        rng = np.random.default_rng(0)
+        n = 2500
+        self.df = pd.DataFrame({
+            'Bearer Id': np.arange(n, dtype='float64'),
+            'Start': pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit='s'),
+            'MSISDN/Number': 3.36e10 + rng.integers(0, 400, n),
+            'Handset Type': rng.choice(['iPhone 7', 'Galaxy S8', 'P20'], n),
+            'Total DL (Bytes)': rng.gamma(2.0, 1e8, n)
+        })
+        self.fingerprint = {'table': 'xdr_data', 'row_count': n, 'max_timestamp': self.df['Start'].max()}
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = SnapshotCache(self.temp_dir.name, rows_per_partition=1000)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build(self):
+        self.builds += 1
+        return self.df
+
+    def test_round_trip(self):
+        """
+        A saved snapshot should load back as the same frame from its memory-mapped partitions.
+        """
+        self.assertFalse(self.cache.exists(self.fingerprint))
+        self.assertIsNone(self.cache.load(self.fingerprint))
+        self.cache.save(self.fingerprint, self.df)
+        self.assertTrue(self.cache.exists(self.fingerprint))
+
+        snapshot_dir = os.path.join(self.temp_dir.name, 'xdr_data', self.cache.snapshot_key(self.fingerprint))
+        self.assertEqual(sorted(os.listdir(snapshot_dir)),
+                         ['manifest.json', 'part-00000.arrow', 'part-00001.arrow', 'part-00002.arrow'])
+        loaded = self.cache.load(self.fingerprint)
+        pd.testing.assert_frame_equal(loaded, self.df)
+        # Numeric columns are views of the mapped files rather than copies
+        self.assertFalse(loaded['Total DL (Bytes)'].to_numpy().flags.owndata)
+
+    def test_get_or_build_hit_and_miss(self):
+        """
+        The frame should be built on a miss only, and read from the snapshot afterwards.
+        """
+        self.builds = 0
+        pd.testing.assert_frame_equal(self.cache.get_or_build(self.fingerprint, self.build), self.df)
+        self.assertEqual(self.builds, 1)
+        pd.testing.assert_frame_equal(SnapshotCache(self.temp_dir.name).get_or_build(self.fingerprint, self.build),
+                                      self.df)
+        self.assertEqual(self.builds, 1)
+
+    def test_invalidation(self):
+        """
+        A new row count, max timestamp, table or cleaner version should miss the stored snapshot.
+        """
+        self.cache.save(self.fingerprint, self.df)
+        key = self.cache.snapshot_key(self.fingerprint)
+        changed = [
+            dict(self.fingerprint, row_count=self.fingerprint['row_count'] + 1),
+            dict(self.fingerprint, max_timestamp=self.fingerprint['max_timestamp'] + pd.Timedelta('1s')),
+            dict(self.fingerprint, table='xdr_data_copy')
+        ]
+        for fingerprint in changed:
+            self.assertNotEqual(self.cache.snapshot_key(fingerprint), key)
+            self.assertFalse(self.cache.exists(fingerprint))
+
+        newer_cleaner = SnapshotCache(self.temp_dir.name, cleaner_version='next')
+        self.assertNotEqual(newer_cleaner.snapshot_key(self.fingerprint), key)
+        self.assertFalse(newer_cleaner.exists(self.fingerprint))
+        self.assertEqual(SnapshotCache(self.temp_dir.name).snapshot_key(self.fingerprint), key)
+
+    def test_prune_stale_snapshots(self):
+        """
+        Saving a new snapshot should remove the older ones of the table, but not in-progress writes.
+        """
+        self.cache.save(self.fingerprint, self.df)
+        staging_dir = tempfile.mkdtemp(dir=os.path.join(self.temp_dir.name, 'xdr_data'), prefix='.staging-')
+        other_table = dict(self.fingerprint, table='other')
+        self.cache.save(other_table, self.df.head())
+
+        newer = dict(self.fingerprint, row_count=len(self.df) + 10)
+        self.cache.save(newer, self.df.head(10))
+        self.assertFalse(self.cache.exists(self.fingerprint))
+        self.assertTrue(self.cache.exists(newer))
+        self.assertTrue(self.cache.exists(other_table))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.temp_dir.name, 'xdr_data'))),
+                         sorted([self.cache.snapshot_key(newer), os.path.basename(staging_dir)]))
+        self.assertEqual(len(self.cache.load(newer)), 10)
+
+    def test_concurrent_saves_of_one_fingerprint(self):
+        """
+        Writers saving the same fingerprint at once should all succeed and leave one readable snapshot.
+        """
+        barrier = threading.Barrier(6)
+
+        def save(_):
+            barrier.wait()
+            self.cache.save(self.fingerprint, self.df)
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(save, range(6)))
+        pd.testing.assert_frame_equal(self.cache.load(self.fingerprint), self.df)
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir.name, 'xdr_data')),
+                         [self.cache.snapshot_key(self.fingerprint)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,345 @@
+import unittest
+import os
+import io
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from psycopg2 import sql
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from data_loader.teleco_data_loader import TelecoDataLoader, pa_csv
+
+
+class FrameConnection:
+    """
+    Picklable stand-in for DatabaseConnection. Like the real one it arrives in a worker process
+    without a pool; every connect() is logged with the process id, so connections can be counted.
+    """
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.pool = None
+
+    def connect(self):
+        with open(self.log_path, 'a') as log:
+            log.write(f'{os.getpid()}\n')
+        self.pool = object()
+
+    def connections(self):
+        with open(self.log_path) as log:
+            return log.read().split()
+
+
+class FrameLoader(TelecoDataLoader):
+    """TelecoDataLoader applying the partition predicates to an in-memory xdr_data frame."""
+
+    def __init__(self, df, log_path):
+        super().__init__(FrameConnection(log_path))
+        self.df = df
+
+    def fetch_time_range(self, table_name, timestamp_column='Start'):
+        return self.df[timestamp_column].min(), self.df[timestamp_column].max()
+
+    def load_data_copy(self, table_name, columns=None, start=None, end=None, msisdns=None,
+                       compact=False, dtypes=None, partition=None, null_start=False):
+        df = self.df
+        if start is not None:
+            df = df[df['Start'] >= start]
+        if end is not None:
+            df = df[df['Start'] < end]
+        if partition is not None:
+            index, count = partition
+            df = df[df['MSISDN/Number'].fillna(0).astype('int64') % count == index]
+        if null_start:
+            df = df[df['Start'].isna()]
+        df = df[columns] if columns else df
+        df = df.reset_index(drop=True)
+        return self.apply_compact_dtypes(df, dtypes) if compact else df
+
+
+def render(query):
+    """Render a psycopg2 sql.Composable with double-quoted identifiers, standing in for as_string."""
+    if isinstance(query, sql.Composed):
+        return ''.join(render(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return '.'.join('"' + name.replace('"', '""') + '"' for name in query.strings)
+    if isinstance(query, sql.SQL):
+        return query.string
+    return str(query)
+
+
+def mogrify(query, params):
+    """Bind parameters the way psycopg2 does: %s is replaced, %% is a literal %, anything else is an error."""
+    values = iter(params)
+
+    def substitute(match):
+        if match.group(1) == '%':
+            return '%'
+        if match.group(1) == 's':
+            return repr(next(values))
+        raise ValueError(f"unsupported format character '{match.group(1)}'")
+
+    return re.sub(r'%(.)', substitute, render(query), flags=re.S)
+
+
+class FakeCursor:
+    """DB-API cursor recording the queries and serving preset rows or COPY output."""
+
+    def __init__(self, connection, name=None):
+        self.connection = connection
+        self.name = name
+        self.itersize = None
+        self.description = [(column,) for column in connection.columns]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.executed.append({'cursor': self.name, 'sql': mogrify(query, params or []),
+                                         'itersize': self.itersize})
+        self.rows = list(self.connection.rows)
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def mogrify(self, query, params):
+        return mogrify(query, params).encode()
+
+    def copy_expert(self, statement, buffer):
+        self.connection.executed.append({'cursor': self.name, 'sql': statement})
+        buffer.write(self.connection.copy_csv)
+
+
+class FakeConnection:
+    def __init__(self, columns=(), rows=(), copy_csv=b''):
+        self.columns = list(columns)
+        self.rows = rows
+        self.copy_csv = copy_csv
+        self.executed = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self, name)
+
+
+class FakeDatabaseConnection:
+    """Stand-in for DatabaseConnection lending one FakeConnection."""
+
+    def __init__(self, connection):
+        self.fake = connection
+
+    @contextmanager
+    def connection(self):
+        yield self.fake
+
+
+class TestQueries(unittest.TestCase):
+
+    def test_build_query(self):
+        """
+        Columns, time bounds and MSISDNs should be pushed into the SQL as identifiers and bind parameters.
+        """
+        loader = TelecoDataLoader(None)
+        query, params = loader.build_query('xdr_data')
+        self.assertEqual((render(query), params), ('SELECT * FROM "xdr_data"', []))
+
+        start, end = pd.Timestamp('2019-04-01'), pd.Timestamp('2019-04-08')
+        query, params = loader.build_query('xdr_data', columns=['MSISDN/Number', 'Total DL (Bytes)'],
+                                           start=start, end=end, msisdns=(3.36e10, 3.37e10))
+        self.assertEqual(render(query), 'SELECT "MSISDN/Number", "Total DL (Bytes)" FROM "xdr_data" '
+                                        'WHERE "Start" >= %s AND "Start" < %s AND "MSISDN/Number" = ANY(%s)')
+        self.assertEqual(params, [start, end, [3.36e10, 3.37e10]])
+
+        query, params = loader.build_query('xdr_data', columns=['Start'], null_start=True)
+        self.assertEqual((render(query), params), ('SELECT "Start" FROM "xdr_data" WHERE "Start" IS NULL', []))
+
+    def test_stream_data_chunks(self):
+        """
+        Rows should be fetched through a uniquely named server-side cursor in chunks, compacted by default.
+        """
+        columns = ['Bearer Id', 'MSISDN/Number', 'Start', 'Handset Type', 'Total DL (Bytes)']
+        rows = [(float(i), 3.36e10 + i % 7, pd.Timestamp('2019-04-01') + pd.Timedelta(minutes=i),
+                 ['A', 'B', None][i % 3], float(i) * 1e6) for i in range(25)]
+        connection = FakeConnection(columns, rows)
+        loader = TelecoDataLoader(FakeDatabaseConnection(connection))
+
+        chunks = list(loader.stream_data('xdr_data', columns=columns, start=pd.Timestamp('2019-04-01'),
+                                         chunk_size=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        result = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(result['Bearer Id'].tolist(), [float(i) for i in range(25)])
+        self.assertEqual(result['Total DL (Bytes)'].dtype, np.float32)
+        self.assertEqual(result['MSISDN/Number'].dtype, np.float64)
+        self.assertEqual(chunks[0]['Handset Type'].dtype, 'category')
+        self.assertTrue(chunks[0]['Handset Type'].isna().iloc[2])
+
+        executed = connection.executed[0]
+        self.assertEqual(executed['itersize'], 10)
+        self.assertTrue(executed['sql'].startswith('SELECT "Bearer Id", "MSISDN/Number"'))
+        self.assertTrue(executed['sql'].endswith('WHERE "Start" >= Timestamp(\'2019-04-01 00:00:00\')'))
+
+        raw = list(loader.stream_data('xdr_data', chunk_size=100, compact=False, dtypes={'Bearer Id': 'int32'}))
+        self.assertEqual(len(raw), 1)
+        self.assertEqual(raw[0]['Total DL (Bytes)'].dtype, np.float64)
+        self.assertEqual(raw[0]['Handset Type'].dtype, object)
+
+        # Every stream gets its own cursor, so several can be open on one connection
+        names = [executed['cursor'] for executed in connection.executed]
+        self.assertTrue(all(name.startswith('stream_') for name in names))
+        self.assertEqual(len(set(names)), 2)
+
+        compacted = next(loader.stream_data('xdr_data', chunk_size=100, dtypes={'Bearer Id': 'int32'}))
+        self.assertEqual(compacted['Bearer Id'].dtype, np.int32)
+
+    def test_hash_partition_binds(self):
+        """
+        The hash partition predicate should bind its parameters and keep its modulo operators.
+        """
+        query, params = TelecoDataLoader(None).build_query('xdr_data', partition=(1, 4))
+        self.assertEqual(params, [4, 4, 4, 1])
+        self.assertEqual(
+            mogrify(query, params),
+            'SELECT * FROM "xdr_data" WHERE ((hashtext(COALESCE("MSISDN/Number"::text, \'\')) % 4) + 4) % 4 = 1'
+        )
+
+
+class TestCopyParsing(unittest.TestCase):
+
+    def test_nulls_match_pandas(self):
+        """
+        NULL cells written by COPY should be read as missing, like the pandas parser does.
+        """
+        copy_csv = (b'Bearer Id,Handset Manufacturer,Handset Type,Total DL (Bytes)\n'
+                    b'1.0,Apple,iPhone 7,5.5\n'
+                    b'2.0,,,\n'
+                    b',Samsung,,7.25\n')
+        result = TelecoDataLoader._parse_copy_csv(io.BytesIO(copy_csv))
+        expected = pd.read_csv(io.BytesIO(copy_csv))
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(result['Handset Type'].isna().tolist(), [False, True, True])
+
+    def test_load_data_copy(self):
+        """
+        load_data_copy should wrap the bound query in COPY and parse its CSV output, compacted on request.
+        """
+        copy_csv = (b'Bearer Id,MSISDN/Number,Start,Handset Type,Total DL (Bytes)\n'
+                    b'1.0,33664000000.0,2019-04-01 10:00:00,iPhone 7,5000000.5\n'
+                    b'2.0,,2019-04-01 11:00:00,,\n'
+                    b'3.0,33664000001.0,2019-04-02 09:30:00,Galaxy S8,7250000.25\n')
+        connection = FakeConnection(copy_csv=copy_csv)
+        loader = TelecoDataLoader(FakeDatabaseConnection(connection))
+
+        df = loader.load_data_copy('xdr_data', msisdns=[33664000000.0])
+        self.assertEqual(connection.executed[0]['sql'],
+                         'COPY (SELECT * FROM "xdr_data" WHERE "MSISDN/Number" = ANY([33664000000.0])) '
+                         'TO STDOUT WITH (FORMAT csv, HEADER true)')
+        self.assertEqual(len(df), 3)
+        self.assertEqual(df['Total DL (Bytes)'].tolist()[::2], [5000000.5, 7250000.25])
+        self.assertTrue(df['MSISDN/Number'].isna().iloc[1])
+        self.assertTrue(pd.isna(df['Handset Type'].iloc[1]))
+
+        compact = loader.load_data_copy('xdr_data', compact=True)
+        self.assertEqual(compact['Total DL (Bytes)'].dtype, np.float32)
+        self.assertEqual(compact['Handset Type'].dtype, 'category')
+        self.assertEqual(compact['Start'].dtype, 'datetime64[ns]')
+        self.assertEqual(compact['Start'].iloc[2], pd.Timestamp('2019-04-02 09:30:00'))
+
+    @unittest.skipIf(pa_csv is None, 'pyarrow is not installed.')
+    def test_quoted_empty_string_is_kept(self):
+        """
+        An empty string, which COPY quotes, should stay an empty string.
+        """
+        result = TelecoDataLoader._parse_copy_csv(io.BytesIO(b'Handset Type,Total DL (Bytes)\n"",1.0\n,2.0\n'))
+        self.assertEqual(result['Handset Type'].iloc[0], '')
+        self.assertTrue(pd.isna(result['Handset Type'].iloc[1]))
+
+
+class TestParallelLoading(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a session table with missing timestamps and MSISDNs, and sessions on the range bounds.
+        """
+        rng = np.random.default_rng(0)
+        n = 5000
+        self.df = pd.DataFrame({
+            'Bearer Id': np.arange(n, dtype='float64'),
+            'Start': pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit='s'),
+            'MSISDN/Number': 3.36e10 + rng.integers(0, 400, n),
+            'Handset Type': rng.choice(['A', 'B', 'C'], n),
+            'Total DL (Bytes)': rng.gamma(2.0, 1e8, n)
+        })
+        self.df.loc[[3, 50], 'Start'] = pd.NaT
+        self.df.loc[[7, 90], 'MSISDN/Number'] = np.nan
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, 'connections.log')
+        open(self.log_path, 'w').close()
+        self.loader = FrameLoader(self.df, self.log_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assert_same_rows(self, result):
+        expected = self.df.sort_values('Bearer Id').reset_index(drop=True)
+        pd.testing.assert_frame_equal(result.sort_values('Bearer Id').reset_index(drop=True), expected)
+
+    def test_time_partitions_cover_every_row(self):
+        """
+        Time partitions should be disjoint, open-ended at both ends and include rows without a timestamp.
+        """
+        specs = self.loader.partition_specs('xdr_data', 4, by='time')
+        self.assertEqual(len(specs), 5)
+        self.assertIsNone(specs[0]['start'])
+        self.assertIsNone(specs[3]['end'])
+        self.assertEqual(specs[0]['end'], specs[1]['start'])
+        self.assertEqual(specs[4], {'null_start': True})
+
+        bounded = self.loader.partition_specs('xdr_data', 3, start=pd.Timestamp('2019-04-10'))
+        self.assertEqual(len(bounded), 3)
+        self.assertEqual(bounded[0]['start'], pd.Timestamp('2019-04-10'))
+
+        for executor in ['thread', 'process']:
+            self.assert_same_rows(self.loader.load_data_parallel('xdr_data', 4, executor=executor, max_workers=2))
+
+    def test_process_workers_connect_once(self):
+        """
+        Each worker process should connect once and reuse its loader for every partition it is given.
+        """
+        result = self.loader.load_data_parallel('xdr_data', 8, by='hash', executor='process', max_workers=2)
+        self.assert_same_rows(result)
+        connections = self.loader.db_connection.connections()
+        self.assertLessEqual(len(connections), 2)
+        self.assertEqual(len(connections), len(set(connections)))
+        self.assertNotIn(str(os.getpid()), connections)
+
+    def test_hash_partitions(self):
+        """
+        Hash partitions should be disjoint, cover every row and be returned as a list when asked to.
+        """
+        frames = self.loader.load_data_parallel('xdr_data', 3, by='hash', executor='thread', concat=False)
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(sum(len(frame) for frame in frames), len(self.df))
+        self.assert_same_rows(pd.concat(frames))
+
+        with self.assertRaises(ValueError):
+            self.loader.partition_specs('xdr_data', 3, by='region')
+
+    def test_compact_after_concat(self):
+        """
+        Compact dtypes should be applied to the combined frame, so categories span every partition.
+        """
+        result = self.loader.load_data_parallel('xdr_data', 4, executor='thread', compact=True,
+                                                columns=['Start', 'Handset Type', 'Total DL (Bytes)'])
+        self.assertEqual(result['Handset Type'].dtype, 'category')
+        self.assertEqual(sorted(result['Handset Type'].cat.categories), ['A', 'B', 'C'])
+        self.assertEqual(result['Total DL (Bytes)'].dtype, np.float32)
+        self.assertEqual(len(result), len(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
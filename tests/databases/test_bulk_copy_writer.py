@@ -0,0 +1,170 @@
+import unittest
+import csv
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../databases')))
+from connections.bulk_copy_writer import BulkCopyWriter, csv_batches, quote_ident
+
+
+class RecordingCursor:
+    """Stand-in psycopg2 cursor recording statements and COPY payloads."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        self.connection.statements.append(statement)
+        if statement.startswith('SELECT to_regclass'):
+            self.result = (self.connection.columns is not None,)
+        elif statement.endswith('LIMIT 0'):
+            self.description = [(column,) for column in self.connection.columns]
+
+    def fetchone(self):
+        return self.result
+
+    def copy_expert(self, statement, buffer):
+        self.connection.statements.append(statement)
+        self.connection.copied.append(buffer.read())
+
+
+class RecordingConnection:
+    """Stand-in psycopg2 connection; `columns` are the existing target's columns (None if missing)."""
+
+    def __init__(self, columns=None):
+        self.columns = columns
+        self.statements = []
+        self.copied = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class TestBulkCopyWriter(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a user scores frame with a missing value and a text column needing quotes.
+        """
+        self.df = pd.DataFrame({
+            'MSISDN/Number': [3.3e10 + 1, 3.3e10 + 2, 3.3e10 + 3],
+            'satisfaction_score': [0.1, np.nan, 2 / 3],
+            'segment': ['a,"b"', None, 'c']
+        })
+
+    def test_csv_batches_round_trip(self):
+        """
+        Batches should cover every row once and parse back to the same values, with NULLs as empty fields.
+        """
+        batches = list(csv_batches(self.df, 2))
+        self.assertEqual([rows for rows, _ in batches], [2, 1])
+        records = [row for _, buffer in batches for row in csv.reader(buffer)]
+        self.assertEqual(records[1][1:], ['', ''])
+        self.assertEqual(records[0][2], 'a,"b"')
+        self.assertEqual(float(records[2][1]), 2 / 3)
+
+    def test_upsert_creates_keyed_table(self):
+        """
+        Upserting into a missing table should COPY into a temp staging table, create the keyed target and merge.
+        """
+        connection = RecordingConnection()
+        stats = BulkCopyWriter(connection, batch_size=2, key_columns=['MSISDN/Number']).write(self.df, 'user_scores')
+
+        self.assertEqual((stats['rows'], stats['batches'], stats['mode']), (3, 2, 'upsert'))
+        self.assertEqual(len(connection.copied), 2)
+        self.assertEqual(connection.commits, 1)
+        statements = '\n'.join(connection.statements)
+        self.assertIn('CREATE TEMP TABLE "user_scores__staging"', statements)
+        self.assertIn('PRIMARY KEY ("MSISDN/Number")', statements)
+        self.assertIn('ON CONFLICT ("MSISDN/Number") DO UPDATE SET "satisfaction_score" = EXCLUDED."satisfaction_score"',
+                      statements)
+
+    def test_swap_renames_staging_over_target(self):
+        """
+        Swapping should build the staging table like the existing target and rename it in place.
+        """
+        connection = RecordingConnection(columns=list(self.df.columns))
+        BulkCopyWriter(connection, mode='swap').write(self.df, 'user_scores')
+        statements = connection.statements
+        self.assertIn('CREATE TABLE "user_scores__staging" (LIKE "user_scores" INCLUDING ALL)', statements)
+        self.assertEqual(statements[-3:], ['ALTER TABLE "user_scores" RENAME TO "user_scores__old"',
+                                           'ALTER TABLE "user_scores__staging" RENAME TO "user_scores"',
+                                           'DROP TABLE "user_scores__old"'])
+
+    def test_failure_rolls_back(self):
+        """
+        Invalid arguments should raise, and a failing statement should roll the transaction back.
+        """
+        with self.assertRaises(ValueError):
+            BulkCopyWriter(RecordingConnection(), mode='upsert')
+        with self.assertRaises(ValueError):
+            BulkCopyWriter(RecordingConnection(), key_columns=['missing']).write(self.df, 'user_scores')
+
+        connection = RecordingConnection()
+        connection.cursor = lambda: (_ for _ in ()).throw(RuntimeError('connection lost'))
+        with self.assertRaises(RuntimeError):
+            BulkCopyWriter(connection, mode='append').write(self.df, 'user_scores')
+        self.assertEqual((connection.commits, connection.rollbacks), (0, 1))
+
+
+@unittest.skipUnless(os.getenv('TEST_POSTGRES_DSN'), 'Set TEST_POSTGRES_DSN to run against a local PostgreSQL.')
+class TestBulkCopyWriterPostgres(unittest.TestCase):
+
+    def setUp(self):
+        import psycopg2
+        self.connection = psycopg2.connect(os.getenv('TEST_POSTGRES_DSN'))
+        self.table = 'bulk_copy_writer_test'
+        self.drop()
+
+    def tearDown(self):
+        self.drop()
+        self.connection.close()
+
+    def drop(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {quote_ident(self.table)}")
+        self.connection.commit()
+
+    def read(self):
+        return pd.read_sql_query(f'SELECT * FROM {quote_ident(self.table)} ORDER BY "user_id"', self.connection)
+
+    def test_upsert_and_swap(self):
+        """
+        Upserts should insert new keys and update existing ones; a swap should replace the table.
+        """
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'user_id': np.arange(5000, dtype=float), 'satisfaction_score': rng.random(5000)})
+        upsert = BulkCopyWriter(self.connection, batch_size=1000, key_columns=['user_id'])
+        upsert.write(df, self.table)
+
+        changed = df.iloc[4000:].assign(satisfaction_score=-1.0)
+        extra = pd.DataFrame({'user_id': [9999.0, 9999.0], 'satisfaction_score': [1.0, 2.0]})
+        upsert.write(pd.concat([changed, extra]), self.table)
+        result = self.read()
+        self.assertEqual(len(result), 5001)
+        self.assertEqual((result['satisfaction_score'] == -1.0).sum(), 1000)
+        self.assertEqual(result['satisfaction_score'].iloc[-1], 2.0)
+
+        BulkCopyWriter(self.connection, mode='swap').write(df.iloc[:10], self.table)
+        pd.testing.assert_frame_equal(self.read(), df.iloc[:10])
+
+
+if __name__ == '__main__':
+    unittest.main()
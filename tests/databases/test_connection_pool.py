@@ -0,0 +1,123 @@
+import unittest
+import os
+import sqlite3
+import sys
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../databases')))
+from connections.connection_pool import ConnectionPool
+
+
+class FlakyConnect:
+    """Connection factory opening SQLite connections, failing the first `failures` attempts."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.attempts = 0
+
+    def __call__(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise OSError('database is starting up')
+        return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_reuse_and_stats(self):
+        """
+        Returned connections should be reused, and the statistics should count checkouts and open connections.
+        """
+        pool = ConnectionPool(FlakyConnect(), min_size=1, max_size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            self.assertIs(first, second)
+            self.assertEqual(pool.stats()['in_use'], 1)
+
+        stats = pool.stats()
+        self.assertEqual((stats['checkouts'], stats['created'], stats['open'], stats['idle']), (2, 1, 1, 1))
+        pool.close()
+        self.assertEqual(pool.stats()['open'], 0)
+        with self.assertRaises(ConnectionError):
+            pool.getconn()
+
+    def test_concurrent_checkouts_respect_max_size(self):
+        """
+        Many threads sharing the pool should never hold more than max_size connections at once.
+        """
+        pool = ConnectionPool(FlakyConnect(), min_size=0, max_size=3, timeout=10)
+        holding = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(5):
+                with pool.connection() as connection:
+                    with lock:
+                        holding.append(connection)
+                        peak.append(len(holding))
+                    connection.execute('SELECT 1').fetchone()
+                    time.sleep(0.002)
+                    with lock:
+                        holding.remove(connection)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        self.assertLessEqual(max(peak), 3)
+        self.assertEqual(stats['checkouts'], 40)
+        self.assertLessEqual(stats['peak_open'], 3)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_timeout(self):
+        """
+        A checkout should give up with TimeoutError when every connection stays in use.
+        """
+        pool = ConnectionPool(FlakyConnect(), min_size=1, max_size=1)
+        held = pool.getconn()
+        with self.assertRaises(TimeoutError):
+            pool.getconn(timeout=0.05)
+        pool.putconn(held)
+        self.assertIs(pool.getconn(timeout=0.05), held)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_reconnect_with_backoff(self):
+        """
+        Failed connection attempts should be retried with backoff, and give up after max_retries.
+        """
+        connect = FlakyConnect(failures=2)
+        pool = ConnectionPool(connect, min_size=1, backoff=0.001)
+        self.assertEqual(connect.attempts, 3)
+        self.assertEqual(pool.stats()['connect_retries'], 2)
+
+        with self.assertRaises(ConnectionError):
+            ConnectionPool(FlakyConnect(failures=10), min_size=1, max_retries=3, backoff=0.001)
+
+    def test_unhealthy_connection_is_replaced(self):
+        """
+        An idle connection failing its health check should be discarded and replaced by a new one.
+        """
+        pool = ConnectionPool(FlakyConnect(), min_size=1, health_check_interval=0)
+        with pool.connection() as first:
+            first.close()
+        # The closed connection cannot be rolled back, so putconn already discarded it
+        self.assertEqual(pool.stats()['discarded'], 1)
+
+        with pool.connection() as second:
+            pass
+        pool.idle[-1][0].close()
+        with pool.connection() as third:
+            third.execute('SELECT 1')
+        stats = pool.stats()
+        self.assertIsNot(second, third)
+        self.assertEqual(stats['failed_health_checks'], 1)
+        self.assertEqual(stats['open'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from unittest import mock
+from over_view_analysis import telecom_eda
+from over_view_analysis.telecom_eda import (TelecomEDA, application_bitmask, classify_applications,
+                                            decode_application_mask, describe_numeric)
+
+APPS = ['Youtube', 'Netflix', 'Social Media', 'Gaming', 'Google', 'Email', 'Other']
+
+
+def row_by_row(data):
+    """The original per-row classification."""
+    return data.apply(
+        lambda row: 'YouTube' if row['Youtube DL (Bytes)'] > 0
+        else 'Netflix' if row['Netflix DL (Bytes)'] > 0
+        else 'Social Media' if row['Social Media DL (Bytes)'] > 0
+        else 'Gaming' if row['Gaming DL (Bytes)'] > 0
+        else 'Google' if row['Google DL (Bytes)'] > 0
+        else 'Email' if row['Email DL (Bytes)'] > 0
+        else 'Other', axis=1
+    )
+
+
+class TestApplicationClassification(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up sessions where each application downloads bytes in about a third of the rows.
+        """
+        rng = np.random.default_rng(0)
+        n = 3000
+        self.data = pd.DataFrame({
+            f'{app} DL (Bytes)': rng.gamma(2.0, 1e6, n) * (rng.random(n) < 0.3) for app in APPS
+        })
+        self.data.iloc[::17, 0] = np.nan
+
+    def test_matches_row_by_row(self):
+        """
+        The vectorized labels should equal the original per-row labels.
+        """
+        labels = classify_applications(self.data)
+        self.assertIsInstance(labels.dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(labels.astype(object), row_by_row(self.data), check_names=False)
+        self.assertEqual(TelecomEDA(self.data.copy()).data['application_type'].tolist(), labels.tolist())
+
+    def test_priority_order(self):
+        """
+        A custom priority should decide between applications active in the same session.
+        """
+        data = pd.DataFrame({'Youtube DL (Bytes)': [5.0, 0.0, 0.0], 'Email DL (Bytes)': [3.0, 1.0, 0.0]})
+        self.assertEqual(classify_applications(data).tolist(), ['YouTube', 'Email', 'Other'])
+        self.assertEqual(classify_applications(data, priority=['Email', 'YouTube']).tolist(),
+                         ['Email', 'Email', 'Other'])
+        with self.assertRaises(ValueError):
+            classify_applications(data, priority=['TikTok'])
+
+    def test_multi_label_mask(self):
+        """
+        The bitmask should hold every active application and decode back to labels.
+        """
+        eda = TelecomEDA(self.data.copy(), multi_label=True)
+        mask = eda.data['application_mask']
+        self.assertEqual(mask.dtype, np.uint8)
+        for position in range(20):
+            row = self.data.iloc[position]
+            expected = [label for label, app in zip(['YouTube', 'Netflix', 'Social Media', 'Gaming', 'Google', 'Email'], APPS)
+                        if row[f'{app} DL (Bytes)'] > 0]
+            self.assertEqual(decode_application_mask(mask.iloc[position]), expected)
+        self.assertEqual(application_bitmask(self.data, priority=['Email']).max(), 1)
+
+class TestLazyTelecomEDA(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up sessions with durations, DL/UL columns, missing values and a datetime column.
+        """
+        rng = np.random.default_rng(1)
+        n = 2000
+        self.data = pd.DataFrame({
+            'Start': pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 86400, n), unit='s'),
+            'IMSI': rng.integers(0, 300, n).astype(float) + 2.08e14,
+            'Dur. (ms)': rng.gamma(2.0, 1e5, n),
+            'Sessions': rng.integers(1, 10, n)
+        })
+        for app in APPS:
+            self.data[f'{app} DL (Bytes)'] = rng.gamma(2.0, 1e6, n) * (rng.random(n) < 0.5)
+            self.data[f'{app} UL (Bytes)'] = rng.gamma(2.0, 1e5, n)
+        self.data.loc[::13, 'Dur. (ms)'] = np.nan
+        self.data['Empty'] = np.nan
+
+    def test_describe_matches_pandas(self):
+        """
+        The single-pass description should equal DataFrame.describe() on the numeric columns.
+        """
+        numeric = self.data.select_dtypes(include=[np.number])
+        pd.testing.assert_frame_equal(describe_numeric(numeric, column_block=3), numeric.describe(), check_exact=True)
+
+    def test_statistics_computed_once(self):
+        """
+        describe_variables, basic_metrics and univariate_analysis should share one description.
+        """
+        eda = TelecomEDA(self.data)
+        with mock.patch.object(telecom_eda, 'describe_numeric', wraps=describe_numeric) as describe:
+            description = eda.describe_variables()
+            metrics = eda.basic_metrics()
+            self.assertIs(eda.univariate_analysis(), description)
+            self.assertEqual(describe.call_count, 1)
+
+        numeric = self.data.select_dtypes(include=[np.number])
+        pd.testing.assert_series_equal(metrics['median'], numeric.median())
+        pd.testing.assert_series_equal(metrics['std_dev'], numeric.std())
+
+    def test_segments_without_mutating_input(self):
+        """
+        Decile segmentation should match the original in-place computation and leave the caller's frame intact.
+        """
+        original = self.data.copy()
+        eda = TelecomEDA(self.data)
+        summary = eda.segment_users_by_decile()
+        eda.segment_users_by_decile()
+        eda.basic_metrics()
+        pd.testing.assert_frame_equal(self.data, original)
+
+        expected = original.rename(columns={'Dur. (ms)': 'total_duration'})
+        expected['total_data'] = expected[eda.dl_columns].sum(axis=1) + expected[eda.ul_columns].sum(axis=1)
+        expected['decile_class'] = pd.qcut(expected['total_duration'], 5, labels=False)
+        expected = expected.groupby('decile_class').agg({'total_duration': 'sum', 'total_data': 'sum'})
+        pd.testing.assert_frame_equal(summary, expected)
+        self.assertIn('decile_class', eda.data.columns)
+
+        eda.invalidate()
+        self.assertNotIn('decile_class', eda.data.columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from registry.model_registry import ModelRegistry, data_fingerprint, fingerprint_drift
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up training data and a temporary registry directory.
+        """
+        rng = np.random.default_rng(0)
+        self.features = ['engagement_score', 'experience_score']
+        self.data = pd.DataFrame(rng.normal(10.0, 2.0, (1000, 2)), columns=self.features)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry(self.temp_dir.name, drift_threshold=0.05)
+        self.trainings = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def train(self, data):
+        def fit():
+            self.trainings += 1
+            return StandardScaler().fit(data[self.features]), {'rows': len(data)}
+        return fit
+
+    def test_reuses_model_until_drift(self):
+        """
+        A stored model should be reused for similar data and retrained once the data drifts.
+        """
+        scaler, metadata = self.registry.get_or_train('scaler', self.data, self.features, self.train(self.data))
+        self.assertEqual(metadata['version'], 1)
+
+        similar = self.data.iloc[:990]
+        loaded, metadata = self.registry.get_or_train('scaler', similar, self.features, self.train(similar))
+        self.assertEqual(self.trainings, 1)
+        np.testing.assert_array_equal(loaded.mean_, scaler.mean_)
+
+        shifted = self.data + 1.0
+        _, metadata = self.registry.get_or_train('scaler', shifted, self.features, self.train(shifted))
+        self.assertEqual(self.trainings, 2)
+        self.assertEqual(metadata['version'], 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir.name, 'scaler'))), 2)
+
+    def test_retrains_when_params_change(self):
+        """
+        A model trained with other parameters should not be reused.
+        """
+        self.registry.get_or_train('kmeans', self.data, self.features, self.train(self.data), params={'n_clusters': 2})
+        self.registry.get_or_train('kmeans', self.data, self.features, self.train(self.data), params={'n_clusters': 3})
+        self.assertEqual(self.trainings, 2)
+
+    def test_concurrent_saves(self):
+        """
+        Concurrent writers and readers should never fail, and only the latest version should be kept.
+        """
+        scaler = StandardScaler().fit(self.data[self.features])
+        fingerprint = data_fingerprint(self.data, self.features)
+
+        def save_and_load(_):
+            self.registry.save('scaler', scaler, self.features, fingerprint)
+            model, _ = self.registry.load('scaler')
+            return model is not None
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.assertTrue(all(pool.map(save_and_load, range(120))))
+        self.assertEqual(self.registry.metadata('scaler')['version'], 120)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.temp_dir.name, 'scaler'))),
+                         ['metadata.json', 'model-0120.joblib'])
+
+    def test_fingerprint_drift(self):
+        """
+        Drift should be measured in standard deviations of the original features.
+        """
+        old = data_fingerprint(self.data, self.features)
+        new = data_fingerprint(self.data.assign(engagement_score=self.data['engagement_score'] + old['std']['engagement_score']), self.features)
+        self.assertAlmostEqual(fingerprint_drift(old, new), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+from types import SimpleNamespace
+
+FEATURE_COLUMNS = ['Dur. (ms)', 'Total DL (Bytes)', 'Total UL (Bytes)', 'Avg RTT DL (ms)',
+                   'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)']
+
+
+def user_scoring_fixture(rows, seed=0):
+    """
+    Build per-user features and fitted-model stand-ins exposing cluster_centers_.
+
+    Parameters:
+    rows (int): Number of users in the feature frame.
+    seed (int): Seed for the random generator.
+
+    Returns:
+    tuple: (user_data, engagement_clusters, experience_clusters)
+    """
+    rng = np.random.default_rng(seed)
+    user_data = pd.DataFrame(rng.gamma(2.0, 1e3, (rows, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    engagement_clusters = SimpleNamespace(cluster_centers_=rng.random((3, 7)))
+    experience_clusters = SimpleNamespace(cluster_centers_=rng.random((3, 6)))
+    return user_data, engagement_clusters, experience_clusters
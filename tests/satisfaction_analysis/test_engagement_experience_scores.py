@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import numpy as np
+from unittest import mock
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from satisfaction_analysis.engagement_experience_scores import EngagementExperienceScores
+from pandas.testing import assert_frame_equal
+from scoring_fixtures import user_scoring_fixture
+
+class TestEngagementExperienceScores(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up the shared scoring fixture with a missing value to exercise the fill.
+        """
+        self.user_data, self.engagement_clusters, self.experience_clusters = user_scoring_fixture(500)
+        self.user_data.iloc[3, 1] = np.nan
+
+    def scores(self, **kwargs):
+        scorer = EngagementExperienceScores(self.user_data.copy(), self.engagement_clusters, self.experience_clusters)
+        return scorer.assign_scores_to_users(**kwargs)
+
+    def test_vectorized_matches_row_by_row(self):
+        """
+        The vectorized scores should be identical to the per-row computation.
+        """
+        expected = self.scores(vectorized=False)
+        assert_frame_equal(self.scores(chunk_size=64), expected, check_exact=True)
+
+    def test_float32(self):
+        """
+        Scoring in float32 should stay within single-precision error.
+        """
+        expected = self.scores(vectorized=False)
+        result = self.scores(dtype=np.float32)
+        np.testing.assert_allclose(result['engagement_score'], expected['engagement_score'], rtol=1e-5)
+        np.testing.assert_allclose(result['experience_score'], expected['experience_score'], rtol=1e-5)
+    def test_scores_are_memoized(self):
+        """
+        Scores should be computed once per frame and recomputed after invalidation or for another frame.
+        """
+        scorer = EngagementExperienceScores(self.user_data.copy(), self.engagement_clusters, self.experience_clusters)
+        with mock.patch.object(scorer, '_compute_scores', wraps=scorer._compute_scores) as compute:
+            first = scorer.assign_scores_to_users()['engagement_score'].copy()
+            scorer.user_data['engagement_score'] = 0.0
+            second = scorer.assign_scores_to_users()['engagement_score']
+            self.assertEqual(compute.call_count, 1)
+            np.testing.assert_array_equal(first, second)
+
+            scorer.user_data.loc[0, 'Dur. (ms)'] = 1e9
+            scorer.invalidate_scores()
+            third = scorer.assign_scores_to_users()['engagement_score']
+            self.assertEqual(compute.call_count, 2)
+            self.assertNotEqual(first.iloc[0], third.iloc[0])
+
+            scorer.user_data = self.user_data.copy()
+            scorer.assign_scores_to_users()
+            scorer.assign_scores_to_users(vectorized=False)
+            self.assertEqual(compute.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import threading
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from satisfaction_analysis.satisfaction_score_predictor import SatisfactionScorePredictor
+
+class TestSatisfactionScorePredictor(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Train the regression on noisy synthetic scores.
+        """
+        rng = np.random.default_rng(0)
+        user_data = pd.DataFrame({
+            'engagement_score': rng.random(500) * 100,
+            'experience_score': rng.random(500) * 100
+        })
+        user_data['satisfaction_score'] = (
+            0.6 * user_data['engagement_score'] + 0.4 * user_data['experience_score'] + rng.normal(0, 1, 500)
+        )
+        self.user_data = user_data
+        self.predictor = SatisfactionScorePredictor(user_data)
+        self.predictor.build_regression_model()
+
+    def test_batch_matches_sklearn(self):
+        """
+        Batch predictions from a DataFrame, an array or two columns should match sklearn's predict.
+        """
+        features = self.user_data[['engagement_score', 'experience_score']]
+        expected = self.predictor.model.predict(features)
+        np.testing.assert_allclose(self.predictor.predict_batch(features), expected, rtol=1e-12)
+        np.testing.assert_allclose(self.predictor.predict_batch(features.to_numpy(), chunk_size=64), expected, rtol=1e-12)
+        np.testing.assert_allclose(
+            self.predictor.predict_batch(features['engagement_score'], features['experience_score']), expected, rtol=1e-12
+        )
+
+    def test_predict_one_from_threads(self):
+        """
+        Single-record predictions should match predict_satisfaction, also from concurrent threads.
+        """
+        expected = self.predictor.predict_satisfaction(50, 45)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.predictor.predict_one(50, 45))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        np.testing.assert_allclose(results, [expected] * 8, rtol=1e-12)
+
+    def test_untrained_model(self):
+        with self.assertRaises(Exception):
+            SatisfactionScorePredictor(self.user_data).predict_batch(np.zeros((1, 2)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+import numpy as np
+from unittest import mock
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from satisfaction_analysis.top_satifactions_analysis import TopSatisfactionAnalysis
+from scoring_fixtures import user_scoring_fixture
+
+class TestTopSatisfactionAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up the shared scoring fixture keyed by MSISDN/Number.
+        """
+        self.user_data, engagement_clusters, experience_clusters = user_scoring_fixture(300)
+        self.user_data.insert(0, 'MSISDN/Number', np.arange(300, dtype=float))
+        self.analysis = TopSatisfactionAnalysis(self.user_data, engagement_clusters, experience_clusters)
+
+    def test_scores_computed_once(self):
+        """
+        Every query on the same frame should reuse the scores of the first one.
+        """
+        with mock.patch.object(self.analysis, '_compute_scores', wraps=self.analysis._compute_scores) as compute:
+            scores = self.analysis.calculate_satisfaction_score()
+            top = self.analysis.top_n_satisfied_customers(n=5)
+            everyone = self.analysis.satisfied_customers()
+            self.assertEqual(compute.call_count, 1)
+
+        expected = scores[['engagement_score', 'experience_score']].mean(axis=1)
+        np.testing.assert_array_equal(everyone['satisfaction_score'], expected)
+        self.assertEqual(top['satisfaction_score'].tolist(), sorted(expected, reverse=True)[:5])
+
+    def test_invalidation(self):
+        """
+        Invalidating should recompute the scores from the modified frame.
+        """
+        before = self.analysis.top_n_satisfied_customers(n=1)
+        self.analysis.user_data.loc[7, 'Total DL (Bytes)'] = 1e9
+        self.assertEqual(self.analysis.top_n_satisfied_customers(n=1)['MSISDN/Number'].tolist(),
+                         before['MSISDN/Number'].tolist())
+
+        self.analysis.invalidate_scores(data_version=2)
+        self.assertEqual(self.analysis.top_n_satisfied_customers(n=1)['MSISDN/Number'].tolist(), [7.0])
+
+if __name__ == '__main__':
+    unittest.main()
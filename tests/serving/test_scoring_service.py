@@ -0,0 +1,186 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from registry.model_registry import ModelRegistry
+from engagement_analysis.telecom_engagement_analysis import TelecomEngagementAnalysis
+from experience_analytics.experience_clustering import ExperienceClustering
+from satisfaction_analysis.top_satifactions_analysis import TopSatisfactionAnalysis
+from satisfaction_analysis.satisfaction_score_predictor import SatisfactionScorePredictor
+from serving.scoring_service import (SatisfactionScorer, SatisfactionScoringService, customer_features_from_sessions,
+                                     load_cleaned_sessions, load_session_snapshot)
+
+METRICS = ['Dur. (ms)', 'Avg RTT DL (ms)', 'Avg RTT UL (ms)', 'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)',
+           'TCP DL Retrans. Vol (Bytes)', 'TCP UL Retrans. Vol (Bytes)', 'Total DL (Bytes)', 'Total UL (Bytes)']
+
+
+class StandInLoader:
+    """Stand-in for TelecoDataLoader serving a fixed frame."""
+
+    def __init__(self, df):
+        self.df = df
+        self.loads = 0
+
+    def load_data(self, table_name):
+        self.loads += 1
+        return self.df.copy()
+
+    def fetch_fingerprint(self, table_name, timestamp_column='Start'):
+        return {'table': table_name, 'row_count': len(self.df), 'max_timestamp': 'fixed'}
+
+
+class TestSatisfactionScoringService(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Train and register the satisfaction pipeline models on a small synthetic session frame.
+        """
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.sessions = pd.DataFrame({
+            'Bearer Id': np.arange(n, dtype=float),
+            'MSISDN/Number': rng.integers(0, 150, n).astype(float) + 3.3e10,
+            'Start': pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 86400, n), unit='s')
+        })
+        self.sessions['End'] = self.sessions['Start'] + pd.Timedelta(minutes=5)
+        for column in METRICS:
+            self.sessions[column] = rng.gamma(2.0, 1000.0, n)
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry(os.path.join(self.temp_dir.name, 'models'))
+
+        engagement = TelecomEngagementAnalysis(self.sessions, registry=self.registry)
+        engagement.aggregate_metrics_by_customer()
+        engagement.normalize_metrics()
+        engagement_data = engagement.k_means_clustering()
+        experience = ExperienceClustering(self.sessions, registry=self.registry)
+        experience.preprocess_data()
+        experience.perform_clustering()
+
+        user_df = pd.merge(engagement_data, experience.df[['MSISDN/Number', 'Cluster']], on='MSISDN/Number')
+        analysis = TopSatisfactionAnalysis(user_df, engagement.kmeans, experience.kmeans)
+        self.user_scores = analysis.calculate_satisfaction_score()
+        self.predictor = SatisfactionScorePredictor(self.user_scores, registry=self.registry)
+        self.predictor.build_regression_model()
+
+        self.features = customer_features_from_sessions(self.sessions)
+        self.scorer = SatisfactionScorer.from_registry(self.features, self.registry)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scores_match_pipeline(self):
+        """
+        Served scores should equal the scores of the satisfaction pipeline.
+        """
+        expected = self.user_scores.drop_duplicates('MSISDN/Number').set_index('MSISDN/Number')
+        msisdns = expected.index.tolist()
+        results, missing = self.scorer.score_msisdns(msisdns)
+        self.assertEqual(missing, [])
+        served = pd.DataFrame(results).set_index('msisdn')
+        for column in ['engagement_score', 'experience_score', 'satisfaction_score']:
+            np.testing.assert_allclose(served[column].to_numpy(), expected[column].to_numpy(), rtol=1e-12)
+
+        first = msisdns[0]
+        record = self.scorer.score_one(first)
+        self.assertAlmostEqual(record['predicted_satisfaction'], self.predictor.predict_satisfaction(
+            expected.loc[first, 'engagement_score'], expected.loc[first, 'experience_score']))
+        self.assertIsNone(self.scorer.score_one(1.0))
+
+    def test_missing_model_raises(self):
+        """
+        Building a scorer from an empty registry should fail with a clear error.
+        """
+        with self.assertRaises(ValueError):
+            SatisfactionScorer.from_registry(self.features, ModelRegistry(os.path.join(self.temp_dir.name, 'empty')))
+
+    def test_stand_in_sources(self):
+        """
+        Customer features should load from a file snapshot and from a stand-in loader through the snapshot cache.
+        """
+        from data_loader.snapshot_cache import SnapshotCache
+
+        path = os.path.join(self.temp_dir.name, 'sessions.parquet')
+        self.sessions.to_parquet(path)
+        pd.testing.assert_frame_equal(customer_features_from_sessions(load_session_snapshot(path)), self.features)
+
+        loader = StandInLoader(self.sessions)
+        cache = SnapshotCache(os.path.join(self.temp_dir.name, 'snapshots'))
+        first = load_cleaned_sessions(loader, snapshot_cache=cache)
+        second = load_cleaned_sessions(loader, snapshot_cache=cache)
+        self.assertEqual(loader.loads, 1)
+        self.assertEqual(len(first), len(second))
+
+    def test_http_endpoint(self):
+        """
+        The HTTP endpoint should serve single and batch scores, errors and latency statistics.
+        """
+        known = self.features['MSISDN/Number'].iloc[0]
+        msisdn = str(int(known))
+
+        async def scenario():
+            service = SatisfactionScoringService(self.scorer, port=0, offload_rows=2)
+            await service.start()
+            base = f'http://127.0.0.1:{service.port}'
+            loop = asyncio.get_running_loop()
+
+            def call(path, payload=None):
+                data = json.dumps(payload).encode() if payload is not None else None
+                try:
+                    with urllib.request.urlopen(urllib.request.Request(base + path, data=data), timeout=10) as response:
+                        return response.status, json.loads(response.read())
+                except urllib.error.HTTPError as error:
+                    return error.code, json.loads(error.read())
+
+            try:
+                responses = {
+                    'one': await loop.run_in_executor(None, call, f'/score/{msisdn}'),
+                    'unknown': await loop.run_in_executor(None, call, '/score/1'),
+                    'batch': await loop.run_in_executor(None, call, '/score', {'msisdns': [msisdn, '1']}),
+                    'features': await loop.run_in_executor(
+                        None, call, '/score', {'features': self.features.iloc[:3].to_dict('records')}),
+                    'bad': await loop.run_in_executor(None, call, '/score', ['not', 'an', 'object']),
+                    'health': await loop.run_in_executor(None, call, '/health'),
+                    'stats': await loop.run_in_executor(None, call, '/stats'),
+                }
+            finally:
+                await service.stop()
+            return responses
+
+        responses = asyncio.run(scenario())
+        expected = self.scorer.score_one(known)
+
+        status, record = responses['one']
+        self.assertEqual(status, 200)
+        self.assertEqual(record['msisdn'], msisdn)
+        self.assertAlmostEqual(record['satisfaction_score'], expected['satisfaction_score'])
+        self.assertEqual(responses['unknown'][0], 404)
+
+        status, batch = responses['batch']
+        self.assertEqual(status, 200)
+        self.assertEqual([r['msisdn'] for r in batch['results']], [msisdn])
+        self.assertEqual(batch['missing'], ['1'])
+
+        status, scored = responses['features']
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(scored['feature_results'][0]['engagement_score'], expected['engagement_score'])
+        self.assertEqual(responses['bad'][0], 400)
+        self.assertEqual(responses['health'][1]['customers'], len(self.features))
+
+        stats = responses['stats'][1]
+        self.assertEqual(stats['requests'], 6)
+        self.assertEqual(stats['errors'], 2)
+        self.assertEqual(stats['records_scored'], 5)
+        self.assertIsNotNone(stats['latency_ms']['p99'])
+        self.assertGreater(stats['requests_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import sys
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from visualization.plot_backend import PlotBackend, ReservoirSampler, binned_histogram, reservoir_sample, sample_rows
+from over_view_analysis.telecom_eda import TelecomEDA
+from satisfaction_analysis.satisfaction_kmeans import SatisfactionKMeans
+
+class TestPlotBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.backend = PlotBackend(bins=20, kde_sample=500, max_points=1000, max_figures=2)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_histogram_matches_numpy(self):
+        """
+        Pre-binned counts should equal np.histogram over the finite values.
+        """
+        values = self.rng.normal(size=10_000)
+        values[::50] = np.nan
+        counts, edges = binned_histogram(values, bins=20)
+        expected_counts, expected_edges = np.histogram(values[~np.isnan(values)], bins=20)
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_array_equal(edges, expected_edges)
+
+    def test_reservoir_sample(self):
+        """
+        The reservoir should hold a uniform sample of the stream of the requested size.
+        """
+        values = np.arange(100_000)
+        sample = reservoir_sample(values, 2000, chunk_size=7_000)
+        self.assertEqual(len(sample), 2000)
+        self.assertEqual(len(np.unique(sample)), 2000)
+        # Every tenth of the stream should hold about a tenth of the sample
+        shares = np.bincount(sample // 10_000, minlength=10) / 2000
+        self.assertLess(np.abs(shares - 0.1).max(), 0.03)
+        np.testing.assert_array_equal(reservoir_sample(values[:10], 2000), values[:10])
+
+        sampler = ReservoirSampler(3)
+        sampler.update(np.array([1, 2]))
+        np.testing.assert_array_equal(sampler.sample(), [1, 2])
+
+    def test_scatter_is_capped(self):
+        """
+        Scatters should draw at most max_points points, or a binned image without hue in auto mode.
+        """
+        x, y = self.rng.normal(size=(2, 50_000))
+        ax = plt.figure().add_subplot()
+        self.backend.scatter(ax, x, y, hue=self.rng.integers(0, 3, 50_000))
+        self.assertEqual(sum(len(collection.get_offsets()) for collection in ax.collections), 1000)
+        self.assertEqual(len(ax.get_legend_handles_labels()[1]), 3)
+
+        ax = plt.figure().add_subplot()
+        self.backend.scatter(ax, x, y)
+        self.assertEqual(len(ax.collections), 1)
+        self.assertEqual(ax.collections[0].get_array().size, self.backend.grid_size ** 2)
+        self.assertEqual(len(sample_rows(10, 1000)), 10)
+
+    def test_figure_cache(self):
+        """
+        Figures should be rendered once per name and data version, evicting the least recently used.
+        """
+        draws = []
+        draw = lambda fig: draws.append(fig)
+        first = self.backend.figure('plot', 'v1', draw)
+        self.assertIs(self.backend.figure('plot', 'v1', draw), first)
+        self.backend.figure('plot', 'v2', draw)
+        self.backend.figure('other', 'v1', draw)
+        self.assertIsNot(self.backend.figure('plot', 'v1', draw), first)
+        self.backend.figure('plot', None, draw)
+        self.backend.figure('plot', None, draw)
+        self.assertEqual(len(draws), 6)
+        self.assertEqual(self.backend.stats(), {'figures': 2, 'hits': 1, 'misses': 4})
+
+    def test_analyses_use_backend(self):
+        """
+        EDA and cluster plots should render through the backend and be reused for the same data version.
+        """
+        data = pd.DataFrame({'Dur. (ms)': self.rng.gamma(2.0, 1e5, 20_000),
+                             'Youtube DL (Bytes)': self.rng.gamma(2.0, 1e6, 20_000),
+                             'Total DL (Bytes)': self.rng.gamma(2.0, 1e7, 20_000)})
+        eda = TelecomEDA(data, data_version='v1')
+        fig = eda.graphical_univariate_analysis(self.backend)
+        self.assertEqual(len(fig.axes), 3)
+        self.assertIs(eda.graphical_univariate_analysis(self.backend), fig)
+        ax = eda.bivariate_analysis(self.backend).axes[0]
+        self.assertEqual(sum(len(collection.get_offsets()) for collection in ax.collections), 1000)
+
+        scores = pd.DataFrame(self.rng.random((5000, 2)), columns=['engagement_score', 'experience_score'])
+        kmeans = SatisfactionKMeans(scores)
+        kmeans.preprocess_data()
+        kmeans.run_kmeans(k=2)
+        ax = kmeans.visualize_clusters(self.backend).axes[0]
+        self.assertEqual(sum(len(collection.get_offsets()) for collection in ax.collections), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
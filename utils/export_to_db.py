@@ -2,12 +2,12 @@
 
 import sys
 import pandas as pd
-from sqlalchemy import create_engine
 from dotenv import load_dotenv
 import os
 sys.path.append(os.path.abspath(os.path.join(os.getcwd(), '../databases')))
 
-from connections.database_connector import DatabaseConnection
+from connections.database_connector import get_database_connection
+from connections.bulk_copy_writer import BulkCopyWriter
 
 # Load environment variables
 load_dotenv()
@@ -15,35 +15,41 @@ load_dotenv()
 class DbExporter:
     def __init__(self):
         """
-        Initialize the PostgresExporter with PostgreSQL connection details from environment variables.
+        Initialize the PostgresExporter with the shared connection pool for the PostgreSQL
+        connection details from environment variables.
         """
-        self.db_connection = DatabaseConnection(
+        self.db_connection = get_database_connection(
             db_name=os.getenv('DB_NAME'),
             user=os.getenv('DB_USER'),
             password=os.getenv('DB_PASSWORD'),
             host=os.getenv('DB_HOST'),
             port=os.getenv('DB_PORT')
         )
-        self.engine = self._create_engine()
-        
-    def _create_engine(self):
-        """
-        Create a SQLAlchemy engine using the DatabaseConnection class.
-        """
-        # Connect using the custom DatabaseConnection class
-        self.db_connection.connect()
-        return create_engine(
-            f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-        )
 
-    def export_to_postgres(self, df, table_name='user_scores', if_exists='replace'):
+    def export_to_postgres(self, df, table_name='user_scores', if_exists='replace', key_columns=None,
+                           batch_size=100_000):
         """
-        Export a DataFrame to a PostgreSQL table.
+        Export a DataFrame to a PostgreSQL table with COPY through a staging table.
 
         Parameters:
         - df: pd.DataFrame, the DataFrame to export.
         - table_name: str, name of the table in the database.
-        - if_exists: str, behavior if the table already exists ('replace', 'append', etc.)
+        - if_exists: str, behavior if the table already exists: 'replace' swaps in the new table,
+          'append' inserts the rows, or upserts them on key_columns when given.
+        - key_columns: list, conflict key used to upsert rows when appending.
+        - batch_size: int, rows sent per COPY batch.
+
+        Returns:
+        - Dict with the write statistics (rows, batches, seconds, rows_per_second, mode).
         """
-        df.to_sql(table_name, con=self.engine, if_exists=if_exists, index=False)
+        if if_exists == 'replace':
+            mode = 'swap'
+        elif if_exists == 'append':
+            mode = 'upsert' if key_columns else 'append'
+        else:
+            raise ValueError(f"Unsupported if_exists '{if_exists}', expected 'replace' or 'append'.")
+        with self.db_connection.connection() as connection:
+            writer = BulkCopyWriter(connection, batch_size=batch_size, mode=mode, key_columns=key_columns)
+            stats = writer.write(df, table_name)
         print(f"Data exported to {table_name} table in PostgreSQL database.")
+        return stats